@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Tuple
 import os
 import cv2
 import numpy as np
@@ -10,14 +10,20 @@ from ros_sugar.io import (
 
 from ros_sugar.io.utils import image_pre_processing, read_compressed_image
 
-from .utils import create_detection_context
+from .utils import create_detection_context, select_frames
 
 __all__ = ["GenericCallback", "TextCallback"]
 
 
+# bounded default selection of frames decoded from a video
+VIDEO_FRAME_STRIDE = 1
+VIDEO_MAX_FRAMES = 64
+
+
 class VideoCallback(GenericCallback):
     """
-    Video Callback class. Its get method saves a video as list of bytes
+    Video Callback class. Its get method returns the video as an array of frames.
+    Only the selected frames are decoded, i.e. every Nth frame and the first (or last) K frames. By default, up to the first 64 frames are decoded. The selection can be changed with set_frame_selection or by passing frame_stride, max_frames and from_end to get_output.
     """
 
     def __init__(self, input_topic, node_name: Optional[str] = None) -> None:
@@ -27,52 +33,141 @@ class VideoCallback(GenericCallback):
         :type       input_topic:  Input
         """
         super().__init__(input_topic, node_name)
+        self.frame_stride: int = VIDEO_FRAME_STRIDE
+        self.max_frames: Optional[int] = VIDEO_MAX_FRAMES
+        self.from_end: bool = False
+        # frames of fixed video, decoded once for the last requested selection
+        self._fixed_num_frames: int = 0
+        self._fixed_video: Optional[Tuple[Tuple, Optional[np.ndarray]]] = None
         # fixed video needs to be a path to cv2 readable video
+        # frames are read on demand, to avoid keeping the whole video in memory
         if hasattr(input_topic, "fixed"):
             if os.path.isfile(input_topic.fixed):
-                try:
-                    # read all video frames
-                    video = []
-                    cap = cv2.VideoCapture(input_topic.fixed)
-                    if not cap.isOpened():
-                        raise TypeError()
-                    while cap.isOpened():
-                        ret, frame = cap.read()
-                        if ret:
-                            video.append(frame)
-                        else:
-                            break
-                    # Convert frame list to ndarray
-                    self.msg = np.array(video)
-                except Exception:
+                cap = cv2.VideoCapture(str(input_topic.fixed))
+                if cap.isOpened():
+                    self.msg = str(input_topic.fixed)
+                    self._fixed_num_frames = self._count_frames(cap)
+                else:
                     get_logger(self.node_name).error(
-                        f"Fixed path {self.msg} provided for Vidoe topic is not readable Video file"
+                        f"Fixed path {input_topic.fixed} provided for Video topic is not readable Video file"
                     )
+                cap.release()
             else:
                 get_logger(self.node_name).error(
-                    f"Fixed path {self.msg} provided for Video topic is not a valid file path"
+                    f"Fixed path {input_topic.fixed} provided for Video topic is not a valid file path"
                 )
 
-    def _get_output(self, **_) -> Optional[np.ndarray]:
+    def set_frame_selection(
+        self,
+        frame_stride: int = VIDEO_FRAME_STRIDE,
+        max_frames: Optional[int] = VIDEO_MAX_FRAMES,
+        from_end: bool = False,
+    ) -> None:
+        """
+        Sets the default selection of decoded frames
+        :param      frame_stride: Decode every Nth frame
+        :type       frame_stride: int
+        :param      max_frames: Maximum number of decoded frames, None for all frames
+        :type       max_frames: int | None
+        :param      from_end: Decode the last max_frames frames instead of the first
+        :type       from_end: bool
+        """
+        self.frame_stride = frame_stride
+        self.max_frames = max_frames
+        self.from_end = from_end
+
+    @staticmethod
+    def _count_frames(cap: cv2.VideoCapture) -> int:
+        """
+        Counts frames in a video file, without decoding them if the frame count is not available in the container.
+        :rtype:     int
+        """
+        if (num_frames := int(cap.get(cv2.CAP_PROP_FRAME_COUNT))) > 0:
+            return num_frames
+        num_frames = 0
+        while cap.grab():
+            num_frames += 1
+        return num_frames
+
+    def _read_fixed_video(self, indices: range) -> Optional[np.ndarray]:
+        """
+        Reads selected frames from fixed video file. Skipped frames are grabbed without being decoded.
+        :rtype:     np.ndarray | None
+        """
+        cap = cv2.VideoCapture(self.msg)
+        video: Optional[np.ndarray] = None
+        count = 0
+        position = 0
+        for index in indices:
+            # skip frames without decoding them
+            while position < index and cap.grab():
+                position += 1
+            ret, frame = cap.read()
+            position += 1
+            if not ret:
+                break
+            if video is None:
+                video = np.empty((len(indices),) + frame.shape, dtype=frame.dtype)
+            video[count] = frame
+            count += 1
+        cap.release()
+        return video[:count] if video is not None else None
+
+    def _get_output(
+        self,
+        frame_stride: Optional[int] = None,
+        max_frames: Optional[int] = None,
+        from_end: Optional[bool] = None,
+        **_,
+    ) -> Optional[np.ndarray]:
         """
         Gets video as a numpy array.
+        :param      frame_stride: Decode every Nth frame. Defaults to the callback's frame selection
+        :type       frame_stride: int | None
+        :param      max_frames: Maximum number of decoded frames. Defaults to the callback's frame selection
+        :type       max_frames: int | None
+        :param      from_end: Decode the last max_frames frames instead of the first. Defaults to the callback's frame selection
+        :type       from_end: bool | None
         :returns:   Video as nd_array
         :rtype:     np.ndarray
         """
-        if not self.msg:
+        if self.msg is None:
             return None
 
-        # return np.ndarray if fixed video has been read
-        if isinstance(self.msg, np.ndarray):
-            return self.msg
-        else:
+        frame_stride = self.frame_stride if frame_stride is None else frame_stride
+        max_frames = self.max_frames if max_frames is None else max_frames
+        from_end = self.from_end if from_end is None else from_end
+
+        # read selected frames if a fixed video has been provided
+        # and keep them, as the video does not change
+        if isinstance(self.msg, str):
+            indices = select_frames(
+                self._fixed_num_frames, frame_stride, max_frames, from_end
+            )
+            selection = (indices.start, indices.stop, indices.step)
+            if not self._fixed_video or self._fixed_video[0] != selection:
+                self._fixed_video = (selection, self._read_fixed_video(indices))
+            return self._fixed_video[1]
+
+        # frames and compressed frames are decoded in sequence
+        frames = list(self.msg.frames) + list(self.msg.compressed_frames)
+        indices = select_frames(len(frames), frame_stride, max_frames, from_end)
+        if not indices:
+            return None
+        video: Optional[np.ndarray] = None
+        for count, index in enumerate(indices):
+            img = frames[index]
             # pre-process in case of weird encodings and reshape ROS topic
-            video = []
-            for img in self.msg.frames:
-                video.append(image_pre_processing(img))
-            for img in self.msg.compressed_frames:
-                video.append(read_compressed_image(img))
-            return np.array(video)
+            frame = (
+                image_pre_processing(img)
+                if index < len(self.msg.frames)
+                else read_compressed_image(img)
+            )
+            # preallocate output with shape of first decoded frame
+            if video is None:
+                video = np.empty((len(indices),) + frame.shape, dtype=frame.dtype)
+            video[count] = frame
+        return video
 
 
 class ObjectDetectionCallback(GenericCallback):
@@ -90,24 +185,30 @@ class ObjectDetectionCallback(GenericCallback):
         """
         super().__init__(input_topic, node_name)
         self.msg = input_topic.fixed if hasattr(input_topic, "fixed") else None
+        # context string of the last processed message
+        self._context_msg = None
+        self._context: Optional[str] = None
 
     def _get_output(self, **_) -> Optional[str]:
         """
         Processes labels and returns a context string for
-        prompt engineering
+        prompt engineering. The context is computed once per received message.
 
         :returns:   Comma separated classnames
         :rtype:     str
         """
         if not self.msg:
             return None
+        if self.msg is self._context_msg:
+            return self._context
         # send fixed list of labels if it exists
         if isinstance(self.msg, list):
-            return create_detection_context(self.msg)
+            context = create_detection_context(self.msg)
         # send labels from ROS message
         else:
             label_list = [
                 label for detection in self.msg.detections for label in detection.labels
             ]
-            detections_string = create_detection_context(label_list)
-            return detections_string
+            context = create_detection_context(label_list)
+        self._context_msg, self._context = self.msg, context
+        return context
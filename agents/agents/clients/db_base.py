@@ -4,7 +4,7 @@ from typing import Any, Optional, Dict, Union
 from rclpy import logging
 
 from ..vectordbs import DB
-from ..utils import validate_func_args
+from ..utils import validate_func_args, ClientMetrics
 
 
 class DBClient(ABC):
@@ -53,6 +53,8 @@ class DBClient(ABC):
             self.db_name, logging.get_logging_severity_from_string(logging_level)
         )
         self.response_timeout = response_timeout
+        # per call metrics
+        self.metrics = ClientMetrics()
 
     def serialize(self) -> Dict:
         """Get client json
@@ -94,7 +96,10 @@ class DBClient(ABC):
         :type db_input: dict[str, Any]
         :rtype: dict | None
         """
-        return self._add(db_input)
+        with self.metrics.measure("add") as stats:
+            result = self._add(db_input)
+            stats["error"] = stats.get("error", False) or result is None
+        return result
 
     def conditional_add(self, db_input: Dict[str, Any]) -> Optional[Dict]:
         """add data if given ids dont exist. Update metadatas of the ids that exist
@@ -102,7 +107,10 @@ class DBClient(ABC):
         :type db_input: dict[str, Any]
         :rtype: dict | None
         """
-        return self._conditional_add(db_input)
+        with self.metrics.measure("conditional_add") as stats:
+            result = self._conditional_add(db_input)
+            stats["error"] = stats.get("error", False) or result is None
+        return result
 
     def metadata_query(self, db_input: Dict[str, Any]) -> Optional[Dict]:
         """Query based on given metadata.
@@ -110,7 +118,10 @@ class DBClient(ABC):
         :type db_input: dict[str, Any]
         :rtype: dict | None
         """
-        return self._metadata_query(db_input)
+        with self.metrics.measure("metadata_query") as stats:
+            result = self._metadata_query(db_input)
+            stats["error"] = stats.get("error", False) or result is None
+        return result
 
     def query(self, db_input: Dict[str, Any]) -> Optional[Dict]:
         """Query based on query string.
@@ -118,7 +129,16 @@ class DBClient(ABC):
         :type db_input: dict[str, Any]
         :rtype: dict | None
         """
-        return self._query(db_input)
+        with self.metrics.measure("query") as stats:
+            result = self._query(db_input)
+            stats["error"] = stats.get("error", False) or result is None
+        return result
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Get metrics of client calls, i.e. latency histogram and percentiles, mean serialization, network and server time, mean payload sizes and error and timeout counts, for each type of call.
+        :rtype: dict[str, dict]
+        """
+        return self.metrics.snapshot()
 
     def deinitialize(self) -> None:
         """deinitialize."""
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Optional, Dict, List, Union
 
 from rclpy import logging
 
 from ..models import Model
-from ..utils import validate_func_args
+from ..utils import validate_func_args, ClientMetrics
 
 
 class ModelClient(ABC):
@@ -54,6 +56,11 @@ class ModelClient(ABC):
             self.model_name, logging.get_logging_severity_from_string(logging_level)
         )
         self.inference_timeout = inference_timeout
+        # worker threads for non-blocking inference calls, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+        # per call metrics
+        self.metrics = ClientMetrics()
 
     def serialize(self) -> Dict:
         """Get client json
@@ -95,7 +102,60 @@ class ModelClient(ABC):
         :type inference_input: dict[str, Any]
         :rtype: dict | None
         """
-        return self._inference(inference_input)
+        with self.metrics.measure("inference") as stats:
+            result = self._inference(inference_input)
+            stats["error"] = stats.get("error", False) or result is None
+        return result
+
+    def inference_async(self, inference_input: Dict[str, Any]) -> Future:
+        """Call inference on a worker thread without blocking the caller.
+        :param inference_input:
+        :type inference_input: dict[str, Any]
+        :returns: A future that resolves to the inference result
+        :rtype: Future
+        """
+        with self._executor_lock:
+            return self._get_executor().submit(self.inference, inference_input)
+
+    def inference_batch_async(self, inference_inputs: List[Dict[str, Any]]) -> Future:
+        """Call inference for several inputs on a worker thread without blocking the caller. See inference_batch.
+        :param inference_inputs:
+        :type inference_inputs: list[dict[str, Any]]
+        :returns: A future that resolves to the inference results in the order of inputs
+        :rtype: Future
+        """
+        with self._executor_lock:
+            return self._get_executor().submit(self.inference_batch, inference_inputs)
+
+    def shutdown_async(self) -> None:
+        """Stop worker threads used for non-blocking inference calls. Inference calls that have not started are cancelled. Worker threads are created again on the next call to inference_async.
+        :rtype: None
+        """
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def inference_batch(
+        self, inference_inputs: List[Dict[str, Any]]
+    ) -> List[Optional[Dict]]:
+        """Call inference for several inputs, keeping all of them in flight on the
+        model server at once.
+        :param inference_inputs:
+        :type inference_inputs: list[dict[str, Any]]
+        :returns: Inference results in the order of inputs
+        :rtype: list[dict | None]
+        """
+        with self.metrics.measure("inference_batch") as stats:
+            results = self._inference_batch(inference_inputs)
+            stats["error"] = stats.get("error", False) or None in results
+        return results
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Get metrics of client calls, i.e. latency histogram and percentiles, mean serialization, network and server time, mean payload sizes and error and timeout counts, for each type of call.
+        :rtype: dict[str, dict]
+        """
+        return self.metrics.snapshot()
 
     def deinitialize(self):
         """deinitialize."""
@@ -113,6 +173,29 @@ class ModelClient(ABC):
             "This method needs to be implemented in a child class"
         )
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get worker threads for non-blocking inference calls, creating them if needed. Needs to be called with executor lock acquired.
+        :rtype: ThreadPoolExecutor
+        """
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(thread_name_prefix=self.model_name)
+        return self._executor
+
+    def _inference_batch(
+        self, inference_inputs: List[Dict[str, Any]]
+    ) -> List[Optional[Dict]]:
+        """Call inference for several inputs concurrently on worker threads.
+        Clients that support pipelining requests can override this method.
+        :param inference_inputs:
+        :type inference_inputs: list[dict[str, Any]]
+        :rtype: list[dict | None]
+        """
+        # separate workers, as batches can themselves run on the client's workers
+        with ThreadPoolExecutor(
+            max_workers=len(inference_inputs), thread_name_prefix=self.model_name
+        ) as executor:
+            return list(executor.map(self._inference, inference_inputs))
+
     @abstractmethod
     def _initialize(self) -> None:
         """initialize.
@@ -1,4 +1,5 @@
-from typing import Any, Optional, Dict, Union
+import time
+from typing import Any, Optional, Dict, Union, Iterator, Generator
 
 import httpx
 
@@ -10,7 +11,13 @@ __all__ = ["OllamaClient"]
 
 
 class OllamaClient(ModelClient):
-    """An HTTP client for interaction with ML models served on ollama"""
+    """An HTTP client for interaction with ML models served on ollama
+
+    :param image_encoding: Encoding used for sending images to the model. Can be "png" (lossless) or "jpeg" (much faster to encode). Defaults to "png".
+    :type image_encoding: str
+    :param jpeg_quality: Quality (0-100) used when image_encoding is "jpeg". Defaults to 90.
+    :type jpeg_quality: int
+    """
 
     def __init__(
         self,
@@ -20,10 +27,18 @@ class OllamaClient(ModelClient):
         inference_timeout: int = 30,
         init_on_activation: bool = True,
         logging_level: str = "info",
+        image_encoding: str = "png",
+        jpeg_quality: int = 90,
         **kwargs,
     ):
         if isinstance(model, LLM):
             model._set_ollama_checkpoint()
+        if image_encoding not in ["png", "jpeg"]:
+            raise ValueError(
+                f"image_encoding can be one of 'png' or 'jpeg' for OllamaClient, got '{image_encoding}'"
+            )
+        self.image_encoding = image_encoding
+        self.jpeg_quality = jpeg_quality
         try:
             from ollama import Client
 
@@ -43,6 +58,17 @@ class OllamaClient(ModelClient):
         )
         self._check_connection()
 
+    def serialize(self) -> Dict:
+        """Get client json
+        :rtype: Dict
+        """
+        client_dict = super().serialize()
+        client_dict.update({
+            "image_encoding": self.image_encoding,
+            "jpeg_quality": self.jpeg_quality,
+        })
+        return client_dict
+
     def _check_connection(self) -> None:
         """Check if the platfrom is being served on specified IP and port"""
         # Ping remote server to check connection
@@ -90,7 +116,15 @@ class OllamaClient(ModelClient):
 
         # make images part of the latest message in message list
         if images := inference_input.get("images"):
-            input["messages"][-1]["images"] = [encode_arr_base64(img) for img in images]
+            start_time = time.perf_counter()
+            input["messages"][-1]["images"] = [
+                encode_arr_base64(img, self.image_encoding, self.jpeg_quality)
+                for img in images
+            ]
+            self.metrics.add(
+                serialization_time=time.perf_counter() - start_time,
+                payload_size=sum(len(img) for img in input["messages"][-1]["images"]),
+            )
             inference_input.pop("images")
 
         # Add tools as part of input, if available
@@ -98,6 +132,9 @@ class OllamaClient(ModelClient):
             input["tools"] = tools
             inference_input.pop("tools")
 
+        # stream output if requested by the component
+        stream = inference_input.pop("stream", False)
+
         # ollama uses num_predict for max_new_tokens
         if inference_input.get("max_new_tokens"):
             inference_input["num_predict"] = inference_input["max_new_tokens"]
@@ -108,13 +145,31 @@ class OllamaClient(ModelClient):
         try:
             # set timeout on underlying httpx client
             self.client._client.timeout = self.inference_timeout
-            ollama_result = self.client.chat(**input)
+            start_time = time.perf_counter()
+            ollama_result = self.client.chat(**input, stream=stream)
+            request_time = time.perf_counter() - start_time
         except Exception as e:
+            self.metrics.add(timeout=isinstance(e, httpx.TimeoutException))
             self.logger.error(str(e))
             return None
 
+        # make output a generator of received tokens when streaming
+        if stream:
+            input["output"] = self._stream_content(ollama_result, start_time)  # type: ignore
+            return input
+
         self.logger.debug(str(ollama_result))
 
+        # ollama reports its processing time in nanoseconds
+        if server_time := ollama_result.get("total_duration"):
+            server_time = server_time / 1e9
+            self.metrics.add(
+                server_time=server_time,
+                network_time=max(request_time - server_time, 0.0),
+            )
+        else:
+            self.metrics.add(network_time=request_time)
+
         # make result part of the input
         if output := ollama_result["message"].get("content"):
             input["output"] = output  # type: ignore
@@ -133,6 +188,37 @@ class OllamaClient(ModelClient):
             self.logger.debug("Output not received")
             return
 
+    def _stream_content(
+        self, stream: Iterator, start_time: float
+    ) -> Generator[str, None, None]:
+        """Yield content of the model response as it is received. As the inference call
+        returns before the response is received, streamed calls are recorded separately
+        as inference_stream, with latency measured until the stream is consumed.
+        :param stream:
+        :type stream: Iterator
+        :param start_time: Time the request was sent at, from time.perf_counter
+        :type start_time: float
+        :rtype: Generator[str, None, None]
+        """
+        stats: Dict = {}
+        try:
+            for part in stream:
+                # ollama reports its processing time in nanoseconds in the last part
+                if server_time := part.get("total_duration"):
+                    stats["server_time"] = server_time / 1e9
+                if content := part["message"].get("content"):
+                    yield content
+        except Exception as e:
+            stats["error"] = True
+            stats["timeout"] = isinstance(e, httpx.TimeoutException)
+            self.logger.error(str(e))
+            raise
+        finally:
+            latency = time.perf_counter() - start_time
+            if "server_time" in stats:
+                stats["network_time"] = max(latency - stats["server_time"], 0.0)
+            self.metrics.record("inference_stream", latency, stats)
+
     def _deinitialize(self):
         """Deinitialize the model on the platform"""
 
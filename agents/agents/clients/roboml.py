@@ -1,12 +1,18 @@
 import base64
+import io
+import json
+import time
+import wave
 from enum import Enum
-from typing import Any, Optional, Dict, Union
+from functools import partial
+from typing import Any, Callable, Optional, Dict, List, Union
 
 import httpx
+import numpy as np
 
 from .. import models
 from ..models import Model, OllamaModel, TransformersLLM, TransformersMLLM
-from ..utils import encode_arr_base64
+from ..utils import encode_arr_base64, ClientMetrics
 from ..vectordbs import DB
 from .db_base import DBClient
 from .model_base import ModelClient
@@ -29,8 +35,241 @@ class RoboMLError(Exception):
     pass
 
 
+def _create_http_client(
+    url: str,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    http2: bool,
+) -> httpx.Client:
+    """Create a persistent httpx client with a connection pool
+    :param url:
+    :type url: str
+    :param max_connections:
+    :type max_connections: int
+    :param max_keepalive_connections:
+    :type max_keepalive_connections: int
+    :param keepalive_expiry:
+    :type keepalive_expiry: float
+    :param http2:
+    :type http2: bool
+    :rtype: httpx.Client
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    try:
+        return httpx.Client(base_url=url, limits=limits, http2=http2)
+    except ImportError as e:
+        raise ModuleNotFoundError(
+            "In order to use HTTP/2 with RoboML HTTP clients, you need the h2 package installed. You can install it with 'pip install httpx[http2]'"
+        ) from e
+
+
+# content types of audio uploads, by audio encoding
+_AUDIO_CONTENT_TYPES = {
+    "pcm_s16le": "application/octet-stream",
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+    "opus": "audio/ogg",
+}
+
+
+def _encode_audio(audio: bytes, encoding: str, sample_rate: int) -> Dict[str, Any]:
+    """Prepare audio bytes for a binary upload, optionally compressing them to FLAC or Opus
+    :param audio: WAV file bytes or raw 16 bit mono PCM
+    :type audio: bytes
+    :param encoding: "binary" (send as is), "flac" or "opus"
+    :type encoding: str
+    :param sample_rate: Sample rate of raw PCM audio
+    :type sample_rate: int
+    :returns: Audio bytes, format and sample rate
+    :rtype: dict[str, Any]
+    """
+    is_wav = audio[:4] == b"RIFF"
+    if is_wav:
+        with wave.open(io.BytesIO(audio), "rb") as f:
+            sample_rate = f.getframerate()
+    if encoding == "binary":
+        return {
+            "audio": audio,
+            "format": "wav" if is_wav else "pcm_s16le",
+            "sample_rate": sample_rate,
+        }
+    try:
+        import soundfile as sf
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "In order to use flac or opus audio encoding, you need the soundfile package installed. You can install it with 'pip install soundfile'"
+        ) from e
+    if is_wav:
+        samples, sample_rate = sf.read(io.BytesIO(audio), dtype="int16")
+    else:
+        samples = np.frombuffer(audio, dtype=np.int16)
+    buffer = io.BytesIO()
+    if encoding == "flac":
+        sf.write(buffer, samples, sample_rate, format="FLAC")
+    else:
+        sf.write(buffer, samples, sample_rate, format="OGG", subtype="OPUS")
+    return {"audio": buffer.getvalue(), "format": encoding, "sample_rate": sample_rate}
+
+
+def _measured_post(
+    client: httpx.Client,
+    metrics: ClientMetrics,
+    url: str,
+    data: Dict[str, Any],
+    timeout: float,
+    packer: Optional[Callable] = None,
+    unpacker: Optional[Callable] = None,
+    audio: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Post data to the RoboML server, adding serialization and network time and payload sizes to client metrics
+    :param client:
+    :type client: httpx.Client
+    :param metrics:
+    :type metrics: ClientMetrics
+    :param url:
+    :type url: str
+    :param data:
+    :type data: dict[str, Any]
+    :param timeout:
+    :type timeout: float
+    :param packer: Binary serializer for data, data is sent as json if not provided
+    :type packer: Optional[Callable]
+    :param unpacker: Binary deserializer for msgpack responses
+    :type unpacker: Optional[Callable]
+    :param audio: Audio, with its format and sample rate, to be uploaded as binary, created by _encode_audio
+    :type audio: Optional[dict[str, Any]]
+    :rtype: Any
+    """
+    start_time = time.perf_counter()
+    if audio:
+        # send audio as a binary file and remaining data as json, in a multipart payload
+        request = client.build_request(
+            "POST",
+            url,
+            data={"data": json.dumps(data)},
+            files={
+                "query": (
+                    f"query.{audio['format']}",
+                    audio["audio"],
+                    _AUDIO_CONTENT_TYPES[audio["format"]],
+                )
+            },
+            headers={
+                "X-Audio-Format": audio["format"],
+                "X-Sample-Rate": str(audio["sample_rate"]),
+            },
+            timeout=timeout,
+        )
+    elif packer:
+        request = client.build_request(
+            "POST",
+            url,
+            content=packer(data),
+            headers={"Content-Type": "application/msgpack"},
+            timeout=timeout,
+        )
+    else:
+        request = client.build_request(
+            "POST",
+            url,
+            content=json.dumps(data).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+        )
+    content = request.read()
+    serialization_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    r = client.send(request).raise_for_status()
+    network_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result = (
+        unpacker(r.content)
+        if unpacker
+        and r.headers.get("content-type", "").startswith("application/msgpack")
+        else r.json()
+    )
+    metrics.add(
+        serialization_time=serialization_time + time.perf_counter() - start_time,
+        network_time=network_time,
+        payload_size=len(content),
+        response_size=len(r.content),
+    )
+    return result
+
+
+def _measured_command(
+    redis: Any,
+    metrics: ClientMetrics,
+    command: str,
+    data: Dict[str, Any],
+    packer: Callable,
+    unpacker: Callable,
+) -> Any:
+    """Execute a command on the RoboML RESP server, adding serialization and network time and payload sizes to client metrics
+    :param redis:
+    :type redis: Redis
+    :param metrics:
+    :type metrics: ClientMetrics
+    :param command:
+    :type command: str
+    :param data:
+    :type data: dict[str, Any]
+    :param packer:
+    :type packer: Callable
+    :param unpacker:
+    :type unpacker: Callable
+    :rtype: Any
+    """
+    start_time = time.perf_counter()
+    data_b = packer(data)
+    serialization_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result_b = redis.execute_command(command, data_b)
+    network_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result = unpacker(result_b)
+    metrics.add(
+        serialization_time=serialization_time + time.perf_counter() - start_time,
+        network_time=network_time,
+        payload_size=len(data_b),
+        response_size=len(result_b),
+    )
+    return result
+
+
 class HTTPModelClient(ModelClient):
-    """An HTTP client for interaction with ML models served on RoboML"""
+    """An HTTP client for interaction with ML models served on RoboML
+
+    The client keeps a pool of persistent connections to the RoboML server, which are reused across inference calls.
+
+    :param max_connections: Maximum number of concurrent connections in the pool. Defaults to 10.
+    :type max_connections: int
+    :param max_keepalive_connections: Maximum number of idle connections kept alive in the pool. Defaults to 5.
+    :type max_keepalive_connections: int
+    :param keepalive_expiry: Time in seconds after which an idle connection is closed. Defaults to 30.0
+    :type keepalive_expiry: float
+    :param http2: Use HTTP/2 for requests. Requires the h2 package, which can be installed with `pip install httpx[http2]`. Defaults to False.
+    :type http2: bool
+    :param image_encoding: Encoding used for sending images to the model. Can be "png" (lossless base64 encoded PNG in a JSON payload), "jpeg" (base64 encoded JPEG in a JSON payload, much faster to encode) or "raw" (raw array buffers, with their shape and dtype, in a binary msgpack payload, which requires a RoboML server that accepts msgpack requests). Defaults to "png".
+    :type image_encoding: str
+    :param jpeg_quality: Quality (0-100) used when image_encoding is "jpeg". Defaults to 90.
+    :type jpeg_quality: int
+    :param audio_upload: Upload audio (e.g. speech for SpeechToText models) as a file in a multipart payload, with its format and sample rate given in X-Audio-Format and X-Sample-Rate headers, instead of sending it base64 encoded in a JSON payload. Requires a RoboML server that accepts binary audio uploads. Defaults to False.
+    :type audio_upload: bool
+    :param audio_encoding: Encoding used for uploading audio when audio_upload is True. Can be "binary" (audio bytes as is), "flac" (lossless compression) or "opus" (lossy compression, smallest payload). "flac" and "opus" require the soundfile package, which can be installed with `pip install soundfile`. Defaults to "binary".
+    :type audio_encoding: str
+    :param audio_sample_rate: Sample rate of raw PCM audio (i.e. audio bytes without a WAV header) sent to the model. Defaults to 16000.
+    :type audio_sample_rate: int
+    """
 
     def __init__(
         self,
@@ -40,12 +279,29 @@ class HTTPModelClient(ModelClient):
         inference_timeout: int = 30,
         init_on_activation: bool = True,
         logging_level: str = "info",
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        image_encoding: str = "png",
+        jpeg_quality: int = 90,
+        audio_upload: bool = False,
+        audio_encoding: str = "binary",
+        audio_sample_rate: int = 16000,
         **kwargs,
     ):
         if isinstance(model, OllamaModel):
             raise TypeError(
                 "An ollama model cannot be passed to a RoboML client. Please use the OllamaClient"
             )
+        if image_encoding not in ["png", "jpeg", "raw"]:
+            raise ValueError(
+                f"image_encoding can be one of 'png', 'jpeg' or 'raw', got '{image_encoding}'"
+            )
+        if audio_encoding not in ["binary", "flac", "opus"]:
+            raise ValueError(
+                f"audio_encoding can be one of 'binary', 'flac' or 'opus', got '{audio_encoding}'"
+            )
         super().__init__(
             model=model,
             host=host,
@@ -56,15 +312,70 @@ class HTTPModelClient(ModelClient):
             **kwargs,
         )
         self.url = f"http://{self.host}:{self.port}"
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.image_encoding = image_encoding
+        self.jpeg_quality = jpeg_quality
+        self.audio_upload = audio_upload
+        self.audio_encoding = audio_encoding
+        self.audio_sample_rate = audio_sample_rate
+        if self.image_encoding == "raw":
+            try:
+                import msgpack
+                import msgpack_numpy as m_pack
+
+                # encode numpy arrays with their shape and dtype
+                self.packer = partial(msgpack.packb, default=m_pack.encode)
+                self.unpacker = partial(msgpack.unpackb, object_hook=m_pack.decode)
+            except ModuleNotFoundError as e:
+                raise ModuleNotFoundError(
+                    "In order to use raw image encoding, you need msgpack packages installed. You can install them with 'pip install msgpack msgpack-numpy'"
+                ) from e
+        self.client = self._create_client()
         self._check_connection()
 
+    def serialize(self) -> Dict:
+        """Get client json
+        :rtype: Dict
+        """
+        client_dict = super().serialize()
+        client_dict.update({
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "http2": self.http2,
+            "image_encoding": self.image_encoding,
+            "jpeg_quality": self.jpeg_quality,
+            "audio_upload": self.audio_upload,
+            "audio_encoding": self.audio_encoding,
+            "audio_sample_rate": self.audio_sample_rate,
+        })
+        return client_dict
+
+    def _create_client(self) -> httpx.Client:
+        """Get the persistent http client, creating a new one if it does not exist or has been closed
+        :rtype: httpx.Client
+        """
+        if getattr(self, "client", None) and not self.client.is_closed:
+            return self.client
+        return _create_http_client(
+            self.url,
+            self.max_connections,
+            self.max_keepalive_connections,
+            self.keepalive_expiry,
+            self.http2,
+        )
+
     def _check_connection(self) -> None:
         """Check if the platfrom is being served on specified IP and port"""
         # Ping remote server to check connection
         self.logger.info("Checking connection with remote RoboML")
+        # recreate client if it was closed on deinitialization
+        self.client = self._create_client()
         try:
-            # port specific to ollama
-            httpx.get(f"{self.url}/").raise_for_status()
+            self.client.get("/").raise_for_status()
         except Exception as e:
             self.__handle_exceptions(e)
             raise
@@ -75,6 +386,7 @@ class HTTPModelClient(ModelClient):
         """
         # Create a model node on RoboML
         self.logger.info("Creating model node on remote")
+        self.client = self._create_client()
         model_class = getattr(models, self.model_type)
         if issubclass(model_class, TransformersLLM):
             model_type = TransformersLLM.__name__
@@ -84,14 +396,14 @@ class HTTPModelClient(ModelClient):
             model_type = self.model_type
         start_params = {"node_name": self.model_name, "node_type": model_type}
         try:
-            r = httpx.post(
-                f"{self.url}/add_node", params=start_params, timeout=self.init_timeout
+            r = self.client.post(
+                "/add_node", params=start_params, timeout=self.init_timeout
             ).raise_for_status()
             self.logger.debug(str(r.json()))
             self.logger.info(f"Initializing {self.model_name} on RoboML remote")
             # get initialization params and initiale model
-            httpx.post(
-                f"{self.url}/{self.model_name}/initialize",
+            self.client.post(
+                f"/{self.model_name}/initialize",
                 params=self.model_init_params,
                 timeout=self.init_timeout,
             ).raise_for_status()
@@ -102,23 +414,49 @@ class HTTPModelClient(ModelClient):
 
     def _inference(self, inference_input: Dict[str, Any]) -> Optional[Dict]:
         """Call inference on the model using data and inference parameters from the component"""
+        # copy input as encoded data replaces its values
+        inference_input = dict(inference_input)
         try:
-            # encode any byte or numpy array data
-            if inference_input.get("query") and isinstance(
-                inference_input["query"], bytes
-            ):
-                inference_input["query"] = base64.b64encode(
-                    inference_input["query"]
-                ).decode("utf-8")
-            if images := inference_input.get("images"):
-                inference_input["images"] = [encode_arr_base64(img) for img in images]
+            audio = None
+            if self.audio_upload and isinstance(inference_input.get("query"), bytes):
+                # upload audio as binary, optionally compressed
+                start_time = time.perf_counter()
+                audio = _encode_audio(
+                    inference_input.pop("query"),
+                    self.audio_encoding,
+                    self.audio_sample_rate,
+                )
+                self.metrics.add(serialization_time=time.perf_counter() - start_time)
+            if self.image_encoding == "raw":
+                # send byte and numpy array data as is in a binary payload
+                packer, unpacker = self.packer, self.unpacker
+            else:
+                packer, unpacker = None, None
+                # encode any byte or numpy array data
+                start_time = time.perf_counter()
+                if inference_input.get("query") and isinstance(
+                    inference_input["query"], bytes
+                ):
+                    inference_input["query"] = base64.b64encode(
+                        inference_input["query"]
+                    ).decode("utf-8")
+                if images := inference_input.get("images"):
+                    inference_input["images"] = [
+                        encode_arr_base64(img, self.image_encoding, self.jpeg_quality)
+                        for img in images
+                    ]
+                self.metrics.add(serialization_time=time.perf_counter() - start_time)
             # call inference method
-            r = httpx.post(
-                f"{self.url}/{self.model_name}/inference",
-                json=inference_input,
-                timeout=self.inference_timeout,
-            ).raise_for_status()
-            result = r.json()
+            result = _measured_post(
+                self.client,
+                self.metrics,
+                f"/{self.model_name}/inference",
+                inference_input,
+                self.inference_timeout,
+                packer,
+                unpacker,
+                audio,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -132,9 +470,12 @@ class HTTPModelClient(ModelClient):
         self.logger.error(f"Deinitializing {self.model_name} model on RoboML remote")
         stop_params = {"node_name": self.model_name}
         try:
-            httpx.post(f"{self.url}/remove_node", params=stop_params).raise_for_status()
+            self.client.post("/remove_node", params=stop_params).raise_for_status()
         except Exception as e:
             self.__handle_exceptions(e)
+        finally:
+            # close persistent connections
+            self.client.close()
 
     def __handle_exceptions(self, excep: Exception) -> None:
         """__handle_exceptions.
@@ -143,6 +484,7 @@ class HTTPModelClient(ModelClient):
         :type excep: Exception
         :rtype: None
         """
+        self.metrics.add(timeout=isinstance(excep, httpx.TimeoutException))
         if isinstance(excep, httpx.RequestError):
             self.logger.error(
                 f"{excep} RoboML server inaccessible. Might not be running. Make sure remote is correctly configured."
@@ -162,7 +504,19 @@ class HTTPModelClient(ModelClient):
 
 
 class HTTPDBClient(DBClient):
-    """An HTTP client for interaction with vector DBs served on RoboML"""
+    """An HTTP client for interaction with vector DBs served on RoboML
+
+    The client keeps a pool of persistent connections to the RoboML server, which are reused across DB calls.
+
+    :param max_connections: Maximum number of concurrent connections in the pool. Defaults to 10.
+    :type max_connections: int
+    :param max_keepalive_connections: Maximum number of idle connections kept alive in the pool. Defaults to 5.
+    :type max_keepalive_connections: int
+    :param keepalive_expiry: Time in seconds after which an idle connection is closed. Defaults to 30.0
+    :type keepalive_expiry: float
+    :param http2: Use HTTP/2 for requests. Requires the h2 package, which can be installed with `pip install httpx[http2]`. Defaults to False.
+    :type http2: bool
+    """
 
     def __init__(
         self,
@@ -172,6 +526,10 @@ class HTTPDBClient(DBClient):
         response_timeout: int = 30,
         init_on_activation: bool = True,
         logging_level: str = "info",
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
         **kwargs,
     ):
         super().__init__(
@@ -184,15 +542,48 @@ class HTTPDBClient(DBClient):
             **kwargs,
         )
         self.url = f"http://{self.host}:{self.port}"
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.client = self._create_client()
         self._check_connection()
 
+    def serialize(self) -> Dict:
+        """Get client json
+        :rtype: Dict
+        """
+        client_dict = super().serialize()
+        client_dict.update({
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "http2": self.http2,
+        })
+        return client_dict
+
+    def _create_client(self) -> httpx.Client:
+        """Get the persistent http client, creating a new one if it does not exist or has been closed
+        :rtype: httpx.Client
+        """
+        if getattr(self, "client", None) and not self.client.is_closed:
+            return self.client
+        return _create_http_client(
+            self.url,
+            self.max_connections,
+            self.max_keepalive_connections,
+            self.keepalive_expiry,
+            self.http2,
+        )
+
     def _check_connection(self):
         """Check if the platfrom is being served on specified IP and port"""
         # Ping remote server to check connection
         self.logger.info("Checking connection with remote RoboML")
+        # recreate client if it was closed on deinitialization
+        self.client = self._create_client()
         try:
-            # port specific to ollama
-            httpx.get(f"{self.url}/").raise_for_status()
+            self.client.get("/").raise_for_status()
         except Exception as e:
             self.__handle_exceptions(e)
             raise
@@ -203,16 +594,17 @@ class HTTPDBClient(DBClient):
         """
         # Create a DB node on RoboML
         self.logger.info("Creating db node on remote")
+        self.client = self._create_client()
         start_params = {"node_name": self.db_name, "node_type": self.db_type}
         try:
-            r = httpx.post(
-                f"{self.url}/add_node", params=start_params, timeout=self.init_timeout
+            r = self.client.post(
+                "/add_node", params=start_params, timeout=self.init_timeout
             ).raise_for_status()
             self.logger.debug(str(r.json()))
             self.logger.info(f"Initializing {self.db_name} on RoboML remote")
             # get initialization params and initiale db
-            httpx.post(
-                f"{self.url}/{self.db_name}/initialize",
+            self.client.post(
+                f"/{self.db_name}/initialize",
                 params=self.db_init_params,
                 timeout=self.init_timeout,
             ).raise_for_status()
@@ -229,12 +621,13 @@ class HTTPDBClient(DBClient):
         """
         try:
             # add to DB
-            r = httpx.post(
-                f"{self.url}/{self.db_name}/add",
-                json=db_input,
-                timeout=self.response_timeout,
-            ).raise_for_status()
-            result = r.json()
+            result = _measured_post(
+                self.client,
+                self.metrics,
+                f"/{self.db_name}/add",
+                db_input,
+                self.response_timeout,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -250,12 +643,13 @@ class HTTPDBClient(DBClient):
         """
         try:
             # add to DB
-            r = httpx.post(
-                f"{self.url}/{self.db_name}/conditional_add",
-                json=db_input,
-                timeout=self.response_timeout,
-            ).raise_for_status()
-            result = r.json()
+            result = _measured_post(
+                self.client,
+                self.metrics,
+                f"/{self.db_name}/conditional_add",
+                db_input,
+                self.response_timeout,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -271,12 +665,13 @@ class HTTPDBClient(DBClient):
         """
         try:
             # query db
-            r = httpx.post(
-                f"{self.url}/{self.db_name}/metadata_query",
-                json=db_input,
-                timeout=self.response_timeout,
-            ).raise_for_status()
-            result = r.json()
+            result = _measured_post(
+                self.client,
+                self.metrics,
+                f"/{self.db_name}/metadata_query",
+                db_input,
+                self.response_timeout,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -292,12 +687,13 @@ class HTTPDBClient(DBClient):
         """
         try:
             # query db
-            r = httpx.post(
-                f"{self.url}/{self.db_name}/query",
-                json=db_input,
-                timeout=self.response_timeout,
-            ).raise_for_status()
-            result = r.json()
+            result = _measured_post(
+                self.client,
+                self.metrics,
+                f"/{self.db_name}/query",
+                db_input,
+                self.response_timeout,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -311,9 +707,12 @@ class HTTPDBClient(DBClient):
         self.logger.error(f"Deinitializing {self.db_name} on RoboML remote")
         stop_params = {"node_name": self.db_name}
         try:
-            httpx.post(f"{self.url}/remove_node", params=stop_params).raise_for_status()
+            self.client.post("/remove_node", params=stop_params).raise_for_status()
         except Exception as e:
             self.__handle_exceptions(e)
+        finally:
+            # close persistent connections
+            self.client.close()
 
     def __handle_exceptions(self, excep: Exception) -> None:
         """__handle_exceptions.
@@ -322,6 +721,7 @@ class HTTPDBClient(DBClient):
         :type excep: Exception
         :rtype: None
         """
+        self.metrics.add(timeout=isinstance(excep, httpx.TimeoutException))
         if isinstance(excep, httpx.RequestError):
             self.logger.error(
                 f"{excep} RoboML server inaccessible. Might not be running. Make sure remote is correctly configured."
@@ -341,7 +741,11 @@ class HTTPDBClient(DBClient):
 
 
 class RESPModelClient(ModelClient):
-    """A Redis Serialization Protocol (RESP) based client for interaction with ML models served on RoboML"""
+    """A Redis Serialization Protocol (RESP) based client for interaction with ML models served on RoboML
+
+    :param max_connections: If set, the client uses a pool of at most this many connections to the RoboML server, shared by all threads using the client (e.g. with async inference in components). When all connections are in use, requests wait for a free connection. Defaults to None, i.e. connections are created as needed.
+    :type max_connections: Optional[int]
+    """
 
     def __init__(
         self,
@@ -351,6 +755,7 @@ class RESPModelClient(ModelClient):
         inference_timeout: int = 30,
         init_on_activation: bool = True,
         logging_level: str = "info",
+        max_connections: Optional[int] = None,
         **kwargs,
     ):
         if isinstance(model, OllamaModel):
@@ -372,10 +777,17 @@ class RESPModelClient(ModelClient):
 
             # patch msgpack for numpy arrays
             m_pack.patch()
-            from redis import Redis
+            from redis import BlockingConnectionPool, Redis
 
+            self.max_connections = max_connections
             # TODO: handle timeout
-            self.redis = Redis(self.host, port=self.port)
+            if self.max_connections:
+                pool = BlockingConnectionPool(
+                    host=self.host, port=self.port, max_connections=self.max_connections
+                )
+                self.redis = Redis(connection_pool=pool)
+            else:
+                self.redis = Redis(self.host, port=self.port)
             self.packer = msgpack.packb
             self.unpacker = msgpack.unpackb
 
@@ -385,6 +797,14 @@ class RESPModelClient(ModelClient):
             ) from e
         self._check_connection()
 
+    def serialize(self) -> Dict:
+        """Get client json
+        :rtype: Dict
+        """
+        client_dict = super().serialize()
+        client_dict["max_connections"] = self.max_connections
+        return client_dict
+
     def _check_connection(self) -> None:
         """Check if the platfrom is being served on specified IP and port"""
         # Ping remote server to check connection
@@ -442,12 +862,15 @@ class RESPModelClient(ModelClient):
     def _inference(self, inference_input: Dict[str, Any]) -> Optional[Dict]:
         """Call inference on the model using data and inference parameters from the component"""
         try:
-            data_b = self.packer(inference_input)
             # call inference method
-            result_b = self.redis.execute_command(
-                f"{self.model_name}.inference", data_b
+            result = _measured_command(
+                self.redis,
+                self.metrics,
+                f"{self.model_name}.inference",
+                inference_input,
+                self.packer,
+                self.unpacker,
             )
-            result = self.unpacker(result_b)
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -455,6 +878,33 @@ class RESPModelClient(ModelClient):
 
         return result
 
+    def _inference_batch(
+        self, inference_inputs: List[Dict[str, Any]]
+    ) -> List[Optional[Dict]]:
+        """Call inference on the model for several inputs, pipelined over a single connection"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for inference_input in inference_inputs:
+                pipe.execute_command(
+                    f"{self.model_name}.inference", self.packer(inference_input)
+                )
+            results_b = pipe.execute(raise_on_error=False)
+        except Exception as e:
+            self.__handle_exceptions(e)
+            return [None] * len(inference_inputs)
+
+        results = []
+        for result_b in results_b:
+            # errors for individual inputs are returned in place of results
+            if isinstance(result_b, Exception):
+                results.append(self.__handle_exceptions(result_b))
+                continue
+            result = self.unpacker(result_b)
+            self.logger.debug(str(result))
+            results.append(result)
+
+        return results
+
     def _deinitialize(self) -> None:
         """Deinitialize the model on the platform"""
 
@@ -485,7 +935,9 @@ class RESPModelClient(ModelClient):
         :type excep: Exception
         :rtype: None
         """
-        from redis.exceptions import ConnectionError, ModuleError
+        from redis.exceptions import ConnectionError, ModuleError, TimeoutError
+
+        self.metrics.add(timeout=isinstance(excep, TimeoutError))
 
         if isinstance(excep, ConnectionError):
             self.logger.error(
@@ -503,7 +955,11 @@ class RESPModelClient(ModelClient):
 
 
 class RESPDBClient(DBClient):
-    """A Redis Serialization Protocol (RESP) based client for interaction with vector DBs served on RoboML"""
+    """A Redis Serialization Protocol (RESP) based client for interaction with vector DBs served on RoboML
+
+    :param max_connections: If set, the client uses a pool of at most this many connections to the RoboML server, shared by all threads using the client (e.g. when adding documents in parallel batches). When all connections are in use, requests wait for a free connection. Defaults to None, i.e. connections are created as needed.
+    :type max_connections: Optional[int]
+    """
 
     def __init__(
         self,
@@ -512,6 +968,7 @@ class RESPDBClient(DBClient):
         port: int = 6379,
         init_on_activation: bool = True,
         logging_level: str = "info",
+        max_connections: Optional[int] = None,
         **kwargs,
     ):
         super().__init__(
@@ -528,10 +985,17 @@ class RESPDBClient(DBClient):
 
             # patch msgpack for numpy arrays
             m_pack.patch()
-            from redis import Redis
+            from redis import BlockingConnectionPool, Redis
 
+            self.max_connections = max_connections
             # TODO: handle timeout
-            self.redis = Redis(self.host, port=self.port)
+            if self.max_connections:
+                pool = BlockingConnectionPool(
+                    host=self.host, port=self.port, max_connections=self.max_connections
+                )
+                self.redis = Redis(connection_pool=pool)
+            else:
+                self.redis = Redis(self.host, port=self.port)
             self.packer = msgpack.packb
             self.unpacker = msgpack.unpackb
 
@@ -541,6 +1005,14 @@ class RESPDBClient(DBClient):
             ) from e
         self._check_connection()
 
+    def serialize(self) -> Dict:
+        """Get client json
+        :rtype: Dict
+        """
+        client_dict = super().serialize()
+        client_dict["max_connections"] = self.max_connections
+        return client_dict
+
     def _check_connection(self) -> None:
         """Check if the platfrom is being served on specified IP and port"""
         # Ping remote server to check connection
@@ -594,10 +1066,15 @@ class RESPDBClient(DBClient):
         :rtype: dict | None
         """
         try:
-            data_b = self.packer(db_input)
             # add to DB
-            result_b = self.redis.execute_command(f"{self.db_name}.add", data_b)
-            result = self.unpacker(result_b)
+            result = _measured_command(
+                self.redis,
+                self.metrics,
+                f"{self.db_name}.add",
+                db_input,
+                self.packer,
+                self.unpacker,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -612,12 +1089,15 @@ class RESPDBClient(DBClient):
         :rtype: dict | None
         """
         try:
-            data_b = self.packer(db_input)
             # add to DB
-            result_b = self.redis.execute_command(
-                f"{self.db_name}.conditional_add", data_b
+            result = _measured_command(
+                self.redis,
+                self.metrics,
+                f"{self.db_name}.conditional_add",
+                db_input,
+                self.packer,
+                self.unpacker,
             )
-            result = self.unpacker(result_b)
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -632,12 +1112,15 @@ class RESPDBClient(DBClient):
         :rtype: dict | None
         """
         try:
-            data_b = self.packer(db_input)
             # query db
-            result_b = self.redis.execute_command(
-                f"{self.db_name}.metadata_query", data_b
+            result = _measured_command(
+                self.redis,
+                self.metrics,
+                f"{self.db_name}.metadata_query",
+                db_input,
+                self.packer,
+                self.unpacker,
             )
-            result = self.unpacker(result_b)
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -652,10 +1135,15 @@ class RESPDBClient(DBClient):
         :rtype: dict | None
         """
         try:
-            data_b = self.packer(db_input)
             # query db
-            result_b = self.redis.execute_command(f"{self.db_name}.query", data_b)
-            result = self.unpacker(result_b)
+            result = _measured_command(
+                self.redis,
+                self.metrics,
+                f"{self.db_name}.query",
+                db_input,
+                self.packer,
+                self.unpacker,
+            )
         except Exception as e:
             return self.__handle_exceptions(e)
 
@@ -693,7 +1181,9 @@ class RESPDBClient(DBClient):
         :type excep: Exception
         :rtype: None
         """
-        from redis.exceptions import ConnectionError, ModuleError
+        from redis.exceptions import ConnectionError, ModuleError, TimeoutError
+
+        self.metrics.add(timeout=isinstance(excep, TimeoutError))
 
         if isinstance(excep, ConnectionError):
             self.logger.error(
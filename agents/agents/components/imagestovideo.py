@@ -1,3 +1,4 @@
+import array
 import math
 from typing import Optional, Union, List
 
@@ -81,17 +82,39 @@ class VideoMessageMaker(Component):
         )
 
         self._frames: Union[List[ROSImage], List[ROSCompressedImage]] = []
+        # size of captured frames in bytes
+        self._frames_size: int = 0
         self._last_frame: Optional[np.ndarray] = None
         self._capture: bool = False
+        self._motion: bool = False
+        self._frame_count: int = 0
 
-    def _motion_estimation(self, current_frame: np.ndarray) -> bool:
+    def _analysis_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Get frame used for motion estimation, i.e. gray scale region of interest
+        downscaled by the configured number of pyramid levels.
+        :param frame:
+        :type frame: np.ndarray
+        :rtype: np.ndarray
+        """
+        if self.config.roi:
+            x, y, width, height = self.config.roi
+            if x + width > frame.shape[1] or y + height > frame.shape[0]:
+                raise ValueError(
+                    f"roi {self.config.roi} does not fit in input frames of size {frame.shape[1]}x{frame.shape[0]}"
+                )
+            frame = frame[y : y + height, x : x + width]
+        # get gray scale image
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        for _ in range(self.config.analysis_pyramid_levels):
+            gray = cv2.pyrDown(gray)
+        return gray
+
+    def _motion_estimation(self, gray: np.ndarray) -> bool:
         """Motion estimation methods between two frames.
-        :param current_frame:
-        :type current_frame: np.ndarray
+        :param gray: Gray scale analysis frame
+        :type gray: np.ndarray
         :rtype: bool
         """
-        # get gray scale image
-        gray = cv2.cvtColor(current_frame, cv2.COLOR_RGB2GRAY)
         if self.config.motion_estimation_func == "frame_difference":
             return self._frame_difference(gray, self.config.threshold)
         elif self.config.motion_estimation_func == "optical_flow":
@@ -131,9 +154,82 @@ class VideoMessageMaker(Component):
         """
         # calculate optical flow
         flow = cv2.calcOpticalFlowFarneback(self._last_frame, img, None, **kwargs)
-        mask = np.uint8(flow > 1) / 10
+        # flow of one pixel at full resolution is smaller on downscaled frames
+        min_flow = 1 / 2**self.config.analysis_pyramid_levels
+        mask = np.uint8(flow > min_flow) / 10
         return True if mask.sum() > (threshold * math.prod(img.shape) / 100) else False
 
+    def _compress(self, msg: ROSImage, frame: np.ndarray) -> ROSCompressedImage:
+        """Compress an image message to JPEG with the configured quality
+        :param msg: Source image message
+        :type msg: ROSImage
+        :param frame: Decoded RGB image
+        :type frame: np.ndarray
+        :rtype: ROSCompressedImage
+        """
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        _, buffer = cv2.imencode(
+            ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.config.jpeg_quality]
+        )
+        compressed = ROSCompressedImage()
+        compressed.header = msg.header
+        compressed.format = "jpeg"
+        compressed.data = array.array("B", buffer.tobytes())
+        return compressed
+
+    def _capture_frame(
+        self,
+        msg: Union[ROSImage, ROSCompressedImage],
+        topic: Topic,
+        output: Optional[np.ndarray],
+    ) -> bool:
+        """Capture a frame in the current video if motion is detected. Frames are
+        compressed only when they are going to be captured. If the frame does not fit
+        in max_video_bytes, the current video is published (or dropped, if it has less
+        than min_video_frames) and the frame starts the next video.
+        :param msg: Image message
+        :type msg: ROSImage | ROSCompressedImage
+        :param topic: Topic the message was received on
+        :type topic: Topic
+        :param output: Decoded image, if already decoded for motion estimation
+        :type output: np.ndarray | None
+        :returns: Whether the frame was captured
+        :rtype: bool
+        """
+        if not self._motion or len(self._frames) >= self.config.max_video_frames:
+            return False
+        # compress raw frames that are going to be captured
+        if self.config.compress_frames and isinstance(msg, ROSImage):
+            if output is None:
+                output = self.trig_callbacks[topic.name].get_output()
+            msg = self._compress(msg, output)
+        frame_size = len(msg.data)
+        max_bytes = self.config.max_video_bytes
+        if max_bytes is not None and self._frames_size + frame_size > max_bytes:
+            if len(self._frames) >= self.config.min_video_frames:
+                self._publish_video()
+            else:
+                self.get_logger().warning(
+                    f"Dropping {len(self._frames)} captured frames as they reached max_video_bytes before min_video_frames"
+                )
+                self._frames = []
+                self._frames_size = 0
+            if frame_size > max_bytes:
+                return False
+        self._frames.append(msg)
+        self._frames_size += frame_size
+        return True
+
+    def _publish_video(self) -> None:
+        """Publish captured frames as a video and start the next video"""
+        if self.publishers_dict:
+            self.get_logger().debug(f"Sending out video of {len(self._frames)} frames")
+            for publisher in self.publishers_dict.values():
+                publisher.publish(output=self._frames)
+        self._frames = []
+        self._frames_size = 0
+
     def _execution_step(self, *_, **kwargs) -> None:
         """Collects incoming image messages until a criteria is met
         When met, publishes image messages as video
@@ -143,18 +239,21 @@ class VideoMessageMaker(Component):
         msg = kwargs.get("msg")
         topic = kwargs.get("topic")
         if msg and topic:
-            output = self.trig_callbacks[topic.name].get_output()
-            if self._last_frame is not None:
+            output: Optional[np.ndarray] = None
+            # check motion on every Nth frame, reuse last estimate in between
+            check_motion = self._frame_count % self.config.motion_check_stride == 0
+            self._frame_count += 1
+            if check_motion or self._last_frame is None:
+                output = self.trig_callbacks[topic.name].get_output()
+                gray = self._analysis_frame(output)
                 # calculate motion estimation for start and stop
-                self._capture = (
-                    True
-                    if self._motion_estimation(output)
-                    and len(self._frames) < self.config.max_video_frames
+                self._motion = (
+                    self._motion_estimation(gray)
+                    if self._last_frame is not None
                     else False
                 )
-                if self._capture:
-                    self._frames.append(msg)
-            self._last_frame = cv2.cvtColor(output, cv2.COLOR_RGB2GRAY)
+                self._last_frame = gray
+            self._capture = self._capture_frame(msg, topic, output)
 
         # publish if video capture finished
         if (
@@ -162,7 +261,4 @@ class VideoMessageMaker(Component):
             and (not self._capture)
             and len(self._frames) >= self.config.min_video_frames
         ):
-            self.get_logger().debug(f"Sending out video of {len(self._frames)} frames")
-            for publisher in self.publishers_dict.values():
-                publisher.publish(output=self._frames)
-            self._frames = []
+            self._publish_video()
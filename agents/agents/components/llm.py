@@ -1,6 +1,24 @@
 import json
+import time
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from pathlib import Path
-from typing import Any, Optional, Union, Callable, List, Dict
+from typing import (
+    Any,
+    Optional,
+    Union,
+    Callable,
+    List,
+    Dict,
+    Tuple,
+    Iterable,
+    Iterator,
+)
 import msgpack
 import msgpack_numpy as m_pack
 
@@ -10,7 +28,18 @@ from ..clients.model_base import ModelClient
 from ..clients import OllamaClient
 from ..config import LLMConfig
 from ..ros import FixedInput, String, Topic, Detections
-from ..utils import get_prompt_template, validate_func_args
+from ..utils import (
+    get_prompt_template,
+    validate_func_args,
+    approximate_token_count,
+    evict_history_turns,
+    insert_history_summary,
+    chunk_text,
+    stream_chunks,
+    ResponseCache,
+    get_cache_keys,
+    match_similar_response,
+)
 from .model_component import ModelComponent
 from .component_base import ComponentRunType
 
@@ -102,6 +131,19 @@ class LLM(ModelComponent):
             else []
         )
 
+        self._response_cache: Optional[ResponseCache] = None
+
+        # RAG retrieval runs on a worker thread while the prompt is rendered,
+        # responses are added to the similarity cache on a separate worker so
+        # that cache writes do not delay retrieval
+        self._rag_cache: Optional[ResponseCache] = None
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self._cache_executor: Optional[ThreadPoolExecutor] = None
+
+        # token counter and summary message for token budgeted chat history
+        self._tokenizer: Callable[[str], int] = approximate_token_count
+        self._history_summary: Optional[Dict] = None
+
         super().__init__(
             inputs,
             outputs,
@@ -114,6 +156,25 @@ class LLM(ModelComponent):
         )
 
     def custom_on_configure(self):
+        # check for streaming support
+        if self.config.stream:
+            if not isinstance(self.model_client, OllamaClient):
+                raise TypeError(
+                    "Currently streaming output is only supported when using an Ollama client with the component."
+                )
+            if self.config._tool_descriptions:
+                raise TypeError(
+                    "Streaming output cannot be used when tools are registered with the component."
+                )
+
+        # async inference results can arrive out of order, which would corrupt chat history
+        if self.config.async_inference and (
+            self.config.chat_history or self.config._tool_descriptions
+        ):
+            raise TypeError(
+                "Async inference cannot be used with chat history or when tools are registered with the component, as model responses can arrive out of order."
+            )
+
         # configure the rest
         super().custom_on_configure()
 
@@ -141,7 +202,51 @@ class LLM(ModelComponent):
             self.db_client.check_connection()
             self.db_client.initialize()
 
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        """Internal handler for initializing RAG retrieval and response caches"""
+        # initialize RAG retrieval cache
+        if self.config.enable_rag and self.config.enable_rag_cache:
+            self._rag_cache = ResponseCache(
+                self.config.rag_cache_size, self.config.rag_cache_ttl
+            )
+
+        # initialize response cache
+        if self.config.enable_cache:
+            if (
+                self.config.cache_similarity_threshold is not None
+                and not self.db_client
+            ):
+                raise TypeError(
+                    "db_client needs to be set in component for similarity based response caching to work"
+                )
+            self._response_cache = ResponseCache(
+                self.config.cache_size, self.config.cache_ttl
+            )
+
+    def custom_on_activate(self):
+        # start DB worker threads
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{self.node_name}_db"
+        )
+        if self._response_cache and self.config.cache_similarity_threshold is not None:
+            self._cache_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{self.node_name}_cache"
+            )
+
+        # activate the rest
+        super().custom_on_activate()
+
     def custom_on_deactivate(self):
+        # stop DB worker threads, cancelling queued calls
+        if self._db_executor:
+            self._db_executor.shutdown(wait=False, cancel_futures=True)
+            self._db_executor = None
+        if self._cache_executor:
+            self._cache_executor.shutdown(wait=False, cancel_futures=True)
+            self._cache_executor = None
+
         # deactivate db client
         if self.db_client:
             self.db_client.check_connection()
@@ -183,6 +288,225 @@ class LLM(ModelComponent):
         }
         self.db_client.add(db_input)
 
+        # invalidate retreived documents as results can change
+        if self._rag_cache:
+            self._rag_cache.clear()
+
+    @validate_func_args
+    def add_documents_stream(
+        self,
+        documents: Iterable[Tuple[str, Dict, str]],
+        chunk_size: Optional[int] = 1000,
+        chunk_overlap: int = 100,
+        batch_size: int = 64,
+        max_workers: int = 4,
+        max_retries: int = 2,
+        start_batch: int = 0,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        retry_delay: float = 1.0,
+    ) -> int:
+        """Add a stream of documents to vector DB for Retreival Augmented Generation (RAG). Documents are consumed lazily, split into chunks and sent to the DB in batches, with several batches sent in parallel. This allows for adding large collections of documents (e.g. manuals with thousands of pages) without running out of memory or hitting the DB client response_timeout.
+
+        Batches are created deterministically from the documents. If a batch fails to be added after max_retries, a RuntimeError is raised reporting the batch from which ingestion can be resumed by passing the same documents again with start_batch.
+
+        :param documents: An iterable (e.g. a generator) of (id, metadata, document) tuples. PDFReader.iter_pages can be used to create such an iterable from PDF documents.
+        :type documents: Iterable[tuple[str, dict, str]]
+        :param chunk_size: Maximum number of characters in a document chunk. Chunks get an id of the form <id>.<chunk number> and chunk number is added to their metadata. Set to None to add documents without chunking. Defaults to 1000
+        :type chunk_size: Optional[int]
+        :param chunk_overlap: Maximum number of characters shared between consecutive chunks of a document. Defaults to 100
+        :type chunk_overlap: int
+        :param batch_size: Number of chunks sent to the DB in one request. Defaults to 64
+        :type batch_size: int
+        :param max_workers: Maximum number of batches sent to the DB in parallel. Defaults to 4
+        :type max_workers: int
+        :param max_retries: Number of times a failed batch is retried. Defaults to 2
+        :type max_retries: int
+        :param start_batch: Number of the batch from which ingestion is started, all previous batches are skipped. Used for resuming a failed ingestion. Defaults to 0
+        :type start_batch: int
+        :param progress_callback: An optional function called with the number of batches and number of chunks added, after every added batch.
+        :type progress_callback: Optional[Callable[[int, int], None]]
+        :param retry_delay: Time in seconds to wait before the first retry of a failed batch. The delay is doubled for every subsequent retry. Defaults to 1.0
+        :type retry_delay: float
+        :returns: Total number of batches, which can be used as start_batch for adding more documents to the same stream
+        :rtype: int
+
+        Example usage:
+        ```python
+        from agents.utils import PDFReader
+
+        pdf_reader = PDFReader("manual.pdf")
+        llm_component.add_documents_stream(pdf_reader.iter_pages(), chunk_size=500, chunk_overlap=50)
+        ```
+        """
+        if not self.db_client:
+            raise AttributeError(
+                "db_client needs to be set in component for add_documents_stream to work"
+            )
+
+        progress = {"batches": 0, "chunks": 0}
+        failed_batches: List[int] = []
+        batch_num = -1
+        # keep a bounded number of batches in flight to limit memory usage
+        in_flight: Dict[Future, Tuple[int, int]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_num, batch in enumerate(
+                self._document_batches(documents, chunk_size, chunk_overlap, batch_size)
+            ):
+                if batch_num < start_batch:
+                    continue
+                if failed_batches:
+                    break
+                future = executor.submit(
+                    self._add_document_batch, batch, max_retries, retry_delay
+                )
+                in_flight[future] = (batch_num, len(batch))
+                if len(in_flight) >= 2 * max_workers:
+                    failed_batches += self._collect_document_batches(
+                        in_flight, FIRST_COMPLETED, progress, progress_callback
+                    )
+            failed_batches += self._collect_document_batches(
+                in_flight, ALL_COMPLETED, progress, progress_callback
+            )
+
+        # invalidate retreived documents as results can change
+        if self._rag_cache:
+            self._rag_cache.clear()
+
+        if failed_batches:
+            raise RuntimeError(
+                f"Could not add batch {min(failed_batches)} to vector DB. Ingestion can be resumed by calling add_documents_stream with the same documents and start_batch={min(failed_batches)}"
+            )
+        return batch_num + 1
+
+    def _document_batches(
+        self,
+        documents: Iterable[Tuple[str, Dict, str]],
+        chunk_size: Optional[int],
+        chunk_overlap: int,
+        batch_size: int,
+    ) -> Iterator[List[Tuple[str, Dict, str]]]:
+        """Internal handler for lazily splitting documents into batches of chunks
+        :param documents:
+        :type documents: Iterable[tuple[str, dict, str]]
+        :param chunk_size:
+        :type chunk_size: Optional[int]
+        :param chunk_overlap:
+        :type chunk_overlap: int
+        :param batch_size:
+        :type batch_size: int
+        :rtype: Iterator[list[tuple[str, dict, str]]]
+        """
+        batch = []
+        for doc_id, metadata, document in documents:
+            chunks = (
+                (
+                    (f"{doc_id}.{idx}", {**metadata, "chunk": idx}, chunk)
+                    for idx, chunk in enumerate(
+                        chunk_text(document, chunk_size, chunk_overlap)
+                    )
+                )
+                if chunk_size
+                else [(doc_id, metadata, document)]
+            )
+            for chunk in chunks:
+                batch.append(chunk)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _add_document_batch(
+        self,
+        batch: List[Tuple[str, Dict, str]],
+        max_retries: int,
+        retry_delay: float,
+    ) -> bool:
+        """Internal handler for adding a batch of document chunks to vector DB,
+        retrying with exponential backoff if it fails
+        :param batch:
+        :type batch: list[tuple[str, dict, str]]
+        :param max_retries:
+        :type max_retries: int
+        :param retry_delay:
+        :type retry_delay: float
+        :rtype: bool
+        """
+        ids, metadatas, docs = zip(*batch)
+        db_input = {
+            "collection_name": self.config.collection_name,
+            "distance_func": self.config.distance_func,
+            "ids": list(ids),
+            "documents": list(docs),
+            "metadatas": list(metadatas),
+        }
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(retry_delay * 2 ** (attempt - 1))
+            if self.db_client.add(db_input):
+                return True
+        return False
+
+    def _collect_document_batches(
+        self,
+        in_flight: Dict[Future, Tuple[int, int]],
+        return_when: str,
+        progress: Dict[str, int],
+        progress_callback: Optional[Callable[[int, int], None]],
+    ) -> List[int]:
+        """Internal handler for waiting on batches sent to vector DB and reporting
+        progress of added batches. Returns numbers of the batches that failed
+        :param in_flight: Futures of batches sent to the DB with batch number and size
+        :type in_flight: dict[Future, tuple[int, int]]
+        :param return_when:
+        :type return_when: str
+        :param progress: Number of batches and chunks added so far
+        :type progress: dict[str, int]
+        :param progress_callback:
+        :type progress_callback: Optional[Callable[[int, int], None]]
+        :rtype: list[int]
+        """
+        failed_batches = []
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            num, size = in_flight.pop(future)
+            if not future.result():
+                failed_batches.append(num)
+                continue
+            progress["batches"] += 1
+            progress["chunks"] += size
+            self.get_logger().info(
+                f"Added batch {num} to vector DB, {progress['chunks']} chunks added"
+            )
+            if progress_callback:
+                progress_callback(progress["batches"], progress["chunks"])
+        return failed_batches
+
+    def _retrieve_documents(self, query: str) -> Future:
+        """Internal handler for starting document retreival for RAG on a worker thread.
+        Returns a completed future if documents for the query are cached, or if
+        the worker is not running, in which case documents are retreived synchronously.
+        :param query:
+        :type query: str
+        :rtype: Future
+        """
+        if self._rag_cache and (rag_docs := self._rag_cache.get(query)) is not None:
+            future = Future()
+            future.set_result(rag_docs)
+            return future
+        if executor := self._db_executor:
+            try:
+                return executor.submit(self._handle_rag_query, query)
+            except RuntimeError:
+                # worker shut down on deactivation
+                pass
+        future = Future()
+        try:
+            future.set_result(self._handle_rag_query(query))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
     def _handle_rag_query(self, query: str) -> Optional[str]:
         """Internal handler for retreiving documents for RAG.
         :param query:
@@ -212,6 +536,8 @@ class LLM(ModelComponent):
                 if self.config.add_metadata
                 else "\n".join(doc for doc in result["output"]["documents"])
             )
+            if self._rag_cache:
+                self._rag_cache.set(query, rag_docs)
             return rag_docs
 
     def _handle_chat_history(self, message: Dict) -> None:
@@ -219,6 +545,10 @@ class LLM(ModelComponent):
         if not self.config.chat_history:
             # keep system prompt if set else empty the list
             self.messages = self.messages[:1] if self.config._system_prompt else []
+        elif self.config.history_token_budget:
+            self.messages.append(message)
+            self._handle_history_token_budget()
+            return
         else:
             # if the size of history exceeds specified size than take out first
             # two messages (keeping system prompt if it exists)
@@ -236,6 +566,61 @@ class LLM(ModelComponent):
 
         self.messages.append(message)
 
+    def _handle_history_token_budget(self) -> None:
+        """Internal handler for evicting the oldest turns from chat history
+        until messages fit in the token budget"""
+        # system prompt and history summary are always kept
+        head = 1 if self.config._system_prompt else 0
+        if self._history_summary and self._history_summary in self.messages[:2]:
+            head += 1
+
+        # evict oldest turns, always keeping the latest message
+        evicted = evict_history_turns(
+            self.messages, self.config.history_token_budget, self._tokenizer, head
+        )
+
+        if evicted and self.config.summarize_history:
+            self._summarize_history(evicted)
+
+    def _summarize_history(self, evicted: List[Dict]) -> None:
+        """Internal handler for replacing evicted chat history with its summary
+        :param evicted: Messages evicted from chat history
+        :type evicted: list[dict]
+        """
+        conversation = "\n".join(
+            f"{message['role']}: {message['content']}" for message in evicted
+        )
+        if self._history_summary:
+            conversation = f"{self._history_summary['content']}\n{conversation}"
+        summary_input = {
+            "query": [
+                {
+                    "role": "user",
+                    "content": f"Summarize the following conversation in a few sentences, keeping all important facts:\n{conversation}",
+                }
+            ],
+            **self.config._get_inference_params(),
+        }
+        result = self.model_client.inference(summary_input)
+        if not result or not isinstance(result.get("output"), str):
+            self.get_logger().warning(
+                "Could not summarize chat history, evicted messages are dropped"
+            )
+            return
+
+        # replace previous summary, placing it after the system prompt
+        summary = {
+            "role": "system",
+            "content": f"Summary of the earlier conversation: {result['output']}",
+        }
+        insert_history_summary(
+            self.messages,
+            summary,
+            self._history_summary,
+            1 if self.config._system_prompt else 0,
+        )
+        self._history_summary = summary
+
     def _handle_tool_calls(self, result: Dict) -> Optional[Dict]:
         """Internal handler for tool calling"""
         if not result.get("tool_calls"):
@@ -299,6 +684,102 @@ class LLM(ModelComponent):
             # return result with its output set to last function response
             return result
 
+    def _handle_streaming_output(self, result: Dict) -> Optional[str]:
+        """Internal handler for publishing streamed model output in chunks.
+        Returns the complete output if streaming was successful"""
+        chunks = []
+        try:
+            for chunk in stream_chunks(
+                result["output"],
+                self.config.break_character,
+                self.config.response_terminator,
+            ):
+                self._publish_output(chunk)
+                chunks.append(chunk)
+        except Exception as e:
+            self.get_logger().error(f"Exception while streaming model output. {e}")
+            # raise a fallback trigger via health status
+            self.health_status.set_failure()
+            return None
+
+        # complete output, without the response terminator
+        if self.config.response_terminator:
+            chunks.pop()
+        output = "".join(chunks)
+        self.messages.append({"role": "assistant", "content": output})
+        return output
+
+    def _get_cached_response(self, cache_keys: Tuple[str, str, str]) -> Optional[str]:
+        """Internal handler for looking up a model response in cache. Looks up
+        identical inputs first and then similar prompts in the vector DB, if
+        similarity lookup is enabled
+        :param cache_keys: Response key, context key and prompt
+        :type cache_keys: tuple[str, str, str]
+        :rtype: str | None
+        """
+        if not self._response_cache:
+            return None
+        key, context_key, prompt = cache_keys
+        if (output := self._response_cache.get(key)) is not None:
+            return output
+
+        if self.config.cache_similarity_threshold is None or not self.db_client:
+            return None
+
+        db_input = {
+            "collection_name": self.config.cache_collection_name,
+            "query": prompt,
+            "n_results": self.config.cache_similarity_candidates,
+        }
+        result = self.db_client.query(db_input)
+        # match only responses generated in the same context
+        return match_similar_response(
+            result,
+            context_key,
+            self.config.cache_similarity_threshold,
+            self.config.cache_ttl,
+        )
+
+    def _cache_response(self, cache_keys: Tuple[str, str, str], output: str) -> None:
+        """Internal handler for adding a model response to cache, after a cache miss.
+        Responses are added to the similarity cache on the cache worker thread
+        :param cache_keys: Response key, context key and prompt
+        :type cache_keys: tuple[str, str, str]
+        :param output:
+        :type output: str
+        """
+        if not self._response_cache or not isinstance(output, str):
+            return
+        key, context_key, prompt = cache_keys
+        self._response_cache.set(key, output)
+
+        if (
+            self.config.cache_similarity_threshold is None
+            or not self.db_client
+            or not (executor := self._cache_executor)
+        ):
+            return
+        db_input = {
+            "collection_name": self.config.cache_collection_name,
+            "distance_func": self.config.distance_func,
+            "ids": [key],
+            "documents": [prompt],
+            "metadatas": [
+                {"context_key": context_key, "output": output, "timestamp": time.time()}
+            ],
+        }
+        try:
+            executor.submit(self.db_client.add, db_input)
+        except RuntimeError:
+            # worker shut down on deactivation, skip similarity cache
+            pass
+
+    def _publish_output(self, output: str) -> None:
+        """Publish output to all publishers"""
+        if hasattr(self, "publishers_dict"):
+            for publisher in self.publishers_dict.values():
+                publisher.publish(output=output)
+
     def _create_input(self, *_, **kwargs) -> Optional[Dict[str, Any]]:
         """Create inference input for LLM models
         :param args:
@@ -318,6 +799,7 @@ class LLM(ModelComponent):
                 and query.strip().lower() == self.config.history_reset_phrase
             ):
                 self.messages = []
+                self._history_summary = None
                 return None
 
         else:
@@ -331,20 +813,23 @@ class LLM(ModelComponent):
                     if not query:
                         query = item
                     context[i.input_topic.name] = item
-                elif i.input_topic.msg_type is Detections:
+                elif issubclass(i.input_topic.msg_type, Detections):
                     context[i.input_topic.name] = item
 
         if query is None:
             return None
 
-        # get RAG results if enabled in config and if docs retreived
-        rag_result = self._handle_rag_query(query) if self.config.enable_rag else None
+        # start RAG retreival if enabled in config, while the prompt is rendered
+        rag_future = self._retrieve_documents(query) if self.config.enable_rag else None
 
         # set system prompt template
         query = (
             self.component_prompt.render(context) if self.component_prompt else query
         )
 
+        # get RAG results if docs retreived
+        rag_result = rag_future.result() if rag_future else None
+
         # attach rag results to templated query if available
         query = f"{rag_result}\n{query}" if rag_result else query
 
@@ -353,15 +838,29 @@ class LLM(ModelComponent):
 
         self.get_logger().debug(f"Input from component: {self.messages}")
 
+        # copy messages so that chat history can be updated while async inference is running
         input = {
-            "query": self.messages,
+            "query": list(self.messages),
             **self.config._get_inference_params(),
         }
 
+        return self._add_request_options(input)
+
+    def _add_request_options(self, input: Dict[str, Any]) -> Dict[str, Any]:
+        """Internal handler for adding registered tools and streaming request
+        to inference input
+        :param input:
+        :type input: dict[str, Any]
+        :rtype: dict[str, Any]
+        """
         # Add any tools, if registered
         if self.config._tool_descriptions:
             input["tools"] = self.config._tool_descriptions
 
+        # Request streamed output, if enabled
+        if self.config.stream:
+            input["stream"] = True
+
         return input
 
     def _execution_step(self, *args, **kwargs):
@@ -387,10 +886,40 @@ class LLM(ModelComponent):
             self.get_logger().warning("Input not received, not calling model inference")
             return
 
+        # reuse cached response if available, tool calls are never cached
+        if self._response_cache and not self.config._tool_descriptions:
+            cache_keys = get_cache_keys(inference_input, self.config.cache_fuzzy_images)
+            if (output := self._get_cached_response(cache_keys)) is not None:
+                self.get_logger().debug("Found cached response for input")
+                # publish cached output as a single chunk when streaming
+                self._handle_inference_result({
+                    "output": [output] if self.config.stream else output
+                })
+                return
+            self._call_inference(inference_input, cache_keys=cache_keys)
+            return
+
         # conduct inference
-        result = self.model_client.inference(inference_input)
+        self._call_inference(inference_input)
 
-        if result:
+    def _handle_inference_result(
+        self,
+        result: Optional[Dict],
+        cache_keys: Optional[Tuple[str, str, str]] = None,
+        **_,
+    ) -> None:
+        """Handle model inference result and publish it
+        :param result:
+        :type result: dict | None
+        :param cache_keys: Keys for caching the result, if response caching is enabled
+        :type cache_keys: tuple[str, str, str] | None
+        """
+        if result and self.config.stream:
+            output = self._handle_streaming_output(result)
+            if cache_keys and output is not None:
+                self._cache_response(cache_keys, output)
+
+        elif result:
             result_message = {"role": "assistant", "content": result["output"]}
             self.messages.append(result_message)
 
@@ -403,6 +932,9 @@ class LLM(ModelComponent):
                 self.health_status.set_failure()
                 return
 
+            if cache_keys:
+                self._cache_response(cache_keys, result["output"])
+
             # publish inference result
             if hasattr(self, "publishers_dict"):
                 for publisher in self.publishers_dict.values():
@@ -478,6 +1010,23 @@ class LLM(ModelComponent):
         """
         self.config._system_prompt = prompt
 
+    def set_tokenizer(self, tokenizer: Callable[[str], int]) -> None:
+        """Set a tokenizer for counting tokens in chat history, when history_token_budget is set in the component config. By default, the number of tokens is approximated from the length of the text.
+
+        :param tokenizer: A function that takes a string and returns the number of tokens in it.
+        :type tokenizer: Callable[[str], int]
+        :rtype: None
+
+        Example usage:
+        ```python
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained("meta-llama/Meta-Llama-3-8B")
+        llm_component.set_tokenizer(lambda text: len(tokenizer.encode(text)))
+        ```
+        """
+        self._tokenizer = tokenizer
+
     def register_tool(
         self,
         tool: Callable,
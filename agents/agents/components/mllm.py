@@ -101,6 +101,7 @@ class MLLM(LLM):
                 and query.strip().lower() == self.config.history_reset_phrase
             ):
                 self.messages = []
+                self._history_summary = None
                 return None
 
         else:
@@ -114,7 +115,7 @@ class MLLM(LLM):
                     if not query:
                         query = item
                     context[i.input_topic.name] = item
-                elif i.input_topic.msg_type is Detections:
+                elif issubclass(i.input_topic.msg_type, Detections):
                     context[i.input_topic.name] = item
                 # get images from image topics
                 if issubclass(i.input_topic.msg_type, Image):
@@ -123,15 +124,18 @@ class MLLM(LLM):
         if not query or not images:
             return None
 
-        # get RAG results if enabled in config and if docs retreived
-        rag_result = self._handle_rag_query(query) if self.config.enable_rag else None
+        # start RAG retreival if enabled in config, while the prompt is rendered
+        rag_future = self._retrieve_documents(query) if self.config.enable_rag else None
 
         # set system prompt template
         query = (
             self.component_prompt.render(context) if self.component_prompt else query
         )
 
-        # get RAG results if enabled in config and if docs retreived
+        # get RAG results if docs retreived
+        rag_result = rag_future.result() if rag_future else None
+
+        # attach rag results to templated query if available
         query = f"{rag_result}\n{query}" if rag_result else query
 
         message = {"role": "user", "content": query}
@@ -139,17 +143,14 @@ class MLLM(LLM):
 
         self.get_logger().debug(f"Input from component: {self.messages}")
 
+        # copy messages so that chat history can be updated while async inference is running
         input = {
-            "query": self.messages,
+            "query": list(self.messages),
             "images": images,
             **self.config._get_inference_params(),
         }
 
-        # Add any tools, if registered
-        if self.config._tool_descriptions:
-            input["tools"] = self.config._tool_descriptions
-
-        return input
+        return self._add_request_options(input)
 
     def _warmup(self):
         """Warm up and stat check"""
@@ -1,11 +1,15 @@
 from abc import abstractmethod
+from concurrent.futures import Future
 import inspect
 import json
-from typing import Any, Optional, Sequence, Union, List, Dict, Type
+from typing import Any, Optional, Sequence, Union, List, Dict, Type, Tuple
+
+from diagnostic_msgs.msg import DiagnosticArray, DiagnosticStatus, KeyValue
 
 from ..clients.model_base import ModelClient
 from ..config import ModelComponentConfig
 from ..ros import FixedInput, Topic, SupportedType
+from ..utils import InferenceSlots
 from .component_base import Component
 
 
@@ -31,6 +35,13 @@ class ModelComponent(Component):
         if not config:
             self.config = ModelComponentConfig()
 
+        # inference calls in flight and waiting inputs for async inference
+        self._inference_slots: Optional[InferenceSlots] = None
+
+        # state for publishing client metrics
+        self._metrics_timer = None
+        self._metrics_error_counts: Dict[str, int] = {}
+
         # Initialize Component
         super().__init__(
             inputs,
@@ -48,6 +59,12 @@ class ModelComponent(Component):
         """
         self.get_logger().debug(f"Current Status: {self.health_status.value}")
 
+        self._inference_slots = InferenceSlots(
+            self.config.max_inflight_inferences,
+            self.config.max_pending_inferences,
+            self.config.drop_policy,
+        )
+
         # validate output topics if handled_outputs exist
         self.get_logger().info("Validating Model Component Output Topics")
         self._validate_output_topics()
@@ -62,10 +79,36 @@ class ModelComponent(Component):
                 except Exception as e:
                     self.get_logger().error(f"Error encountered in warmup: {e}")
 
+    def custom_on_activate(self):
+        """
+        Create metrics publisher if enabled
+        """
+        super().custom_on_activate()
+
+        if self.config.publish_metrics:
+            self._metrics_publisher = self.create_publisher(
+                DiagnosticArray, "/diagnostics", 1
+            )
+            self._metrics_timer = self.create_timer(
+                self.config.metrics_publish_period, self._publish_metrics
+            )
+
     def custom_on_deactivate(self):
         """
         Destroy model client if it exists
         """
+        # Stop publishing metrics
+        if self._metrics_timer:
+            self.destroy_timer(self._metrics_timer)
+            self.destroy_publisher(self._metrics_publisher)
+            self._metrics_timer = None
+
+        # Discard inputs waiting for async inference and stop inference workers
+        if self._inference_slots:
+            self._inference_slots.clear()
+        if self.model_client:
+            self.model_client.shutdown_async()
+
         # Deinitialize model
         if self.model_client:
             self.model_client.check_connection()
@@ -95,6 +138,136 @@ class ModelComponent(Component):
         """Enable warmup of the model."""
         self.config.warmup = value
 
+    def _call_inference(self, inference_input: Dict[str, Any], **kwargs) -> None:
+        """Conduct model inference and pass its result to _handle_inference_result.
+        If async_inference is enabled in config, inference is dispatched to a worker
+        thread and the result is handled on completion.
+
+        :param inference_input:
+        :type inference_input: dict[str, Any]
+        :param kwargs: Passed on to _handle_inference_result
+        """
+        if not self.config.async_inference:
+            self._handle_inference_result(
+                self.model_client.inference(inference_input), **kwargs
+            )
+            return
+
+        # dispatch now or keep input pending until a worker is free
+        if self._inference_slots.acquire((inference_input, kwargs)):
+            self._dispatch_inference([(inference_input, kwargs)])
+        else:
+            self.get_logger().debug(
+                f"Inference workers busy, {self._inference_slots.dropped} inputs dropped so far"
+            )
+
+    def _dispatch_inference(
+        self, inferences: List[Tuple[Dict[str, Any], Dict]]
+    ) -> None:
+        """Send inference inputs to model client workers. Several inputs are sent as one batched call.
+
+        :param inferences: Inference inputs with keyword arguments for handling their results
+        :type inferences: list[tuple[dict[str, Any], dict]]
+        """
+        inference_inputs = [inference_input for inference_input, _ in inferences]
+        kwargs_list = [kwargs for _, kwargs in inferences]
+        if len(inferences) > 1:
+            self.get_logger().debug(f"Sending batch of {len(inferences)} inputs")
+            future = self.model_client.inference_batch_async(inference_inputs)
+        else:
+            future = self.model_client.inference_async(inference_inputs[0])
+        future.add_done_callback(
+            lambda done_future: self._on_inference_done(done_future, kwargs_list)
+        )
+
+    def _on_inference_done(self, future: Future, kwargs_list: List[Dict]) -> None:
+        """Handle results of async inference and dispatch pending inputs.
+
+        :param future:
+        :type future: Future
+        :param kwargs_list: Keyword arguments for handling the result of each input
+        :type kwargs_list: list[dict]
+        """
+        try:
+            # inference cancelled on deactivation
+            if future.cancelled():
+                return
+            try:
+                results = future.result()
+                # batched calls return a result for each input
+                if len(kwargs_list) == 1:
+                    results = [results]
+            except Exception as e:
+                self.get_logger().error(f"Exception in model inference. {e}")
+                results = [None] * len(kwargs_list)
+            for result, kwargs in zip(results, kwargs_list):
+                try:
+                    self._handle_inference_result(result, **kwargs)
+                except Exception as e:
+                    self.get_logger().error(
+                        f"Exception in handling inference result. {e}"
+                    )
+        finally:
+            if next_inferences := self._inference_slots.release_batch():
+                self._dispatch_inference(next_inferences)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Get metrics of calls made by the clients of the component, keyed by client name. Metrics include latency percentiles and histogram, mean serialization, network and server time, mean payload sizes and error and timeout counts for each type of call.
+
+        :rtype: dict[str, dict]
+
+        Example usage:
+        ```python
+        metrics = llm_component.get_metrics()
+        print(metrics["llama"]["inference"]["latency_ms"]["p99"])
+        ```
+        """
+        metrics = {}
+        if self.model_client:
+            metrics[self.model_client.model_name] = self.model_client.get_metrics()
+        # components using a DB client, e.g. for RAG
+        if db_client := getattr(self, "db_client", None):
+            metrics[db_client.db_name] = db_client.get_metrics()
+        return metrics
+
+    def _publish_metrics(self) -> None:
+        """Publish client metrics as diagnostics. Diagnostic level of a client is
+        set to WARN if any of its calls failed since metrics were last published"""
+        msg = DiagnosticArray()
+        msg.header.stamp = self.get_clock().now().to_msg()
+        for client_name, client_metrics in self.get_metrics().items():
+            status = DiagnosticStatus()
+            status.name = f"{self.node_name}/{client_name}"
+            status.hardware_id = client_name
+            errors = sum(
+                call["errors"] + call["timeouts"] for call in client_metrics.values()
+            )
+            if errors > self._metrics_error_counts.get(client_name, 0):
+                status.level = DiagnosticStatus.WARN
+                status.message = "Client calls failed"
+            else:
+                status.level = DiagnosticStatus.OK
+                status.message = "OK"
+            self._metrics_error_counts[client_name] = errors
+            status.values = [
+                KeyValue(key=key, value=str(value))
+                for key, value in _flatten_metrics(client_metrics).items()
+            ]
+            msg.status.append(status)
+        self._metrics_publisher.publish(msg)
+
+    @abstractmethod
+    def _handle_inference_result(self, result: Optional[Dict], **kwargs) -> None:
+        """_handle_inference_result.
+
+        :param result:
+        :type result: dict | None
+        :param kwargs:
+        """
+        raise NotImplementedError(
+            "_handle_inference_result method needs to be implemented by child components."
+        )
+
     @abstractmethod
     def _create_input(self, *args, **kwargs) -> Union[Dict[str, Any], None]:
         """_create_input.
@@ -150,3 +323,20 @@ class ModelComponent(Component):
         if not self.model_client:
             return ""
         return json.dumps(self.model_client.serialize())
+
+
+def _flatten_metrics(metrics: Dict, prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested metrics dict with dot separated keys
+    :param metrics:
+    :type metrics: dict
+    :param prefix:
+    :type prefix: str
+    :rtype: dict[str, Any]
+    """
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(_flatten_metrics(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
@@ -7,7 +7,13 @@ from collections import deque
 from ..clients.model_base import ModelClient
 from ..config import SpeechToTextConfig
 from ..ros import Audio, String, Topic
-from ..utils import validate_func_args, VADStatus, WakeWordStatus, load_model
+from ..utils import (
+    validate_func_args,
+    remove_overlap,
+    VADStatus,
+    WakeWordStatus,
+    load_model,
+)
 from .model_component import ModelComponent
 from .component_base import ComponentRunType
 
@@ -77,6 +83,13 @@ class SpeechToText(ModelComponent):
                 "SpeechToText component cannot be started as a timed component"
             )
 
+        if self.config.partial_transcripts_topic and (
+            self.config.partial_transcripts_topic not in [o.name for o in outputs]
+        ):
+            raise ValueError(
+                f"partial_transcripts_topic '{self.config.partial_transcripts_topic}' must be one of the output topics of the component"
+            )
+
         super().__init__(
             inputs,
             outputs,
@@ -88,6 +101,16 @@ class SpeechToText(ModelComponent):
             **kwargs,
         )
 
+    def custom_on_configure(self):
+        """Custom configuration"""
+        # chunks of streamed speech need to be transcribed in order
+        if self.config.stream_transcripts and self.config.async_inference:
+            raise TypeError(
+                "stream_transcripts cannot be used with async_inference, as transcripts of speech chunks need to be received in order."
+            )
+
+        super().custom_on_configure()
+
     def custom_on_activate(self):
         """Custom activation"""
         # NOTE: Custom activate to ensure creation of separate thread if VAD is enabled
@@ -99,10 +122,22 @@ class SpeechToText(ModelComponent):
 
         # If VAD is enabled, start a listening stream on a separate thread
         if self.config.enable_vad:
-            from ..utils.voice import VADIterator
+            from ..utils.voice import VADIterator, AudioRingBuffer
 
             self.event = threading.Event()
             self.queue = queue.Queue()
+            # captured audio waiting for processing
+            self.audio_buffer = AudioRingBuffer(
+                block_size=self.config._block_size,
+                capacity=max(
+                    int(
+                        self.config._sample_rate
+                        * self.config.audio_buffer_max_len
+                        / (1000 * self.config._block_size)
+                    ),
+                    1,
+                ),
+            )
             self.vad_iterator = VADIterator(
                 model_path=load_model("silero_vad", self.config.vad_model_path),
                 threshold=self.config.vad_threshold,
@@ -112,6 +147,11 @@ class SpeechToText(ModelComponent):
                 ncpu=self.config.ncpu_vad,
                 device=self.config.device_vad,
             )
+            # streaming state, i.e. number of blocks at the start of the speech buffer
+            # already sent for transcription and transcript of sent chunks
+            self._sent_blocks = 0
+            self._chunk_requested = False
+            self._transcript = ""
             self.speech_buffer = deque(
                 maxlen=int(
                     self.config._sample_rate
@@ -141,14 +181,26 @@ class SpeechToText(ModelComponent):
                     device=self.config.device_wakeword,
                 )
                 self.wake_word_triggered = False
-            self.listening_thread = threading.Thread(target=self._process_audio).start()
+            # VAD and wakeword features run on a separate thread from audio capture
+            self.processing_thread = threading.Thread(target=self._process_blocks)
+            self.processing_thread.start()
+            self.listening_thread = threading.Thread(target=self._process_audio)
+            self.listening_thread.start()
 
     def custom_on_deactivate(self):
-        # If VAD is enabled, stop the listening stream thread
+        # If VAD is enabled, stop the listening stream and processing threads
         if self.config.enable_vad:
             self.event.set()
+            # unblock listening thread waiting for VAD outputs
+            self.queue.put_nowait(None)
             if self.listening_thread:
                 self.listening_thread.join()
+            if self.processing_thread:
+                self.processing_thread.join()
+            if self.audio_buffer.overflows:
+                self.get_logger().warning(
+                    f"Dropped {self.audio_buffer.overflows} audio blocks as processing could not keep up with audio capture"
+                )
 
         # Deactivate component
         super().custom_on_deactivate()
@@ -176,7 +228,8 @@ class SpeechToText(ModelComponent):
     def _stream_callback(
         self, indata: bytes, frames: int, _, status
     ) -> Tuple[bytes, int]:
-        """Stream callback function for processing audio
+        """Stream callback function for capturing audio. Only copies captured audio into
+        the audio buffer, which is processed on a separate thread.
 
         :param indata:
         :type indata: np.ndarray
@@ -190,30 +243,94 @@ class SpeechToText(ModelComponent):
         assert frames == self.config._block_size
         if status:
             self.get_logger().warn(f"Status: {status}")
-        try:
-            import pyaudio
-        except ModuleNotFoundError as e:
-            raise ModuleNotFoundError(
-                "enable_vad configuration for SpeechToText component requires pyaudio module to be installed. Please install it with `pip install pyaudio`"
-            ) from e
-        np_frames = np.frombuffer(indata, dtype=np.int16).astype(np.float32)
-        vad_output = self.vad_iterator(np_frames)
+        self.audio_buffer.put(indata)
+        return indata, self._pa_continue
+
+    def _process_blocks(self) -> None:
+        """Runs VAD and wakeword audio features on captured audio blocks"""
+        while not self.event.is_set():
+            blocks = self.audio_buffer.get(self.config.audio_batch_size)
+            if blocks is None:
+                continue
+            np_blocks = blocks.astype(np.float32)
 
-        # if wake word is enabled then store speech when its triggered
-        if self.config.enable_wakeword:
             # create audio embeddings for wakeword classifier
-            self.audio_features(np_frames)
-            if self.wake_word_triggered:
-                self.speech_buffer.append(indata)
-        # otherwise store speech when vad is triggered
-        elif self.vad_iterator.triggered:
-            self.speech_buffer.append(indata)
+            if self.config.enable_wakeword:
+                self.audio_features(np_blocks)
 
-        # add vad status outputs to queue
-        if vad_output:
-            self.queue.put_nowait(vad_output)
+            for block, np_frames in zip(blocks, np_blocks):
+                vad_output = self.vad_iterator(np_frames)
 
-        return indata, pyaudio.paContinue
+                # if wake word is enabled then store speech when its triggered
+                if self.config.enable_wakeword:
+                    if self.wake_word_triggered:
+                        self.speech_buffer.append(block.tobytes())
+                # otherwise store speech when vad is triggered
+                elif self.vad_iterator.triggered:
+                    self.speech_buffer.append(block.tobytes())
+
+                # add vad status outputs to queue
+                if vad_output:
+                    self.queue.put_nowait(vad_output)
+                # request transcription of a chunk if enough new speech is buffered
+                elif (
+                    self.config.stream_transcripts
+                    and not self._chunk_requested
+                    and len(self.speech_buffer) - self._sent_blocks
+                    >= self._blocks(self.config.stream_chunk_ms)
+                ):
+                    self._chunk_requested = True
+                    self.queue.put_nowait(VADStatus.ONGOING)
+
+    def _blocks(self, duration_ms: int) -> int:
+        """Number of audio blocks in given duration
+        :param duration_ms:
+        :type duration_ms: int
+        :rtype: int
+        """
+        return int(
+            self.config._sample_rate * duration_ms / (1000 * self.config._block_size)
+        )
+
+    def _send_speech_chunk(self) -> None:
+        """Send buffered speech that has not been transcribed yet, along with overlap from the previous chunk, for transcription and remove sent speech from the buffer."""
+        self._chunk_requested = False
+        blocks = list(self.speech_buffer)
+        if len(blocks) - self._sent_blocks < self._blocks(self.config.stream_chunk_ms):
+            return
+        overlap = min(self._blocks(self.config.stream_overlap_ms), len(blocks))
+        # keep overlap for next chunk, processing thread keeps appending to the buffer
+        for _ in range(len(blocks) - overlap):
+            self.speech_buffer.popleft()
+        self._sent_blocks = overlap
+        self._execution_step(speech=blocks, partial=True)
+
+    def _handle_ongoing_speech(self) -> None:
+        """Check for wakeword, if enabled, and send a chunk of speech for transcription, if streaming transcripts, while speech is ongoing"""
+        if self.config.enable_wakeword:
+            wake_status = self.wake_word(
+                self.audio_features.get_embeddings(self.wake_word.model_input)
+            )
+            if wake_status is WakeWordStatus.END:
+                self.get_logger().debug("Wakeword ended")
+                self.wake_word_triggered = True
+        # transcribe speech received so far, if streaming
+        if self.config.stream_transcripts:
+            self._send_speech_chunk()
+
+    def _send_speech(self) -> None:
+        """Send buffered speech for transcription when speech ends. When streaming, the buffered speech is the last chunk and the complete transcript is published once it is transcribed."""
+        # take a snapshot as processing thread keeps adding to the buffer
+        speech = list(self.speech_buffer)
+        self.speech_buffer.clear()
+        self._sent_blocks = 0
+        self._chunk_requested = False
+        if speech:
+            self._execution_step(speech=speech, partial=False)
+        elif self._transcript:
+            # all speech was transcribed in previous chunks
+            self._publish_transcript({"output": self._transcript}, partial=False)
+            self._transcript = ""
 
     def _process_audio(self) -> None:
         """Creates a stream to process audio from device"""
@@ -228,6 +345,7 @@ class SpeechToText(ModelComponent):
             raise ModuleNotFoundError(
                 "enable_vad configuration for SpeechToText component requires pyaudio module to be installed. Please install it with `pip install pyaudio`"
             ) from e
+        self._pa_continue = pyaudio.paContinue
         # Create an interface to PortAudio
         audio_interface = pyaudio.PyAudio()
 
@@ -252,20 +370,13 @@ class SpeechToText(ModelComponent):
                     )
             elif vad_output is VADStatus.ONGOING:
                 self.get_logger().debug("Speech ongoing")
-                if self.config.enable_wakeword:
-                    wake_status = self.wake_word(
-                        self.audio_features.get_embeddings(self.wake_word.model_input)
-                    )
-                    if wake_status is WakeWordStatus.END:
-                        self.get_logger().debug("Wakeword ended")
-                        self.wake_word_triggered = True
+                self._handle_ongoing_speech()
             elif vad_output is VADStatus.END:
                 # Send audio when speech finishes
                 self.get_logger().debug("Speech ended")
                 if self.config.enable_wakeword:
                     self.wake_word_triggered = False
-                self._execution_step(speech=self.speech_buffer)
-                self.speech_buffer.clear()
+                self._send_speech()
             if self.event.is_set():
                 stream.stop_stream()
                 stream.close()
@@ -303,15 +414,52 @@ class SpeechToText(ModelComponent):
 
         # conduct inference
         if self.model_client:
-            result = self.model_client.inference(inference_input)
-            if result:
-                # publish inference result
-                if self.publishers_dict:
-                    for publisher in self.publishers_dict.values():
-                        publisher.publish(**result)
+            if self.config.stream_transcripts and "partial" in kwargs:
+                self._call_inference(inference_input, partial=kwargs["partial"])
             else:
-                # raise a fallback trigger via health status
-                self.health_status.set_failure()
+                self._call_inference(inference_input)
+
+    def _handle_inference_result(
+        self, result: Optional[Dict], partial: Optional[bool] = None, **_
+    ) -> None:
+        """Handle model inference result and publish it
+        :param result:
+        :type result: dict | None
+        :param partial: Whether the result is the transcript of a chunk of ongoing speech (True) or of the last chunk of speech (False), when streaming transcripts
+        :type partial: bool | None
+        """
+        if not result:
+            # raise a fallback trigger via health status
+            self.health_status.set_failure()
+            # drop transcript of the utterance if its last chunk failed
+            if partial is False:
+                self._transcript = ""
+            return
+
+        if partial is not None:
+            # add newly transcribed text of overlapping chunks to transcript
+            text = remove_overlap(self._transcript, result["output"])
+            transcript = f"{self._transcript} {text}".strip()
+            self._transcript = transcript if partial else ""
+            if partial and not text:
+                return
+            result = {**result, "output": transcript}
+
+        # publish inference result
+        self._publish_transcript(result, partial=bool(partial))
+
+    def _publish_transcript(self, result: Dict, partial: bool) -> None:
+        """Publish a partial transcript on the partial transcripts topic, if set, or a complete transcript on all other output topics
+        :param result:
+        :type result: dict
+        :param partial:
+        :type partial: bool
+        """
+        if not self.publishers_dict:
+            return
+        for name, publisher in self.publishers_dict.items():
+            if (name == self.config.partial_transcripts_topic) is partial:
+                publisher.publish(**result)
 
     def _warmup(self):
         """Warm up and stat check"""
@@ -96,11 +96,30 @@ class TextToSpeech(ModelComponent):
         if self.config.play_on_device:
             self.queue = queue.Queue(maxsize=self.config.buffer_size)
             self.event = threading.Event()
+            # audio outputs waiting for playback, when playback is queued
+            self.playback_queue = queue.Queue()
+            self.playback_thread = None
+
+    def custom_on_activate(self):
+        # Activate component
+        super().custom_on_activate()
+
+        # If playback is queued, play audio outputs one after another on a separate thread
+        if self.config.play_on_device and self.config.queue_playback:
+            self.playback_thread = threading.Thread(target=self._play_queued_audio)
+            self.playback_thread.start()
 
     def custom_on_deactivate(self):
         if self.config.play_on_device:
             # If play_on_device is enabled, stop the playing stream thread
             self.event.set()
+            if self.playback_thread:
+                # discard queued outputs and unblock playback thread
+                with self.playback_queue.mutex:
+                    self.playback_queue.queue.clear()
+                self.playback_queue.put_nowait(None)
+                self.playback_thread.join()
+                self.playback_thread = None
 
         # Deactivate component
         super().custom_on_deactivate()
@@ -222,6 +241,14 @@ class TextToSpeech(ModelComponent):
                 # Wait until playback is finished after last chunck
                 self.event.wait()
 
+    def _play_queued_audio(self) -> None:
+        """Play queued audio outputs one after another, until a None output is received"""
+        while (output := self.playback_queue.get()) is not None:
+            try:
+                self._playback_audio(output)
+            except Exception as e:
+                self.get_logger().error(f"Exception in audio playback. {e}")
+
     def _execution_step(self, *args, **kwargs):
         """_execution_step.
 
@@ -247,24 +274,33 @@ class TextToSpeech(ModelComponent):
 
         # conduct inference
         if self.model_client:
-            result = self.model_client.inference(inference_input)
-            if result:
-                if self.config.play_on_device:
-                    # Stop any previous playback by setting event and clearing queue
-                    self.event.set()
-                    with self.queue.mutex:
-                        self.queue.queue.clear()
-                    # Start a new playback thread
-                    threading.Thread(
-                        target=self._playback_audio, args=(result.get("output"),)
-                    ).start()
-                # publish inference result
-                if hasattr(self, "publishers_dict"):
-                    for publisher in self.publishers_dict.values():
-                        publisher.publish(**result)
-            else:
-                # raise a fallback trigger via health status
-                self.health_status.set_failure()
+            self._call_inference(inference_input)
+
+    def _handle_inference_result(self, result: Optional[Dict], **_) -> None:
+        """Handle model inference result, play it on device if enabled and publish it
+        :param result:
+        :type result: dict | None
+        """
+        if result:
+            if self.config.play_on_device and self.config.queue_playback:
+                # Play after any previous playback is finished
+                self.playback_queue.put_nowait(result.get("output"))
+            elif self.config.play_on_device:
+                # Stop any previous playback by setting event and clearing queue
+                self.event.set()
+                with self.queue.mutex:
+                    self.queue.queue.clear()
+                # Start a new playback thread
+                threading.Thread(
+                    target=self._playback_audio, args=(result.get("output"),)
+                ).start()
+            # publish inference result
+            if hasattr(self, "publishers_dict"):
+                for publisher in self.publishers_dict.values():
+                    publisher.publish(**result)
+        else:
+            # raise a fallback trigger via health status
+            self.health_status.set_failure()
 
     def _warmup(self):
         """Warm up and stat check"""
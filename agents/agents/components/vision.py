@@ -1,4 +1,4 @@
-from typing import Any, Union, Optional, List, Dict
+from typing import Any, Union, Optional, List, Dict, Tuple
 import queue
 import threading
 import numpy as np
@@ -15,7 +15,7 @@ from ..ros import (
     ROSImage,
     ROSCompressedImage,
 )
-from ..utils import validate_func_args
+from ..utils import TimedBatch, validate_func_args
 from .model_component import ModelComponent
 from .component_base import ComponentRunType
 
@@ -28,7 +28,7 @@ class Vision(ModelComponent):
         This should be a list of Topic objects or FixedInput objects, limited to Image type.
     :type inputs: list[Union[Topic, FixedInput]]
     :param outputs: The output topics for the object detection.
-        This should be a list of Topic objects, Detection and Tracking types are handled automatically.
+        This should be a list of Topic objects, Detection and Tracking types are handled automatically. For large numbers of detections, FlatDetections and FlatTrackings types can be used, which publish boxes and points as flat arrays.
     :type outputs: list[Topic]
     :param model_client: The model client for the vision component.
         This should be an instance of ModelClient.
@@ -81,6 +81,9 @@ class Vision(ModelComponent):
 
         self._images: List[Union[np.ndarray, ROSImage, ROSCompressedImage]] = []
 
+        # batch of (image, image message) for event based batching
+        self._batch: Optional[TimedBatch] = None
+
         super().__init__(
             inputs,
             outputs,
@@ -103,6 +106,11 @@ class Vision(ModelComponent):
         # configure parent component
         super().custom_on_configure()
 
+        # create batch for images received on triggers
+        self._batch = TimedBatch(
+            self.config.batch_size, self.config.batch_timeout, self._send_batch
+        )
+
         # create visualization thread if enabled
         if self.config.enable_visualization:
             self.queue = queue.Queue()
@@ -110,6 +118,9 @@ class Vision(ModelComponent):
             self.visualization_thread = threading.Thread(target=self._visualize).start()
 
     def custom_on_deactivate(self):
+        # discard any images waiting to be batched
+        if self._batch:
+            self._batch.take()
         # if visualization is enabled, shutdown the thread
         if self.config.enable_visualization:
             if self.visualization_thread:
@@ -208,6 +219,10 @@ class Vision(ModelComponent):
             if not trigger:
                 return
             self.get_logger().debug(f"Received trigger on topic {trigger.name}")
+            # gather images from triggers in a batch, if enabled
+            if self.config.batch_size > 1:
+                self._add_to_batch(trigger, kwargs.get("msg"))
+                return
         else:
             time_stamp = self.get_ros_time().sec
             self.get_logger().debug(f"Sending at {time_stamp}")
@@ -221,22 +236,81 @@ class Vision(ModelComponent):
 
         # conduct inference
         if self.model_client:
-            result = self.model_client.inference(inference_input)
+            self._call_inference(
+                inference_input,
+                images=self._images,
+                input_images=inference_input["images"],
+            )
+
+    def _add_to_batch(
+        self,
+        trigger: Topic,
+        msg: Optional[Union[ROSImage, ROSCompressedImage]],
+    ) -> None:
+        """Add image received on a trigger topic to the current batch and send the batch
+        for inference if it is full. Otherwise start a timer for sending the batch after batch_timeout.
+        :param trigger:
+        :type trigger: Topic
+        :param msg:
+        :type msg: ROSImage | ROSCompressedImage | None
+        """
+        image = self.trig_callbacks[trigger.name].get_output()
+        if image is None:
+            return
+        trigger_index = list(self.trig_callbacks).index(trigger.name)
+        if batch := self._batch.add(trigger_index, (image, msg)):
+            self._send_batch(batch)
+
+    def _send_batch(
+        self,
+        batch: List[Tuple[np.ndarray, Optional[Union[ROSImage, ROSCompressedImage]]]],
+    ) -> None:
+        """Send a batch of images as one inference request
+        :param batch:
+        :type batch: list[tuple[np.ndarray, ROSImage | ROSCompressedImage | None]]
+        """
+        images = [image for image, _ in batch]
+        image_msgs = [msg for _, msg in batch if msg is not None]
+        self.get_logger().debug(f"Sending batch of {len(images)} images")
+        inference_input = {"images": images, **self.config._get_inference_params()}
+        if self.model_client:
+            self._call_inference(
+                inference_input, images=image_msgs, input_images=images
+            )
+
+    def _handle_inference_result(
+        self,
+        result: Optional[Dict],
+        images: List[Union[ROSImage, ROSCompressedImage]],
+        input_images: List[np.ndarray],
+        **_,
+    ) -> None:
+        """Handle model inference result and publish it
+        :param result:
+        :type result: dict | None
+        :param images: Image messages used for inference
+        :type images: list[ROSImage | ROSCompressedImage]
+        :param input_images: Images used for inference
+        :type input_images: list[np.ndarray]
+        """
+        if result:
+            # publish inference result
+            if hasattr(self, "publishers_dict"):
+                for publisher in self.publishers_dict.values():
+                    publisher.publish(
+                        **result,
+                        images=images,
+                        output_image=self.config.output_image,
+                        thumbnail_size=self.config.thumbnail_size,
+                        input_images=input_images,
+                        time_stamp=self.get_ros_time(),
+                    )
+            if self.config.enable_visualization:
+                result["images"] = input_images
+                self.queue.put_nowait(result)
+        else:
             # raise a fallback trigger via health status
-            if result:
-                # publish inference result
-                if hasattr(self, "publishers_dict"):
-                    for publisher in self.publishers_dict.values():
-                        publisher.publish(
-                            **result,
-                            images=self._images,
-                            time_stamp=self.get_ros_time(),
-                        )
-                if self.config.enable_visualization:
-                    result["images"] = inference_input["images"]
-                    self.queue.put_nowait(result)
-            else:
-                self.health_status.set_failure()
+            self.health_status.set_failure()
 
     def _warmup(self):
         """Warm up and stat check"""
@@ -20,7 +20,37 @@ __all__ = [
 
 @define(kw_only=True)
 class ModelComponentConfig(BaseComponentConfig):
+    """
+    Base configuration for components that use ML models.
+
+    :param warmup: Run model inference on a test input, when the component is configured, and log inference time. Defaults to False.
+    :type warmup: bool
+    :param async_inference: Dispatch model inference to worker threads instead of running it in the component's execution step, so that the component keeps receiving inputs while the model is busy. Results are published when inference completes. Cannot be used with chat history or tool calling in LLM components. Defaults to False.
+    :type async_inference: bool
+    :param max_inflight_inferences: Maximum number of inference calls running at the same time when async_inference is enabled. Defaults to 1.
+    :type max_inflight_inferences: int
+    :param max_pending_inferences: Maximum number of inference inputs waiting for a free worker when async_inference is enabled. When a worker is free, all waiting inputs are sent to the model in one batched call, which clients supporting request pipelining (e.g. RESP clients) keep in flight at once. Defaults to 1.
+    :type max_pending_inferences: int
+    :param drop_policy: Which input to drop when the pending inputs are at maximum capacity. Can be "drop_oldest" (replace the oldest pending input with the new one) or "drop_newest" (discard the new input). Defaults to "drop_oldest".
+    :type drop_policy: str
+    :param publish_metrics: Publish metrics of model (and DB) client calls, i.e. latency percentiles and histogram, serialization, network and server time, payload sizes and error and timeout counts, as diagnostics on the /diagnostics topic. Defaults to False.
+    :type publish_metrics: bool
+    :param metrics_publish_period: Time period in seconds for publishing client metrics. Defaults to 5.0
+    :type metrics_publish_period: float
+    """
+
     warmup: Optional[bool] = field(default=False)
+    async_inference: bool = field(default=False)
+    max_inflight_inferences: int = field(default=1, validator=base_validators.gt(0))
+    max_pending_inferences: int = field(default=1, validator=base_validators.gt(0))
+    drop_policy: str = field(
+        default="drop_oldest",
+        validator=base_validators.in_(["drop_oldest", "drop_newest"]),
+    )
+    publish_metrics: bool = field(default=False)
+    metrics_publish_period: float = field(
+        default=5.0, validator=base_validators.gt(0.0)
+    )
 
 
 @define(kw_only=True)
@@ -41,17 +71,47 @@ class LLMConfig(ModelComponentConfig):
     :param n_results: The maximum number of results to return for RAG. Defaults to 1.
         For numbers greater than 1, results will be concatenated together in a single string.
     :type n_results: int
+    :param enable_rag_cache: Cache documents retreived for RAG, keyed on the query. The cache is cleared when documents are added with the component's add_documents method. Defaults to False.
+    :type enable_rag_cache: bool
+    :param rag_cache_size: Maximum number of queries kept in the RAG cache, after which the least recently used query is evicted. Defaults to 100.
+    :type rag_cache_size: int
+    :param rag_cache_ttl: Time in seconds after which cached documents for a query expire. Defaults to 300.0
+    :type rag_cache_ttl: float
     :param chat_history: Whether to include chat history in the LLM's prompt.
     :type chat_history: bool
     :param history_reset_phrase: Phrase to reset chat history. Defaults to 'chat reset'
     :type history_reset_phrase: str
     :param history_size: Number of user messages to keep in chat history. Defaults to 10
     :type history_size: int
+    :param history_token_budget: If set, chat history is limited by the number of tokens in the prompt instead of history_size. The oldest turns (a user message with its responses) are evicted until the prompt, including the system prompt, fits in this budget. Tokens are approximated from text length unless a tokenizer is set on the component with set_tokenizer. Defaults to None
+    :type history_token_budget: Optional[int]
+    :param summarize_history: When history_token_budget is set, replace evicted turns with a summary of them, generated by the model, instead of dropping them. Defaults to False
+    :type summarize_history: bool
     :param temperature: Temperature used for sampling tokens during generation.
         Default is 0.8 and must be greater than 0.0.
     :type temperature: float
     :param max_new_tokens: The maximum number of new tokens to generate.
         Default is 100 and must be greater than 0.
+    :param stream: Publish the model output in chunks, as it is generated, instead of waiting for the complete response. Currently only supported with OllamaClient. When the output is consumed by a TextToSpeech component, set queue_playback in its config so that chunks are spoken one after another. Defaults to False.
+    :type stream: bool
+    :param break_character: When streaming, generated tokens are accumulated until this character is received and the accumulated chunk is then published (e.g. '.' publishes sentence by sentence). Set to an empty string to publish every token as it arrives. Defaults to '.'
+    :type break_character: str
+    :param response_terminator: When streaming, an optional string published after the last chunk to mark the end of a response (e.g. '<<Response Ended>>'). Leave it unset when the output is consumed by a TextToSpeech component, which would speak it. Defaults to None
+    :type response_terminator: Optional[str]
+    :param enable_cache: Cache model responses and reuse them for identical inputs, i.e. the same rendered prompt, chat history, inference parameters and (for MLLMs) the same image. Responses are not cached when tools are registered with the component. Defaults to False.
+    :type enable_cache: bool
+    :param cache_size: Maximum number of responses kept in the cache, after which the least recently used response is evicted. Defaults to 100.
+    :type cache_size: int
+    :param cache_ttl: Time in seconds after which a cached response expires. Defaults to 60.0
+    :type cache_ttl: float
+    :param cache_similarity_threshold: If set, a response is also reused for semantically similar prompts, whose embedding distance to a cached prompt is less than this threshold. The similarity lookup uses the component's db_client, which must be provided. Defaults to None, i.e. only identical prompts are matched.
+    :type cache_similarity_threshold: Optional[float]
+    :param cache_collection_name: The name of the vectordb collection used for similarity lookup of cached responses. Defaults to 'response_cache'
+    :type cache_collection_name: str
+    :param cache_similarity_candidates: Number of most similar cached prompts fetched from the vectordb in a similarity lookup. The closest one generated with the same chat history, inference parameters and images is reused. Defaults to 5
+    :type cache_similarity_candidates: int
+    :param cache_fuzzy_images: For MLLMs, match cached images with a perceptual (8x8 average) hash instead of their exact content, so that responses are reused for mostly unchanged scenes. Different images can share a perceptual hash, in which case a response generated for a different image is returned. Defaults to False.
+    :type cache_fuzzy_images: bool
 
     Example of usage:
     ```python
@@ -66,13 +126,28 @@ class LLMConfig(ModelComponentConfig):
     )
     n_results: int = field(default=1)
     add_metadata: bool = field(default=False)
+    enable_rag_cache: bool = field(default=False)
+    rag_cache_size: int = field(default=100, validator=base_validators.gt(0))
+    rag_cache_ttl: float = field(default=300.0, validator=base_validators.gt(0.0))
     chat_history: bool = field(default=False)
     history_reset_phrase: str = field(default="chat reset")
     history_size: int = field(
         default=10, validator=base_validators.gt(4)
     )  # number of user messages
+    history_token_budget: Optional[int] = field(default=None)
+    summarize_history: bool = field(default=False)
     temperature: float = field(default=0.8, validator=base_validators.gt(0.0))
     max_new_tokens: int = field(default=100, validator=base_validators.gt(0))
+    stream: bool = field(default=False)
+    break_character: str = field(default=".")
+    response_terminator: Optional[str] = field(default=None)
+    enable_cache: bool = field(default=False)
+    cache_size: int = field(default=100, validator=base_validators.gt(0))
+    cache_ttl: float = field(default=60.0, validator=base_validators.gt(0.0))
+    cache_similarity_threshold: Optional[float] = field(default=None)
+    cache_collection_name: str = field(default="response_cache")
+    cache_similarity_candidates: int = field(default=5, validator=base_validators.gt(0))
+    cache_fuzzy_images: bool = field(default=False)
     _system_prompt: Optional[str] = field(default=None, alias="_system_prompt")
     _component_prompt: Optional[Union[str, Path]] = field(
         default=None, alias="_component_prompt"
@@ -87,6 +162,11 @@ class LLMConfig(ModelComponentConfig):
         default=Factory(dict), alias="_tool_response_flags"
     )
 
+    @history_token_budget.validator
+    def check_history_token_budget(self, _, value):
+        if value is not None and value <= 0:
+            raise ValueError("history_token_budget must be greater than 0")
+
     def _get_inference_params(self) -> Dict:
         """get_inference_params.
         :rtype: dict
@@ -144,6 +224,14 @@ class VisionConfig(ModelComponentConfig):
     :type get_data_labels: bool
     :param labels_to_track: A list of specific labels to track, when the model is used as a tracker (default: None).
     :type labels_to_track: Optional[list]
+    :param batch_size: Maximum number of images, received on trigger topics, that are gathered and sent to the model as one batched inference request. Images in a batch are ordered by their trigger topic. Only effective when the component has trigger topics (default: 1, i.e. no batching).
+    :type batch_size: int
+    :param batch_timeout: Maximum time in seconds to wait for a batch to fill up, after its first image is received, before sending it to the model. Only effective when batch_size is greater than 1 (default: 0.1).
+    :type batch_timeout: float
+    :param output_image: Image attached to each published detection or tracking message. 'full' attaches the source image, 'thumbnail' a downscaled copy of it and 'none' publishes detections by reference only, i.e. with the header stamp and frame id of the source image, so that consumers can join them with the image topic by timestamp (default: 'full').
+    :type output_image: str
+    :param thumbnail_size: Size in pixels of the longer side of thumbnails. Only effective when output_image is 'thumbnail' (default: 160).
+    :type thumbnail_size: int
 
     Example of usage:
     ```python
@@ -157,6 +245,12 @@ class VisionConfig(ModelComponentConfig):
     get_data_labels: bool = field(default=True)
     labels_to_track: Optional[List[str]] = field(default=None)
     enable_visualization: Optional[bool] = field(default=False)
+    batch_size: int = field(default=1, validator=base_validators.gt(0))
+    batch_timeout: float = field(default=0.1, validator=base_validators.gt(0.0))
+    output_image: str = field(
+        default="full", validator=base_validators.in_(["full", "thumbnail", "none"])
+    )
+    thumbnail_size: int = field(default=160, validator=base_validators.gt(0))
 
     def _get_inference_params(self) -> Dict:
         """get_inference_params.
@@ -185,6 +279,8 @@ class TextToSpeechConfig(ModelComponentConfig):
     :type block_size: int
     :param get_bytes: Whether the model should return the speech data as bytes instead of base64 encoded string(default: False).
     :type get_bytes: bool
+    :param queue_playback: Play audio of consecutive inputs one after another, instead of stopping the current playback when a new input is received. Use it when the input text arrives in chunks, e.g. a streamed LLM response published sentence by sentence. Only effective if play_on_device is True (default: False).
+    :type queue_playback: bool
 
     Example of usage:
     ```python
@@ -197,6 +293,7 @@ class TextToSpeechConfig(ModelComponentConfig):
     buffer_size: int = field(default=20)
     block_size: int = field(default=1024)
     get_bytes: bool = field(default=False)
+    queue_playback: bool = field(default=False)
 
     def _get_inference_params(self) -> Dict:
         """get_inference_params.
@@ -230,6 +327,18 @@ class SpeechToTextConfig(ModelComponentConfig):
     :type speech_pad_ms: int
     :param speech_buffer_max_len: Maximum length of the speech buffer in milliseconds. Defaults to 8000ms. Only effective if `enable_vad` is set to true.
     :type speech_buffer_max_len: int
+    :param audio_buffer_max_len: Maximum length in milliseconds of captured audio that can wait for VAD and wakeword processing, which runs on a separate thread from audio capture. Audio captured while this buffer is full is dropped. Defaults to 2000ms. Only effective if `enable_vad` is set to true.
+    :type audio_buffer_max_len: int
+    :param audio_batch_size: Maximum number of captured audio blocks (of 80ms each) processed together, when processing falls behind capture. Audio embeddings for wakeword detection are calculated for a batch with one model call. Defaults to 4. Only effective if `enable_vad` is set to true.
+    :type audio_batch_size: int
+    :param stream_transcripts: Transcribe speech in overlapping chunks while it is ongoing, so that only the last chunk is transcribed when speech ends. The complete transcript is published when speech ends, which reduces the latency after an utterance to the inference time of its last chunk. Cannot be used with `async_inference`. Only effective if `enable_vad` is set to true. Defaults to False.
+    :type stream_transcripts: bool
+    :param partial_transcripts_topic: Name of an output topic on which partial transcripts, i.e. the text transcribed so far while speech is ongoing, are published when `stream_transcripts` is True. This topic does not receive complete transcripts, which are published on all other output topics. Defaults to None, i.e. partial transcripts are not published.
+    :type partial_transcripts_topic: Optional[str]
+    :param stream_chunk_ms: Length of new speech in milliseconds after which a chunk is sent for transcription, when `stream_transcripts` is True. Should be less than `speech_buffer_max_len`. Defaults to 2000ms.
+    :type stream_chunk_ms: int
+    :param stream_overlap_ms: Length in milliseconds of audio from the end of the previous chunk that is included at the start of the next one, to avoid cutting words at chunk boundaries, when `stream_transcripts` is True. Words repeated due to the overlap are removed from the transcript. Defaults to 500ms.
+    :type stream_overlap_ms: int
     :param device_vad: Device type for VAD processing ('cpu' or 'gpu'). Only effective if `enable_vad` is set to true. Defaults to 'cpu'.
     :type device_vad: str
     :param device_wakeword: Device type for Wakeword detection ('cpu' or 'gpu'). Only effective if `enable_wakeword` is set to true. Defaults to 'cpu'.
@@ -273,6 +382,12 @@ class SpeechToTextConfig(ModelComponentConfig):
     min_silence_duration_ms: int = field(default=1000)
     speech_pad_ms: int = field(default=30)
     speech_buffer_max_len: int = field(default=8000)
+    audio_buffer_max_len: int = field(default=2000, validator=base_validators.gt(0))
+    audio_batch_size: int = field(default=4, validator=base_validators.gt(0))
+    stream_transcripts: bool = field(default=False)
+    stream_chunk_ms: int = field(default=2000, validator=base_validators.gt(0))
+    stream_overlap_ms: int = field(default=500)
+    partial_transcripts_topic: Optional[str] = field(default=None)
     device_vad: str = field(
         default="cpu", validator=base_validators.in_(["cpu", "gpu"])
     )
@@ -303,6 +418,13 @@ class SpeechToTextConfig(ModelComponentConfig):
                 "enable_vad (voice activity detection) must be set to True when enable_wakeword is True"
             )
 
+    @stream_overlap_ms.validator
+    def check_stream_overlap(self, _, value):
+        if value < 0 or value >= self.stream_chunk_ms:
+            raise ValueError(
+                "stream_overlap_ms must be non-negative and less than stream_chunk_ms"
+            )
+
     def _get_inference_params(self) -> Dict:
         """get_inference_params.
         :rtype: dict
@@ -397,6 +519,18 @@ class VideoMessageMakerConfig(BaseComponentConfig):
     :param threshold: The threshold value for motion detection. A float between 0.1 and 5.0. Default is 0.3.
     :type threshold: float
     :param flow_kwargs: Additional keyword arguments for the optical flow algorithm. Default is a dictionary with reasonable values.
+    :param analysis_pyramid_levels: Number of pyramid levels by which frames are downscaled before motion estimation, each level halving the resolution. E.g. 2 analyzes 1080p input at 480x270. Default is 0, i.e. full resolution.
+    :type analysis_pyramid_levels: int
+    :param roi: Optional region of interest given as [x, y, width, height] in pixels of the input image. Motion is only estimated within this region. Default is None, i.e. the whole image.
+    :type roi: Optional[list[int]]
+    :param motion_check_stride: Motion is estimated on every Nth frame, against the last checked frame. Frames in between are captured based on the last motion estimate, without being decoded. Default is 1, i.e. every frame is checked.
+    :type motion_check_stride: int
+    :param compress_frames: Compress raw image frames to JPEG as they are captured, so that videos are kept and published as compressed frames. Already compressed input frames are kept as is. Default is False.
+    :type compress_frames: bool
+    :param jpeg_quality: JPEG quality (1-100) used when compress_frames is True. Default is 80.
+    :type jpeg_quality: int
+    :param max_video_bytes: Optional limit on the memory, in bytes, taken by frames of one video segment. A video is published when adding the next frame would exceed this limit, and that frame starts the next video. If the limit is reached before min_video_frames are captured, the captured frames are dropped. Default is None, i.e. only max_video_frames applies.
+    :type max_video_bytes: Optional[int]
 
     Example of usage:
     ```python
@@ -427,3 +561,27 @@ class VideoMessageMakerConfig(BaseComponentConfig):
         },
         validator=validate_kwargs,
     )
+    analysis_pyramid_levels: int = field(
+        default=0, validator=base_validators.in_range(min_value=0, max_value=5)
+    )
+    roi: Optional[List[int]] = field(default=None)
+    motion_check_stride: int = field(default=1, validator=base_validators.gt(0))
+    compress_frames: bool = field(default=False)
+    jpeg_quality: int = field(
+        default=80, validator=base_validators.in_range(min_value=1, max_value=100)
+    )
+    max_video_bytes: Optional[int] = field(default=None)
+
+    @roi.validator
+    def check_roi(self, _, value):
+        if value is not None and (
+            len(value) != 4 or min(value) < 0 or value[2] == 0 or value[3] == 0
+        ):
+            raise ValueError(
+                "roi must be given as [x, y, width, height] with non-negative coordinates and non-zero width and height"
+            )
+
+    @max_video_bytes.validator
+    def check_max_video_bytes(self, _, value):
+        if value is not None and value <= 0:
+            raise ValueError("max_video_bytes must be greater than 0")
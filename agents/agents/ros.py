@@ -1,6 +1,8 @@
 """The following classes provide wrappers for data being transmitted via ROS topics. These classes form the inputs and outputs of [Components](agents.components.md)."""
 
-from typing import Union, Any, Dict, List, Tuple
+import array
+from typing import Optional, Union, Any, Dict, List, Tuple
+import cv2
 import numpy as np
 from attrs import define, field, Factory
 
@@ -18,6 +20,7 @@ from ros_sugar.supported_types import (
     ROSCompressedImage,
 )
 from ros_sugar.io import Topic as BaseTopic
+from ros_sugar.io.utils import image_pre_processing, read_compressed_image
 
 from ros_sugar.config import (
     BaseComponentConfig,
@@ -31,10 +34,13 @@ from ros_sugar.utils import component_action
 
 # LEIBNIZ TYPES
 from automatika_embodied_agents.msg import Point2D, Bbox2D, Detection2D, Detections2D
+from automatika_embodied_agents.msg import FlatDetection2D, FlatDetections2D
 from automatika_embodied_agents.msg import (
     Video as ROSVideo,
     Tracking as ROSTracking,
     Trackings as ROSTrackings,
+    FlatTracking as ROSFlatTracking,
+    FlatTrackings as ROSFlatTrackings,
 )
 from .callbacks import ObjectDetectionCallback, VideoCallback
 
@@ -88,6 +94,99 @@ class Video(SupportedType):
         return msg
 
 
+def _to_array(values: Any, width: int) -> np.ndarray:
+    """Get values from model output (lists or arrays) as a float64 array with
+    the given number of columns"""
+    if values is None or len(values) == 0:
+        return np.empty((0, width), dtype=np.float64)
+    return np.asarray(values, dtype=np.float64).reshape(-1, width)
+
+
+def _to_float_sequence(values: Any) -> array.array:
+    """Get values as an array.array, which can be assigned to float64[] message
+    fields in bulk, i.e. without validation of each element"""
+    sequence = array.array("d")
+    if values is not None and len(values) > 0:
+        sequence.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return sequence
+
+
+def _to_bboxes(boxes: np.ndarray) -> List[Bbox2D]:
+    """Create Bbox2D messages from an array of boxes"""
+    return [
+        Bbox2D(top_left_x=x1, top_left_y=y1, bottom_right_x=x2, bottom_right_y=y2)
+        for x1, y1, x2, y2 in boxes.tolist()
+    ]
+
+
+def _to_points(points: np.ndarray) -> List[Point2D]:
+    """Create Point2D messages from an array of points"""
+    return [Point2D(x=x, y=y) for x, y in points.tolist()]
+
+
+def _get_tracking_arrays(output: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get boxes, centroids and estimated velocities from tracking output as arrays
+    :return: boxes (n, 4), centroids (n, 2) and velocities (m, 2)
+    """
+    # Each 3 points represent one object (top-left, bottom-right, center)
+    points = _to_array(output.get("tracked_points"), 6)
+    o_estimated_velocities = output.get("estimated_velocities")
+    if o_estimated_velocities is not None and len(o_estimated_velocities) > 0:
+        velocities = np.concatenate([
+            _to_array(obj_vels, 2) for obj_vels in o_estimated_velocities
+        ])
+    else:
+        velocities = np.empty((0, 2), dtype=np.float64)
+    return points[:, :4], points[:, 4:], velocities
+
+
+def _thumbnail(img: np.ndarray, size: int) -> np.ndarray:
+    """Downscale an image so that its longer side is at most size pixels"""
+    height, width = img.shape[:2]
+    scale = size / max(height, width)
+    if scale >= 1.0:
+        return img
+    return cv2.resize(
+        img,
+        (max(1, int(width * scale)), max(1, int(height * scale))),
+        interpolation=cv2.INTER_AREA,
+    )
+
+
+def _set_image(
+    msg: Any,
+    img: Union[ROSImage, ROSCompressedImage, np.ndarray],
+    output_image: str = "full",
+    thumbnail_size: int = 160,
+    input_image: Optional[np.ndarray] = None,
+):
+    """Set header and image of a detection or tracking message. The header is taken from the source image message, so that consumers can join detections with images by timestamp.
+    :param output_image: Image attached to the message, 'full', 'thumbnail' or 'none'
+    :param thumbnail_size: Size of the longer side of the thumbnail
+    :param input_image: Decoded source image, used for creating the thumbnail
+    """
+    if (header := getattr(img, "header", None)) is not None:
+        msg.header.stamp = header.stamp
+        msg.header.frame_id = header.frame_id
+    if output_image == "none":
+        return
+    if output_image == "thumbnail":
+        if input_image is None:
+            if isinstance(img, ROSCompressedImage):
+                input_image = read_compressed_image(img)
+            elif isinstance(img, ROSImage):
+                input_image = image_pre_processing(img)
+            else:
+                input_image = img
+        msg.image = Image.convert(_thumbnail(input_image, thumbnail_size))
+        msg.image.header = msg.header
+        return
+    if isinstance(img, ROSCompressedImage):
+        msg.compressed_image = CompressedImage.convert(img)
+    else:
+        msg.image = Image.convert(img)
+
+
 class Detection(SupportedType):
     """Detection."""
 
@@ -96,7 +195,13 @@ class Detection(SupportedType):
 
     @classmethod
     def convert(
-        cls, output: Dict, img: Union[ROSImage, ROSCompressedImage, np.ndarray], **_
+        cls,
+        output: Dict,
+        img: Union[ROSImage, ROSCompressedImage, np.ndarray],
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_image: Optional[np.ndarray] = None,
+        **_,
     ) -> Detection2D:
         """
         Takes object detection data and converts it into a ROS message
@@ -104,22 +209,10 @@ class Detection(SupportedType):
         :return: Detection2D
         """
         msg = Detection2D()
-        msg.scores = output["scores"]
-        msg.labels = output["labels"]
-        boxes = []
-        for bbox in output["bboxes"]:
-            box = Bbox2D()
-            box.top_left_x = bbox[0]
-            box.top_left_y = bbox[1]
-            box.bottom_right_x = bbox[2]
-            box.bottom_right_y = bbox[3]
-            boxes.append(box)
-
-        msg.boxes = boxes
-        if isinstance(img, ROSCompressedImage):
-            msg.compressed_image = CompressedImage.convert(img)
-        else:
-            msg.image = Image.convert(img)
+        msg.scores = _to_float_sequence(output["scores"])
+        msg.labels = list(output["labels"])
+        msg.boxes = _to_bboxes(_to_array(output["bboxes"], 4))
+        _set_image(msg, img, output_image, thumbnail_size, input_image)
         return msg
 
 
@@ -130,7 +223,15 @@ class Detections(SupportedType):
     callback = ObjectDetectionCallback
 
     @classmethod
-    def convert(cls, output: List, images: List, **_) -> Detections2D:
+    def convert(
+        cls,
+        output: List,
+        images: List,
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_images: Optional[List[np.ndarray]] = None,
+        **_,
+    ) -> Detections2D:
         """
         Takes object detections data and converts it into a ROS message
         of type Detections2D
@@ -138,8 +239,77 @@ class Detections(SupportedType):
         """
         msg = Detections2D()
         detections = []
-        for img, detection in zip(images, output):
-            detections.append(Detection.convert(detection, img))
+        input_images = input_images or [None] * len(output)
+        for img, detection, input_image in zip(images, output, input_images):
+            detections.append(
+                Detection.convert(
+                    detection, img, output_image, thumbnail_size, input_image
+                )
+            )
+        msg.detections = detections
+        return msg
+
+
+class FlatDetection(SupportedType):
+    """Detection with boxes in a flat array."""
+
+    _ros_type = FlatDetection2D
+    callback = None  # not defined
+
+    @classmethod
+    def convert(
+        cls,
+        output: Dict,
+        img: Union[ROSImage, ROSCompressedImage, np.ndarray],
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_image: Optional[np.ndarray] = None,
+        **_,
+    ) -> FlatDetection2D:
+        """
+        Takes object detection data and converts it into a ROS message
+        of type FlatDetection2D, where boxes are a flat array of
+        [top_left_x, top_left_y, bottom_right_x, bottom_right_y] for each detection
+        :return: FlatDetection2D
+        """
+        msg = FlatDetection2D()
+        msg.scores = _to_float_sequence(output["scores"])
+        msg.labels = list(output["labels"])
+        msg.boxes = _to_float_sequence(_to_array(output["bboxes"], 4))
+        _set_image(msg, img, output_image, thumbnail_size, input_image)
+        return msg
+
+
+class FlatDetections(Detections):
+    """Detections with boxes in flat arrays. Avoids creating a message object for each box, for large detection sets."""
+
+    _ros_type = FlatDetections2D
+    callback = ObjectDetectionCallback
+
+    @classmethod
+    def convert(
+        cls,
+        output: List,
+        images: List,
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_images: Optional[List[np.ndarray]] = None,
+        **_,
+    ) -> FlatDetections2D:
+        """
+        Takes object detections data and converts it into a ROS message
+        of type FlatDetections2D
+        :return: FlatDetections2D
+        """
+        msg = FlatDetections2D()
+        detections = []
+        input_images = input_images or [None] * len(output)
+        for img, detection, input_image in zip(images, output, input_images):
+            detections.append(
+                FlatDetection.convert(
+                    detection, img, output_image, thumbnail_size, input_image
+                )
+            )
         msg.detections = detections
         return msg
 
@@ -152,7 +322,13 @@ class Tracking(SupportedType):
 
     @classmethod
     def convert(
-        cls, output: Dict, img: Union[ROSImage, ROSCompressedImage, np.ndarray], **_
+        cls,
+        output: Dict,
+        img: Union[ROSImage, ROSCompressedImage, np.ndarray],
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_image: Optional[np.ndarray] = None,
+        **_,
     ) -> ROSTracking:
         """
         Takes tracking data and converts it into a ROS message
@@ -160,41 +336,14 @@ class Tracking(SupportedType):
         :return: ROSTracking
         """
         msg = ROSTracking()
-        msg.ids = output.get("ids") or []
-        msg.labels = output.get("tracked_labels") or []
-
-        estimated_velocities = []
-        if o_estimated_velocities := output.get("estimated_velocities"):
-            for obj_vels in o_estimated_velocities:
-                for obj_instance_v in obj_vels:
-                    estimated_velocity = Point2D()
-                    estimated_velocity.x = obj_instance_v[0]
-                    estimated_velocity.y = obj_instance_v[1]
-                    estimated_velocities.append(estimated_velocity)
-
-        tracked_boxes = []
-        centroids = []
-        if o_tracked_points := output.get("tracked_points"):
-            for bbox in o_tracked_points:
-                # Each 3 points represent one object (top-left, bottom-right, center)
-                box = Bbox2D()
-                box.top_left_x = bbox[0][0]
-                box.top_left_y = bbox[0][1]
-                box.bottom_right_x = bbox[1][0]
-                box.bottom_right_y = bbox[1][1]
-                tracked_boxes.append(box)
-                centroid = Point2D()
-                centroid.x = bbox[2][0]
-                centroid.y = bbox[2][1]
-                centroids.append(centroid)
-
-        msg.boxes = tracked_boxes
-        msg.centroids = centroids
-        msg.estimated_velocities = estimated_velocities
-        if isinstance(img, ROSCompressedImage):
-            msg.compressed_image = CompressedImage.convert(img)
-        else:
-            msg.image = Image.convert(img)
+        msg.ids = list(output.get("ids") or [])
+        msg.labels = list(output.get("tracked_labels") or [])
+
+        boxes, centroids, velocities = _get_tracking_arrays(output)
+        msg.boxes = _to_bboxes(boxes)
+        msg.centroids = _to_points(centroids)
+        msg.estimated_velocities = _to_points(velocities)
+        _set_image(msg, img, output_image, thumbnail_size, input_image)
         return msg
 
 
@@ -205,7 +354,15 @@ class Trackings(SupportedType):
     callback = None  # Not defined
 
     @classmethod
-    def convert(cls, output: List, images: List, **_) -> ROSTrackings:
+    def convert(
+        cls,
+        output: List,
+        images: List,
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_images: Optional[List[np.ndarray]] = None,
+        **_,
+    ) -> ROSTrackings:
         """
         Takes trackings data and converts it into a ROS message
         of type ROSTrackings
@@ -213,13 +370,95 @@ class Trackings(SupportedType):
         """
         msg = ROSTrackings()
         trackings = []
-        for img, tracking in zip(images, output):
-            trackings.append(Tracking.convert(tracking, img))
+        input_images = input_images or [None] * len(output)
+        for img, tracking, input_image in zip(images, output, input_images):
+            trackings.append(
+                Tracking.convert(
+                    tracking, img, output_image, thumbnail_size, input_image
+                )
+            )
         msg.trackings = trackings
         return msg
 
 
-agent_types = [Video, Detection, Detections, Tracking, Trackings]
+class FlatTracking(SupportedType):
+    """Tracking with boxes, centroids and velocities in flat arrays."""
+
+    _ros_type = ROSFlatTracking
+    callback = None  # Not defined in ROS Agents
+
+    @classmethod
+    def convert(
+        cls,
+        output: Dict,
+        img: Union[ROSImage, ROSCompressedImage, np.ndarray],
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_image: Optional[np.ndarray] = None,
+        **_,
+    ) -> ROSFlatTracking:
+        """
+        Takes tracking data and converts it into a ROS message
+        of type FlatTracking
+        :return: ROSFlatTracking
+        """
+        msg = ROSFlatTracking()
+        msg.ids = list(output.get("ids") or [])
+        msg.labels = list(output.get("tracked_labels") or [])
+
+        boxes, centroids, velocities = _get_tracking_arrays(output)
+        msg.boxes = _to_float_sequence(boxes)
+        msg.centroids = _to_float_sequence(centroids)
+        msg.estimated_velocities = _to_float_sequence(velocities)
+        _set_image(msg, img, output_image, thumbnail_size, input_image)
+        return msg
+
+
+class FlatTrackings(Trackings):
+    """Trackings with boxes, centroids and velocities in flat arrays. Avoids creating a message object for each box and point, for large numbers of tracked objects."""
+
+    _ros_type = ROSFlatTrackings
+    callback = None  # Not defined
+
+    @classmethod
+    def convert(
+        cls,
+        output: List,
+        images: List,
+        output_image: str = "full",
+        thumbnail_size: int = 160,
+        input_images: Optional[List[np.ndarray]] = None,
+        **_,
+    ) -> ROSFlatTrackings:
+        """
+        Takes trackings data and converts it into a ROS message
+        of type ROSFlatTrackings
+        :return: ROSFlatTrackings
+        """
+        msg = ROSFlatTrackings()
+        trackings = []
+        input_images = input_images or [None] * len(output)
+        for img, tracking, input_image in zip(images, output, input_images):
+            trackings.append(
+                FlatTracking.convert(
+                    tracking, img, output_image, thumbnail_size, input_image
+                )
+            )
+        msg.trackings = trackings
+        return msg
+
+
+agent_types = [
+    Video,
+    Detection,
+    Detections,
+    FlatDetection,
+    FlatDetections,
+    Tracking,
+    Trackings,
+    FlatTracking,
+    FlatTrackings,
+]
 
 
 add_additional_datatypes(agent_types)
@@ -1,5 +1,14 @@
 from .utils import (
     create_detection_context,
+    select_frames,
+    approximate_token_count,
+    evict_history_turns,
+    insert_history_summary,
+    chunk_text,
+    stream_chunks,
+    remove_overlap,
+    InferenceSlots,
+    TimedBatch,
     validate_kwargs,
     validate_func_args,
     PDFReader,
@@ -9,9 +18,20 @@ from .utils import (
     WakeWordStatus,
     load_model,
 )
+from .cache import ResponseCache, get_cache_keys, match_similar_response
+from .metrics import ClientMetrics
 
 __all__ = [
     "create_detection_context",
+    "select_frames",
+    "approximate_token_count",
+    "evict_history_turns",
+    "insert_history_summary",
+    "chunk_text",
+    "stream_chunks",
+    "remove_overlap",
+    "InferenceSlots",
+    "TimedBatch",
     "validate_kwargs",
     "validate_func_args",
     "PDFReader",
@@ -20,4 +40,8 @@ __all__ = [
     "VADStatus",
     "WakeWordStatus",
     "load_model",
+    "ResponseCache",
+    "get_cache_keys",
+    "match_similar_response",
+    "ClientMetrics",
 ]
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def image_fingerprint(img: np.ndarray, size: int = 8) -> str:
+    """
+    Creates a perceptual (average) hash of an image, which stays the same for
+    mostly unchanged scenes
+    :param      img:  Image array
+    :type       img:  np.ndarray
+    :param      size: Side of the downsampled image used for hashing
+    :type       size: int
+    :returns:   Hex string of the hash
+    :rtype:     str
+    """
+    small = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = small.mean(axis=2)
+    bits = small > small.mean()
+    return np.packbits(bits).tobytes().hex()
+
+
+def image_content_hash(img: np.ndarray) -> str:
+    """
+    Creates a hash of the image content, which changes with any change in the image
+    :param      img:  Image array
+    :type       img:  np.ndarray
+    :returns:   Hex string of the hash
+    :rtype:     str
+    """
+    digest = hashlib.sha1(f"{img.shape}{img.dtype}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(img).data)
+    return digest.hexdigest()
+
+
+def get_cache_keys(
+    inference_input: Dict[str, Any], fuzzy_images: bool = False
+) -> Tuple[str, str, str]:
+    """
+    Creates cache keys for an LLM/MLLM inference input. The context key covers the
+    chat history, inference parameters and images, while the response key
+    additionally covers the rendered prompt (last message).
+    :param      inference_input:  Model inference input
+    :type       inference_input:  dict[str, Any]
+    :param      fuzzy_images:  Key images on their perceptual hash instead of their content. Different images can share a perceptual hash.
+    :type       fuzzy_images:  bool
+    :returns:   Response key, context key and the rendered prompt
+    :rtype:     tuple[str, str, str]
+    """
+    messages: List[Dict] = inference_input["query"]
+    prompt = str(messages[-1]["content"])
+    context = {
+        key: value
+        for key, value in inference_input.items()
+        if key not in ["query", "images", "stream"]
+    }
+    context["history"] = messages[:-1]
+    if images := inference_input.get("images"):
+        image_key = image_fingerprint if fuzzy_images else image_content_hash
+        context["images"] = [image_key(img) for img in images]
+    context_key = hashlib.sha1(
+        json.dumps(context, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    key = hashlib.sha1(f"{context_key}{prompt}".encode("utf-8")).hexdigest()
+    return key, context_key, prompt
+
+
+def match_similar_response(
+    result: Optional[Dict], context_key: str, threshold: float, ttl: float
+) -> Optional[str]:
+    """
+    Finds the closest cached response, in the result of a vector DB query, that was
+    generated in the same context, is within the distance threshold and has not expired
+    :param      result:  Result of a vector DB query for similar prompts
+    :type       result:  dict | None
+    :param      context_key:  Context key of the inference input
+    :type       context_key:  str
+    :param      threshold:  Maximum embedding distance of a similar prompt
+    :type       threshold:  float
+    :param      ttl:  Time in seconds after which a cached response expires
+    :type       ttl:  float
+    :returns:   Cached response, if found
+    :rtype:     str | None
+    """
+    try:
+        distances = result["output"]["distances"][0]
+        metadatas = result["output"]["metadatas"][0]
+    except (TypeError, KeyError, IndexError):
+        return None
+    now = time.time()
+    # results are ordered by distance
+    for distance, metadata in zip(distances, metadatas):
+        if distance >= threshold:
+            break
+        if (
+            metadata
+            and metadata.get("context_key") == context_key
+            and now - metadata.get("timestamp", 0) <= ttl
+        ):
+            return metadata.get("output")
+    return None
+
+
+class ResponseCache:
+    """Thread safe cache of model responses or retreived documents with LRU eviction and expiry of entries
+
+    :param size: Maximum number of entries kept in the cache
+    :type size: int
+    :param ttl: Time in seconds after which an entry expires
+    :type ttl: float
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get an entry from the cache if it exists and has not expired
+        :param key:
+        :type key: str
+        :rtype: Any | None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            timestamp, value = entry
+            if time.time() - timestamp > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Add an entry to the cache, evicting the least recently used entry if full
+        :param key:
+        :type key: str
+        :param value:
+        :type value: Any
+        """
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,159 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+# upper bounds of latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS: List[float] = [
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+    float("inf"),
+]
+
+# stage timings and sizes that clients can add to a measured call
+_STAGES = ["serialization_time", "network_time", "server_time"]
+_SIZES = ["payload_size", "response_size"]
+
+
+class _CallMetrics:
+    """Aggregated metrics of one type of client call"""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.totals: Dict[str, float] = {key: 0.0 for key in _STAGES + _SIZES}
+        self.measured: Dict[str, int] = {key: 0 for key in _STAGES + _SIZES}
+
+    def add(self, latency: float, stats: Dict) -> None:
+        self.count += 1
+        self.errors += int(bool(stats.get("error")))
+        self.timeouts += int(bool(stats.get("timeout")))
+        latency_ms = latency * 1000
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.latencies.append(latency_ms)
+        for key in _STAGES + _SIZES:
+            if key in stats:
+                self.totals[key] += stats[key]
+                self.measured[key] += 1
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def _percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(int(p * len(latencies)), len(latencies) - 1)]
+
+        snapshot = {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency_ms": {
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+                "p50": _percentile(0.5),
+                "p90": _percentile(0.9),
+                "p99": _percentile(0.99),
+                "histogram": {
+                    str(bound): count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+            },
+        }
+        # mean stage times in milliseconds and mean sizes in bytes
+        for key in _STAGES:
+            snapshot[f"mean_{key}_ms"] = (
+                self.totals[key] * 1000 / self.measured[key]
+                if self.measured[key]
+                else None
+            )
+        for key in _SIZES:
+            snapshot[f"mean_{key}_bytes"] = (
+                self.totals[key] / self.measured[key] if self.measured[key] else None
+            )
+        return snapshot
+
+
+class ClientMetrics:
+    """Thread safe metrics of calls made by model and DB clients. Records latency histograms and percentiles, time spent in serialization, network and on the server, payload sizes and error and timeout counts for each type of call.
+
+    :param window: Number of latest calls used for computing latency percentiles
+    :type window: int
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._calls: Dict[str, _CallMetrics] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def measure(self, call: str) -> Iterator[Dict]:
+        """Measure latency of a call. Stats of the call can be added to the yielded dict
+        or with the add method from within the call.
+        :param call: Name of the call, e.g. inference
+        :type call: str
+        """
+        stats: Dict = {}
+        self._local.stats = stats
+        start = time.perf_counter()
+        try:
+            yield stats
+        except Exception:
+            stats["error"] = True
+            raise
+        finally:
+            self._local.stats = None
+            self.record(call, time.perf_counter() - start, stats)
+
+    def record(self, call: str, latency: float, stats: Dict) -> None:
+        """Record a call measured by the caller, e.g. a streamed response that is consumed after the call returns.
+        :param call: Name of the call, e.g. inference_stream
+        :type call: str
+        :param latency: Latency of the call in seconds
+        :type latency: float
+        :param stats: Stats of the call, i.e. stage times, sizes and error and timeout flags
+        :type stats: dict
+        """
+        with self._lock:
+            if call not in self._calls:
+                self._calls[call] = _CallMetrics(self.window)
+            self._calls[call].add(latency, stats)
+
+    def add(self, **stats) -> None:
+        """Add stats to the call being measured in the current thread. Times (in seconds)
+        and sizes (in bytes) are accumulated, flags (error, timeout) are set.
+        """
+        current = getattr(self._local, "stats", None)
+        if current is None:
+            return
+        for key, value in stats.items():
+            if isinstance(value, bool):
+                current[key] = current.get(key, False) or value
+            else:
+                current[key] = current.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Get current metrics for each type of call
+        :rtype: dict[str, dict]
+        """
+        with self._lock:
+            return {call: metrics.snapshot() for call, metrics in self._calls.items()}
+
+    def reset(self) -> None:
+        """Remove all recorded metrics"""
+        with self._lock:
+            self._calls.clear()
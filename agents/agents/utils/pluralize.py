@@ -3,6 +3,7 @@ Copyright (c) 2011-2013 University of Antwerp, Belgium
 All rights reserved."""
 
 import re
+from functools import lru_cache
 
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
@@ -461,6 +462,32 @@ plural_rules = [
     [(re.compile(r[0]), r[1], r[2], r[3]) for r in grp] for grp in plural_rules
 ]
 
+# Word categories as sets for fast lookups
+_category_sets = {
+    category: frozenset(words) for category, words in plural_categories.items()
+}
+
+
+def _rule_table(groups, classical):
+    """Flatten rule groups into (suffix, inflection, category words) tuples,
+    keeping only rules that apply in the given mode"""
+    return tuple(
+        (suffix, inflection, _category_sets[category] if category else None)
+        for i in groups
+        for suffix, inflection, category, classic in plural_rules[i]
+        if not classic or classical
+    )
+
+
+# Precompiled rule tables, keyed by (adjective, classical)
+_rule_tables = {
+    (adjective, classical): _rule_table(
+        [0, 1] if adjective else range(len(plural_rules)), classical
+    )
+    for adjective in (False, True)
+    for classical in (False, True)
+}
+
 
 plural_prepositions = {
     "about",
@@ -507,24 +534,13 @@ plural_prepositions = {
 
 
 def apply_rules(word, pos, classical):
-    n = range(len(plural_rules))
-    if pos.startswith(ADJECTIVE):
-        n = [0, 1]
+    rules = _rule_tables[(pos.startswith(ADJECTIVE), bool(classical))]
     # Apply pluralization rules.
-    for i in n:
-        for suffix, inflection, category, classic in plural_rules[i]:
-            # A general rule, or a classic rule in classical mode.
-            if category is None:
-                if not classic or (classic and classical):
-                    if suffix.search(word) is not None:
-                        return suffix.sub(inflection, word)
-            # A rule pertaining to a specific category of words.
-            if category is not None:
-                if word in plural_categories[category] and (
-                    not classic or (classic and classical)
-                ):
-                    if suffix.search(word) is not None:
-                        return suffix.sub(inflection, word)
+    for suffix, inflection, category in rules:
+        # A general rule, or a rule pertaining to a specific category of words.
+        if category is None or word in category:
+            if suffix.search(word) is not None:
+                return suffix.sub(inflection, word)
     return word
 
 
@@ -533,10 +549,29 @@ def pluralize(word, pos=NOUN, custom=None, classical=True):
     Handles nouns and adjectives, using classical inflection by default
     (i.e., where "matrix" pluralizes to "matrices" and not "matrixes").
     The custom dictionary is for user-defined replacements.
+    Results for words already seen are cached, when no custom dictionary is given.
     """
-    custom = custom if custom else {}
+    if not custom:
+        return _cached_pluralize(word, pos, classical)
     if word in custom:
         return custom[word]
+    return _pluralize(word, pos, custom, classical)
+
+
+def pluralize_all(words, pos=NOUN, custom=None, classical=True):
+    """Returns the plurals of a list of words, e.g., labels of detected objects.
+    Each distinct word is pluralized once.
+    """
+    plurals = {word: pluralize(word, pos, custom, classical) for word in set(words)}
+    return [plurals[word] for word in words]
+
+
+@lru_cache(maxsize=4096)
+def _cached_pluralize(word, pos, classical):
+    return _pluralize(word, pos, None, classical)
+
+
+def _pluralize(word, pos, custom, classical):
     # Recurse genitives.
     # Remove the apostrophe and any trailing -s,
     # form the plural of the resultant noun, and then append an apostrophe (dog's => dogs').
@@ -554,7 +589,7 @@ def pluralize(word, pos=NOUN, custom=None, classical=True):
         if (
             w[1] == "general"
             or w[1] == "General"
-            and w[0] not in plural_categories["general-generals"]
+            and w[0] not in _category_sets["general-generals"]
         ):
             return word.replace(w[0], pluralize(w[0], pos, custom, classical))
         elif w[1] in plural_prepositions:
@@ -1,12 +1,20 @@
 import base64
+import hashlib
 import inspect
 import uuid
-from functools import wraps
+from collections import Counter, OrderedDict, deque
+from functools import partial, wraps
 from enum import Enum
 from io import BytesIO
 from pathlib import Path
+from threading import Lock, Timer
 from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
     List,
+    Tuple,
     Dict,
     Optional,
     Union,
@@ -19,11 +27,229 @@ import cv2
 import httpx
 import numpy as np
 from attrs import Attribute
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from jinja2.environment import Template
 from .pluralize import pluralize
 
 
+def approximate_token_count(text: str) -> int:
+    """
+    Approximates the number of tokens in a text, assuming an average of four
+    characters per token for english text
+    :param      text:  The text
+    :type       text:  str
+    :returns:   Approximate number of tokens
+    :rtype:     int
+    """
+    return len(text) // 4 + 1
+
+
+def evict_history_turns(
+    messages: List[Dict],
+    token_budget: int,
+    tokenizer: Callable[[str], int],
+    keep: int = 0,
+) -> List[Dict]:
+    """
+    Evicts the oldest turns (a user message and the messages following it) from
+    chat history in place, until the messages fit in the token budget. The latest
+    message is always kept.
+    :param      messages:  Chat history messages
+    :type       messages:  list[dict]
+    :param      token_budget:  Maximum number of tokens in chat history
+    :type       token_budget:  int
+    :param      tokenizer:  Callable counting tokens in a text
+    :type       tokenizer:  Callable[[str], int]
+    :param      keep:  Number of leading messages that are never evicted, e.g. system prompt
+    :type       keep:  int
+    :returns:   Evicted messages
+    :rtype:     list[dict]
+    """
+    total_tokens = sum(tokenizer(str(message["content"])) for message in messages)
+    evicted: List[Dict] = []
+    while total_tokens > token_budget and len(messages) - keep > 1:
+        end = keep + 1
+        while end < len(messages) - 1 and messages[end]["role"] != "user":
+            end += 1
+        turn = messages[keep:end]
+        del messages[keep:end]
+        total_tokens -= sum(tokenizer(str(message["content"])) for message in turn)
+        evicted.extend(turn)
+    return evicted
+
+
+def insert_history_summary(
+    messages: List[Dict],
+    summary: Dict,
+    previous_summary: Optional[Dict] = None,
+    index: int = 0,
+) -> None:
+    """
+    Inserts a summary of evicted messages in chat history in place, replacing the
+    previous summary
+    :param      messages:  Chat history messages
+    :type       messages:  list[dict]
+    :param      summary:  Summary message
+    :type       summary:  dict
+    :param      previous_summary:  Previous summary message, if any
+    :type       previous_summary:  dict | None
+    :param      index:  Position of the summary, e.g. 1 to place it after the system prompt
+    :type       index:  int
+    """
+    if previous_summary in messages:
+        messages.remove(previous_summary)
+    messages.insert(index, summary)
+
+
+def _find_whitespace(text: str, start: int, end: int, last: bool = False) -> int:
+    """
+    Finds the first (or last) whitespace in a slice of text
+    :param      text:  The text
+    :type       text:  str
+    :param      start:  Start of the slice
+    :type       start:  int
+    :param      end:  End of the slice
+    :type       end:  int
+    :param      last:  Find the last whitespace instead of the first
+    :type       last:  bool
+    :returns:   Index of the whitespace or -1 if not found
+    :rtype:     int
+    """
+    if last:
+        return max(text.rfind(char, start, end) for char in (" ", "\n", "\t"))
+    found = [
+        idx for char in (" ", "\n", "\t") if (idx := text.find(char, start, end)) >= 0
+    ]
+    return min(found, default=-1)
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int = 0) -> List[str]:
+    """
+    Splits text into chunks of a maximum size, overlapping by up to a given number
+    of characters. Chunks end at the last whitespace in the chunk and overlaps start
+    at a whitespace, if there is one, to avoid splitting words. Whitespace at the
+    start and end of chunks is removed
+    :param      text:  The text
+    :type       text:  str
+    :param      chunk_size:  Maximum number of characters in a chunk
+    :type       chunk_size:  int
+    :param      chunk_overlap:  Maximum number of characters shared by consecutive chunks
+    :type       chunk_overlap:  int
+    :returns:   List of chunks
+    :rtype:     list[str]
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+    chunks = []
+    start = 0
+    while True:
+        # skip whitespace at the start of a chunk
+        while start < len(text) and text[start].isspace():
+            start += 1
+        if start >= len(text):
+            break
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # break at last whitespace, including one right after the chunk,
+            # if it leaves room for progress
+            split = _find_whitespace(
+                text, start + chunk_overlap + 1, end + 1, last=True
+            )
+            end = split if split > 0 else end
+        chunks.append(text[start:end].rstrip())
+        if end == len(text):
+            break
+        # start the overlap at a word boundary, if there is one
+        start = end - chunk_overlap
+        if chunk_overlap and (split := _find_whitespace(text, start, end)) >= 0:
+            start = split
+    return chunks
+
+
+def stream_chunks(
+    tokens: Iterable[str],
+    break_character: str,
+    response_terminator: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Groups streamed tokens into chunks that end at the last break character
+    received, e.g. sentence by sentence, followed by an optional response terminator
+    :param      tokens:  Streamed tokens
+    :type       tokens:  Iterable[str]
+    :param      break_character:  Character at which chunks end. Every token is a chunk if empty
+    :type       break_character:  str
+    :param      response_terminator:  String yielded after the last chunk
+    :type       response_terminator:  Optional[str]
+    :returns:   Chunks of tokens
+    :rtype:     Iterator[str]
+    """
+    chunk = ""
+    for token in tokens:
+        chunk += token
+        # yield every token if no break character is set
+        if not break_character:
+            yield chunk
+            chunk = ""
+        # yield accumulated chunk up to the last break character
+        elif break_character in token:
+            head, sep, chunk = chunk.rpartition(break_character)
+            yield head + sep
+    # yield any remaining output and the response terminator
+    if chunk:
+        yield chunk
+    if response_terminator:
+        yield response_terminator
+
+
+def remove_overlap(previous: str, text: str, max_words: int = 10) -> str:
+    """
+    Removes words at the start of text that repeat the end of previous text,
+    e.g. when transcribing overlapping audio chunks
+    :param      previous:  Transcript of previous chunks
+    :type       previous:  str
+    :param      text:  Transcript of current chunk
+    :type       text:  str
+    :param      max_words:  Maximum number of repeated words checked
+    :type       max_words:  int
+    :rtype:     str
+    """
+    words = text.split()
+
+    def _normalize(w: List[str]) -> List[str]:
+        return [word.strip(".,!?;:").lower() for word in w]
+
+    previous_words = _normalize(previous.split()[-max_words:])
+    current_words = _normalize(words[:max_words])
+    for n_words in range(min(len(previous_words), len(current_words)), 0, -1):
+        if previous_words[-n_words:] == current_words[:n_words]:
+            return " ".join(words[n_words:])
+    return text
+
+
+def select_frames(
+    num_frames: int,
+    frame_stride: int = 1,
+    max_frames: Optional[int] = None,
+    from_end: bool = False,
+) -> range:
+    """
+    Gets indices of frames to be decoded from a video
+    :param      num_frames: Total number of frames in the video
+    :type       num_frames: int
+    :param      frame_stride: Select every Nth frame
+    :type       frame_stride: int
+    :param      max_frames: Maximum number of selected frames
+    :type       max_frames: int | None
+    :param      from_end: Select the last max_frames frames instead of the first
+    :type       from_end: bool
+    :rtype:     range
+    """
+    indices = range(0, num_frames, max(frame_stride, 1))
+    if max_frames is not None:
+        indices = indices[-max_frames:] if from_end else indices[:max_frames]
+    return indices
+
+
 def create_detection_context(obj_list: Optional[List]) -> str:
     """
     Creates a context prompt based on detections.
@@ -34,24 +260,107 @@ def create_detection_context(obj_list: Optional[List]) -> str:
     """
     if not obj_list:
         return ""
-    context_list = []
-    for obj_class in set(obj_list):
-        obj_count = obj_list.count(obj_class)
-        if obj_count > 1:
-            context_list.append(f"{str(obj_count)} {pluralize(obj_class)}")
-        else:
-            context_list.append(f"{str(obj_count)} {obj_class}")
+    context_list = [
+        f"{obj_count} {pluralize(obj_class) if obj_count > 1 else obj_class}"
+        for obj_class, obj_count in Counter(obj_list).items()
+    ]
+    return ", ".join(context_list)
 
-    if len(obj_list) > 1:
-        return f'{", ".join(context_list)}'
-    return f"{context_list[0]}"
 
+class _FileTemplate:
+    """Compiled template from a file, which checks the file for changes every time it
+    is rendered and renders the recompiled template if the file has changed.
+
+    :param env: Environment which loaded the template
+    :type env: Environment
+    :param name: Name of the template file in the environment
+    :type name: str
+    """
+
+    def __init__(self, env: Environment, name: str):
+        self._env = env
+        self._name = name
+
+    def render(self, *args, **kwargs) -> str:
+        """Render the template, reloaded if the file has changed
+        :rtype: str
+        """
+        return self._env.get_template(self._name).render(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._env.get_template(self._name), name)
 
-def get_prompt_template(template: Union[str, Path]) -> Template:
-    """Method to read prompt jinja prompt templates
+
+class _TemplateRegistry:
+    """Process wide registry of compiled prompt templates. String templates are compiled
+    once and kept by hash of their content, in a shared environment. File templates are
+    loaded with one environment per directory, which keeps compiled templates and
+    recompiles them only when the template file changes on disk. Bytecode of file
+    templates is also cached on disk, so that it is shared between processes.
+
+    :param size: Maximum number of string templates kept in the registry
+    :type size: int
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+        self._string_env = Environment()
+        self._string_templates: OrderedDict[str, Template] = OrderedDict()
+        self._file_envs: Dict[Path, Environment] = {}
+        self._bytecode_cache: Optional[FileSystemBytecodeCache] = None
+        self._lock = Lock()
+
+    def from_string(self, source: str) -> Template:
+        """Get compiled template from string
+        :param source:
+        :type source: str
+        :rtype: Template
+        """
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        with self._lock:
+            if (template := self._string_templates.get(key)) is not None:
+                self._string_templates.move_to_end(key)
+                return template
+        template = self._string_env.from_string(source)
+        with self._lock:
+            self._string_templates[key] = template
+            while len(self._string_templates) > self.size:
+                self._string_templates.popitem(last=False)
+        return template
+
+    def from_file(self, path: Path) -> _FileTemplate:
+        """Get compiled template from file, reloaded on render if the file has changed
+        :param path:
+        :type path: Path
+        :rtype: _FileTemplate
+        """
+        path = path.resolve()
+        with self._lock:
+            if (env := self._file_envs.get(path.parent)) is None:
+                # bytecode cache directory is created on first use
+                if not self._bytecode_cache:
+                    self._bytecode_cache = FileSystemBytecodeCache()
+                env = Environment(
+                    loader=FileSystemLoader(path.parent),
+                    autoescape=True,
+                    auto_reload=True,
+                    cache_size=-1,
+                    bytecode_cache=self._bytecode_cache,
+                )
+                self._file_envs[path.parent] = env
+        # compile once to raise any errors in the template
+        env.get_template(path.name)
+        return _FileTemplate(env, path.name)
+
+
+_template_registry = _TemplateRegistry()
+
+
+def get_prompt_template(template: Union[str, Path]) -> Union[Template, _FileTemplate]:
+    """Method to read prompt jinja prompt templates. Compiled templates are kept in a process wide registry, so the same template is compiled only once, and file templates are recompiled only when modified.
     :param template:
     :type template: str | Path
-    :rtype: None
+    :rtype: Template | _FileTemplate
     """
     # check if prompt is a filename
     try:
@@ -60,10 +369,7 @@ def get_prompt_template(template: Union[str, Path]) -> Template:
         path_exists = False
     if path_exists:
         try:
-            env = Environment(
-                loader=FileSystemLoader(Path(template).parent), autoescape=True
-            )
-            return env.get_template(Path(template).name)
+            return _template_registry.from_file(Path(template))
         except Exception as e:
             raise Exception(
                 f"Exception occured while reading template from file: {e}"
@@ -71,8 +377,7 @@ def get_prompt_template(template: Union[str, Path]) -> Template:
     else:
         # read from string
         try:
-            env = Environment()
-            return env.from_string(format(template))
+            return _template_registry.from_string(format(template))
         except Exception as e:
             raise Exception(
                 f"Exception occured while reading template from string: {e}"
@@ -107,26 +412,38 @@ def validate_kwargs(_, attribute: Attribute, value: Dict):
             value[k] = v
 
 
-def _check_type_from_signature(value, fn_param: inspect.Parameter) -> None:
+def _get_annotated_types(annotation) -> Tuple:
+    """Get types from a parameter annotation, used for checking parameter values.
+    :param annotation:
+    :rtype: tuple
+    """
+    # Handles only one layer of Union
+    if get_origin(annotation) is Union:
+        _annotated_types = get_args(annotation)
+    else:
+        _annotated_types = (annotation,)
+
+    # Handles only the origin of GenericAlias (dict, list)
+    return tuple(
+        get_origin(t) if isinstance(t, _GenericAlias) else t for t in _annotated_types
+    )
+
+
+def _check_type_from_signature(
+    value, fn_param: inspect.Parameter, annotated_types: Optional[Tuple] = None
+) -> None:
     """Check parameter value type based on parameter signature.
     :param value:
     :param fn_param:
     :type fn_param: inspect.Parameter
+    :param annotated_types: Types resolved from the parameter annotation
+    :type annotated_types: tuple | None
     :rtype: None
     """
-    # Handles only one layer of Union
-    if get_origin(fn_param.annotation) is Union:
-        _annotated_types = get_args(fn_param.annotation)
-    else:
-        _annotated_types = [fn_param.annotation]
-
-    # Handles only the origin of GenericAlias (dict, list)
-    _annotated_types = [
-        get_origin(t) if isinstance(t, _GenericAlias) else t
-        for t in _annotated_types
-    ]
+    if annotated_types is None:
+        annotated_types = _get_annotated_types(fn_param.annotation)
 
-    type_check = any(isinstance(value, t) for t in _annotated_types)
+    type_check = any(isinstance(value, t) for t in annotated_types)
     if not type_check:
         raise TypeError(
             f"Invalid type encountered for {fn_param.name}. Should be of type(s) {fn_param.annotation}. Passed value might be of type {type(value)}"
@@ -151,10 +468,40 @@ def _check_type_from_default(value, fn_param: inspect.Parameter) -> None:
         )
 
 
-def validate_func_args(func):
-    """Decorator for validating function parameters based on function signature
+def _get_param_checks(func) -> Tuple[List[str], Dict[str, Callable]]:
+    """Get parameter names and type checks of a function from its signature
     :param func:
+    :returns: Parameter names in order and a type check for each parameter that has an annotation or a default value
+    :rtype: tuple[list[str], dict[str, Callable]]
     """
+    fn_params = inspect.signature(func).parameters
+    checks = {}
+    for name, param in fn_params.items():
+        # for parameters with annotation, preference is given to checking by annotation
+        if param.annotation is not param.empty:
+            checks[name] = partial(
+                _check_type_from_signature,
+                fn_param=param,
+                annotated_types=_get_annotated_types(param.annotation),
+            )
+        elif param.default is not param.empty:
+            checks[name] = partial(_check_type_from_default, fn_param=param)
+    return list(fn_params), checks
+
+
+def validate_func_args(func=None, *, validate_once: bool = False):
+    """Decorator for validating function parameters based on function signature.
+    The signature is inspected once, when the function is decorated.
+    Can be used as @validate_func_args or @validate_func_args(validate_once=True)
+    :param func:
+    :param validate_once: Only validate parameters of the first successful call, for functions called often with parameters of the same types
+    :type validate_once: bool
+    """
+    if func is None:
+        return partial(validate_func_args, validate_once=validate_once)
+
+    param_names, checks = _get_param_checks(func)
+    validated = False
 
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -162,24 +509,16 @@ def validate_func_args(func):
         :param args:
         :param kwargs:
         """
-        args_count = len(args)
-        fn_params = inspect.signature(func).parameters
+        nonlocal validated
+        if not validated:
+            for arg, param in zip(args, param_names):
+                if check := checks.get(param):
+                    check(arg)
 
-        # for parameters with annotation, preference is given to checking by annotation
-        for arg, param in zip(args, list(fn_params)[:args_count]):
-            if fn_params[param].annotation is not fn_params[param].empty:
-                _check_type_from_signature(arg, fn_params[param])
-            elif fn_params[param].default is not fn_params[param].empty:
-                _check_type_from_default(arg, fn_params[param])
-
-        for kwarg, value in kwargs.items():
-            param = fn_params.get(kwarg)
-            if not param:
-                continue
-            if fn_params[kwarg].annotation is not fn_params[kwarg].empty:
-                _check_type_from_signature(value, fn_params[kwarg])
-            elif fn_params[kwarg].default is not fn_params[kwarg].empty:
-                _check_type_from_default(value, fn_params[kwarg])
+            for kwarg, value in kwargs.items():
+                if check := checks.get(kwarg):
+                    check(value)
+            validated = validate_once
 
         # Call the function after validation
         result = func(*args, **kwargs)
@@ -188,17 +527,157 @@ def validate_func_args(func):
     return wrapper
 
 
-def encode_arr_base64(img: np.ndarray) -> str:
+def encode_arr_base64(
+    img: np.ndarray, encoding: str = "png", jpeg_quality: int = 90
+) -> str:
     """Encode a numpy array to a base64 str.
     :param img:
     :type img: np.ndarray
+    :param encoding: Image encoding, "png" (lossless) or "jpeg" (lossy but much faster to encode)
+    :type encoding: str
+    :param jpeg_quality: Quality (0-100) used for jpeg encoding
+    :type jpeg_quality: int
     :rtype: str
     """
-    encode_params = [int(cv2.IMWRITE_PNG_COMPRESSION), 9]
-    _, buffer = cv2.imencode(".png", img, encode_params)
+    if encoding == "jpeg":
+        encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality]
+        _, buffer = cv2.imencode(".jpg", img, encode_params)
+    else:
+        encode_params = [int(cv2.IMWRITE_PNG_COMPRESSION), 9]
+        _, buffer = cv2.imencode(".png", img, encode_params)
     return base64.b64encode(buffer).decode("utf-8")
 
 
+class InferenceSlots:
+    """Thread safe tracker of inference calls in flight, which keeps inputs waiting
+    for a free slot and drops waiting inputs according to a drop policy when they
+    reach maximum capacity.
+
+    :param max_inflight: Maximum number of inference calls in flight
+    :type max_inflight: int
+    :param max_pending: Maximum number of inputs waiting for a free slot
+    :type max_pending: int
+    :param drop_policy: "drop_oldest" (replace the oldest waiting input with the new one) or "drop_newest" (discard the new input)
+    :type drop_policy: str
+    """
+
+    def __init__(self, max_inflight: int, max_pending: int, drop_policy: str):
+        self.max_inflight = max_inflight
+        self.max_pending = max_pending
+        self.drop_policy = drop_policy
+        self.inflight: int = 0
+        self.dropped: int = 0
+        self._pending: deque = deque()
+        self._lock = Lock()
+
+    def acquire(self, item: Any) -> bool:
+        """Take a free slot for an input, or keep it waiting if all slots are taken
+        :param item: Inference input
+        :type item: Any
+        :returns: True if a slot was taken and the input can be dispatched
+        :rtype: bool
+        """
+        with self._lock:
+            if self.inflight < self.max_inflight:
+                self.inflight += 1
+                return True
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                if self.drop_policy == "drop_newest":
+                    return False
+                self._pending.popleft()
+            self._pending.append(item)
+            return False
+
+    def release_batch(self) -> List[Any]:
+        """Hand over the slot of a finished inference call to all waiting inputs, to be dispatched together as a batch, or free it if no input is waiting
+        :returns: Waiting inputs in the order they were received
+        :rtype: list
+        """
+        with self._lock:
+            if self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                return batch
+            self.inflight -= 1
+            return []
+
+    def clear(self) -> None:
+        """Discard all waiting inputs"""
+        with self._lock:
+            self._pending.clear()
+
+
+class TimedBatch:
+    """Thread safe batch of items, ordered by an index, that is handed over when it is full or
+    when a timeout expires after its first item was added.
+
+    :param batch_size: Maximum number of items in a batch
+    :type batch_size: int
+    :param timeout: Time in seconds to wait for the batch to fill up after its first item was added
+    :type timeout: float
+    :param on_timeout: Callable receiving the batch when the timeout expires
+    :type on_timeout: Callable[[list], None]
+    """
+
+    def __init__(
+        self, batch_size: int, timeout: float, on_timeout: Callable[[List], None]
+    ):
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self._items: List[Tuple[int, Any]] = []
+        self._timer: Optional[Timer] = None
+        self._lock = Lock()
+
+    def add(self, index: int, item: Any) -> Optional[List]:
+        """Add an item to the batch
+        :param index: Index used for ordering items in the batch, e.g. index of the input topic
+        :type index: int
+        :param item: Item to be added
+        :type item: Any
+        :returns: Batch of items ordered by index if the batch is full, None otherwise
+        :rtype: list | None
+        """
+        with self._lock:
+            self._items.append((index, item))
+            if len(self._items) < self.batch_size:
+                # start timer on first item of the batch
+                if not self._timer:
+                    self._timer = Timer(self.timeout, self._flush)
+                    self._timer.start()
+                return None
+            return self._take()
+
+    def take(self) -> List:
+        """Take current batch, ordered by index, and reset it
+        :rtype: list
+        """
+        with self._lock:
+            return self._take()
+
+    def _take(self) -> List:
+        """Take current batch, ordered by index, and reset it. Needs to be called with lock acquired.
+        :rtype: list
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        # stable sort keeps consecutive items of one index in order
+        batch = [item for _, item in sorted(self._items, key=lambda i: i[0])]
+        self._items = []
+        return batch
+
+    def _flush(self) -> None:
+        """Hand over current batch when timeout expires"""
+        with self._lock:
+            # timer fired after the batch was already taken
+            if not self._items:
+                return
+            batch = self._take()
+        self.on_timeout(batch)
+
+
 class VADStatus(Enum):
     """VAD Status for start and end of detected speech"""
 
@@ -219,7 +698,7 @@ def load_model(model_name: str, model_path: str) -> str:
     """Model download utility function"""
     from tqdm import tqdm
     from platformdirs import user_cache_dir
-    
+
     cachedir = user_cache_dir("ros_agents")
     model_full_path = Path(cachedir) / Path("models") / Path(f"{model_name}.onnx")
 
@@ -287,6 +766,7 @@ class PDFReader:
             ) from e
         if not Path(pdf_file).is_file():
             raise TypeError(f"{pdf_file} is not a valid file")
+        self.pdf_file = str(Path(pdf_file).resolve())
         try:
             self.reader = PdfReader(pdf_file, password=password)
             self.image_reader = Image
@@ -303,21 +783,34 @@ class PDFReader:
         images = []
         ids = []
 
-        for page_num, page in enumerate(self.reader.pages):
-            # add pdf metadata as reader metadata and add pagenumber to it
-            metadata = self.reader.metadata if self.reader.metadata else {}
-            metadata["page"] = page_num
+        for id, metadata, content in self.iter_pages():
+            ids.append(id)
             metadatas.append(metadata)
-            # get content
-            content = page.get_contents()
             documents.append(content)
-            # create a unique ID
-            ids.append(str(uuid.uuid5(uuid.NAMESPACE_DNS, content)))
-            # get images if asked
-            if extract_images:
-                page_images = [
+
+        # get images if asked
+        if extract_images:
+            for page in self.reader.pages:
+                images += [
                     self.image_reader.open(BytesIO(img.data)) for img in page.images
                 ]
-                images += page_images
 
         return ids, metadatas, documents
+
+    def iter_pages(self) -> Iterator[Tuple[str, Dict, str]]:
+        """Lazily extract text from PDF documents, one page at a time, so that large
+        documents do not need to be loaded in memory at once. The output can be directly
+        passed to add_documents_stream method of LLM components.
+        :rtype: Iterator[tuple[str, dict, str]]
+        """
+        for page_num, page in enumerate(self.reader.pages):
+            # add pdf metadata as reader metadata and add pagenumber to it
+            metadata = dict(self.reader.metadata) if self.reader.metadata else {}
+            metadata["page"] = page_num
+            # get content
+            content = page.extract_text()
+            # create a unique ID, which differs for pages with identical content
+            page_id = uuid.uuid5(
+                uuid.NAMESPACE_DNS, f"{self.pdf_file}:{page_num}:{content}"
+            )
+            yield str(page_id), metadata, content
@@ -1,3 +1,4 @@
+import threading
 from typing import Optional
 import numpy as np
 from .utils import VADStatus, WakeWordStatus
@@ -58,6 +59,10 @@ class VADIterator:
         # State variable required by vad model
         self._state = np.zeros((2, 1, 128)).astype("float32")
 
+        # Preallocated model input buffer and inputs
+        self._input = np.empty((1, 0), dtype=np.float32)
+        self._ort_inputs = {"sr": self.sample_rate}
+
         self.min_silence_samples = sample_rate * min_silence_duration_ms / 1000
         self.speech_pad_samples = sample_rate * speech_pad_ms / 1000
 
@@ -73,22 +78,22 @@ class VADIterator:
         x: np.ndarray dtype:int16
             audio chunks
         """
-        chunks = np.array_split(x_np_32, 2)
-        speech_probs = []
-        for chunk in chunks:
-            window_size_samples = chunk.shape[0]
-            self.current_sample += window_size_samples
-
-            ort_inputs = {
-                "input": chunk[None,] / 32768,
-                "state": self._state,
-                "sr": self.sample_rate,
-            }
-
-            out, self._state = self.model.run(None, ort_inputs)
-            speech_probs.append(out.squeeze())
-
-        speech_prob = np.mean(speech_probs)
+        # scale block into a preallocated input buffer, reused for blocks of same size
+        if self._input.shape[1] != x_np_32.shape[0]:
+            self._input = np.empty((1, x_np_32.shape[0]), dtype=np.float32)
+        np.multiply(x_np_32, 1 / 32768, out=self._input[0], casting="unsafe")
+
+        # The model is recurrent, i.e. each chunk depends on the state after the
+        # previous chunk, hence the chunks are run in sequence and cannot be batched
+        # first chunk is the larger one for odd block sizes, as with np.array_split
+        split = x_np_32.shape[0] - x_np_32.shape[0] // 2
+        speech_prob = 0.0
+        for chunk in (self._input[:, :split], self._input[:, split:]):
+            self.current_sample += chunk.shape[1]
+            self._ort_inputs["input"] = chunk
+            self._ort_inputs["state"] = self._state
+            out, self._state = self.model.run(None, self._ort_inputs)
+            speech_prob += float(out.squeeze()) / 2
 
         if (speech_prob >= self.threshold) and self.temp_end:
             self.temp_end = 0
@@ -110,6 +115,38 @@ class VADIterator:
         return None
 
 
+class _RingBuffer:
+    """Fixed size buffer of rows (e.g. feature frames), where new rows overwrite the oldest.
+    Rows are stored twice, in two consecutive halves of the underlying array, so that the latest rows can always be read as one contiguous view without copying.
+
+    :param initial: Initial content of the buffer, which also sets its size
+    :type initial: np.ndarray
+    """
+
+    def __init__(self, initial: np.ndarray):
+        self.size = initial.shape[0]
+        self._buffer = np.concatenate([initial, initial]).astype(np.float32)
+        # index of the oldest row
+        self._head = 0
+
+    def append(self, rows: np.ndarray) -> None:
+        """Add rows to the buffer, overwriting the oldest ones"""
+        rows = rows[-self.size :]
+        n_rows = rows.shape[0]
+        # write rows till the end of first half, then wrap around
+        first = min(n_rows, self.size - self._head)
+        for start, part in ((self._head, rows[:first]), (0, rows[first:])):
+            self._buffer[start : start + part.shape[0]] = part
+            self._buffer[start + self.size : start + self.size + part.shape[0]] = part
+        self._head = (self._head + n_rows) % self.size
+
+    def latest(self, n_rows: Optional[int] = None) -> np.ndarray:
+        """Get a view of the latest rows, ordered from oldest to newest"""
+        n_rows = self.size if n_rows is None else min(n_rows, self.size)
+        end = self._head + self.size
+        return self._buffer[end - n_rows : end]
+
+
 class AudioFeatures:
     """
      Adapted streaming implementation of AudioFeatures class from the wonderful [openWakeWord project](https://github.com/dscripka/openWakeWord/). This class converts raw audio to audio embeddings. It uses the following two ONNX models.
@@ -157,11 +194,17 @@ class AudioFeatures:
             None, {"input_1": x}
         )[0].squeeze()
 
-        # Buffers for storing melspectrograms and embeddings
-        self.melspectrogram_buffer = np.ones((76, 32))  # n_frames x num_features
-        self.embeddings_buffer = self._initialize_random_embeddings(
-            np.random.randint(-1000, 1000, 16000 * 4).astype(np.float32)
+        # Ring buffers for storing melspectrograms and embeddings
+        self.melspectrogram_buffer = _RingBuffer(
+            np.ones((76, 32))  # n_frames x num_features
+        )
+        self.embeddings_buffer = _RingBuffer(
+            self._initialize_random_embeddings(
+                np.random.randint(-1000, 1000, 16000 * 4).astype(np.float32)
+            )
         )
+        # Model input buffer for batches of melspectrogram windows
+        self._windows = np.empty((0, 76, 32, 1), dtype=np.float32)
 
     def _get_melspectrogram(
         self,
@@ -199,25 +242,86 @@ class AudioFeatures:
         return embedding
 
     def get_embeddings(self, n_feature_frames: int = 16) -> np.ndarray:
-        """Get computed embeddings from the buffer"""
-        return self.embeddings_buffer[int(-1 * n_feature_frames) :, :][None,].astype(
-            np.float32
-        )
+        """Get a copy of computed embeddings from the buffer, which can be used while the buffer is updated"""
+        return self.embeddings_buffer.latest(int(n_feature_frames))[None,].copy()
 
     def __call__(self, x):
-        """Calclate melspetrogram and audio embeddings"""
-        # calculate melspectogram
-        mels = self._get_melspectrogram(x)
-        self.melspectrogram_buffer = np.roll(
-            self.melspectrogram_buffer, -mels.shape[0], axis=0
-        )
-        self.melspectrogram_buffer[-mels.shape[0] :] = mels
+        """Calclate melspetrogram and audio embeddings, for one audio block or a batch
+        of consecutive blocks given as a 2D array. Embeddings of all blocks in a batch are
+        calculated with one model call."""
+        blocks = x if len(x.shape) == 2 else x[None,]
+        # reuse model input buffer for batches of same size
+        if self._windows.shape[0] != blocks.shape[0]:
+            self._windows = np.empty(
+                (blocks.shape[0], self.melspectrogram_buffer.size, 32, 1),
+                dtype=np.float32,
+            )
+        for i, block in enumerate(blocks):
+            # calculate melspectogram
+            mels = self._get_melspectrogram(block)
+            self.melspectrogram_buffer.append(np.atleast_2d(mels))
+            self._windows[i, :, :, 0] = self.melspectrogram_buffer.latest()
 
         # calculate audio embeddings
-        x = self.melspectrogram_buffer.astype(np.float32)[None, :, :, None]
+        embeddings = self.embedding_model_predict(self._windows)
+        self.embeddings_buffer.append(embeddings.reshape(blocks.shape[0], -1))
+
 
-        self.embeddings_buffer = np.roll(self.embeddings_buffer, -1, axis=0)
-        self.embeddings_buffer[-1:] = self.embedding_model_predict(x)
+class AudioRingBuffer:
+    """Ring buffer of fixed size audio blocks, for passing captured audio from an audio device callback to a processing thread. It is meant for a single producer and a single consumer, which only advance their own counters, so that writing a block does not wait on any lock held by the consumer. When the buffer is full, new blocks are dropped and counted as overflows.
+
+    :param block_size: Number of int16 samples in a block
+    :type block_size: int
+    :param capacity: Maximum number of blocks held in the buffer
+    :type capacity: int
+    """
+
+    def __init__(self, block_size: int, capacity: int):
+        self.capacity = capacity
+        self._blocks = np.zeros((capacity, block_size), dtype=np.int16)
+        # total blocks written by producer and read by consumer
+        self._written = 0
+        self._read = 0
+        self._data_available = threading.Event()
+        self.overflows = 0
+
+    def put(self, data: bytes) -> bool:
+        """Copy a block of raw int16 audio into the buffer
+        :param data:
+        :type data: bytes
+        :returns: False if the buffer was full and the block was dropped
+        :rtype: bool
+        """
+        if self._written - self._read >= self.capacity:
+            self.overflows += 1
+            return False
+        self._blocks[self._written % self.capacity] = np.frombuffer(
+            data, dtype=np.int16
+        )
+        self._written += 1
+        self._data_available.set()
+        return True
+
+    def get(self, max_blocks: int, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """Get the oldest unread blocks, waiting for timeout seconds if none are available
+        :param max_blocks: Maximum number of blocks returned
+        :type max_blocks: int
+        :param timeout:
+        :type timeout: float
+        :returns: Copy of blocks as an array of shape (n_blocks, block_size), or None
+        :rtype: np.ndarray | None
+        """
+        if self._written == self._read:
+            self._data_available.clear()
+            # check again, in case a block was written before the event was cleared
+            if self._written == self._read and not self._data_available.wait(timeout):
+                return None
+        n_blocks = min(self._written - self._read, max_blocks)
+        start = self._read % self.capacity
+        indices = np.arange(start, start + n_blocks) % self.capacity
+        blocks = self._blocks[indices]
+        self._read += n_blocks
+        return blocks
 
 
 class WakeWord:
@@ -0,0 +1,382 @@
+"""In-process stand-ins for RoboML (HTTP and RESP) and Ollama servers, used for benchmarking components without running any models. Each server answers with canned outputs matching the model or DB type created on it, after an artificial latency."""
+
+import base64
+import io
+import json
+import socketserver
+import threading
+import time
+import wave
+from collections import defaultdict
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import msgpack
+import msgpack_numpy as m_pack
+
+
+def _make_wav(duration: float = 0.5, sample_rate: int = 16000) -> bytes:
+    """Create a silent wav file used as text to speech output
+    :param duration:
+    :type duration: float
+    :param sample_rate:
+    :type sample_rate: int
+    :rtype: bytes
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\x00\x00" * int(duration * sample_rate))
+    return buffer.getvalue()
+
+
+class MockBackend:
+    """Shared state and canned outputs of mock servers. Keeps track of node types
+    created on the server and of documents added to DB collections.
+
+    :param latency: Artificial latency in seconds added to every inference or DB call
+    :type latency: float
+    """
+
+    text_output = "There is a robot standing in front of a door."
+    wav_output = _make_wav()
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.node_types: Dict[str, str] = {}
+        self.collections: Dict[str, List[Dict]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add_node(self, node_name: str, node_type: str) -> Dict:
+        self.node_types[node_name] = node_type
+        return {"output": f"{node_name} added"}
+
+    def inference(self, node_name: str, data: Dict, binary: bool = False) -> Dict:
+        """Canned inference output based on node type
+        :param node_name:
+        :type node_name: str
+        :param data: Inference input
+        :type data: dict
+        :param binary: Whether bytes can be returned as is, otherwise they are base64 encoded
+        :type binary: bool
+        :rtype: dict
+        """
+        time.sleep(self.latency)
+        node_type = self.node_types.get(node_name, "")
+        if node_type == "VisionModel":
+            images = data.get("images") or [None]
+            return {
+                "output": [
+                    {
+                        "bboxes": [
+                            [10.0, 20.0, 110.0, 220.0],
+                            [50.0, 60.0, 90.0, 160.0],
+                        ],
+                        "labels": ["person", "chair"],
+                        "scores": [0.9, 0.8],
+                    }
+                    for _ in images
+                ]
+            }
+        if node_type in ["SpeechT5", "Bark"]:
+            return {
+                "output": self.wav_output
+                if binary
+                else base64.b64encode(self.wav_output).decode("utf-8")
+            }
+        return {"output": self.text_output}
+
+    def db_call(self, node_name: str, method: str, data: Dict) -> Dict:
+        """Canned DB output. Added documents are kept and returned by queries.
+        :param node_name:
+        :type node_name: str
+        :param method: add, conditional_add, metadata_query or query
+        :type method: str
+        :param data: DB input
+        :type data: dict
+        :rtype: dict
+        """
+        time.sleep(self.latency)
+        collection = self.collections[data.get("collection_name", node_name)]
+        if method in ["add", "conditional_add"]:
+            with self._lock:
+                if data.get("reset_collection"):
+                    collection.clear()
+                for id, doc, meta in zip(
+                    data["ids"], data["documents"], data["metadatas"]
+                ):
+                    collection.append({"id": id, "document": doc, "metadata": meta})
+            return {"output": f"{len(data['ids'])} documents added"}
+
+        results = collection[: data.get("n_results", 1)]
+        return {
+            "output": {
+                "ids": [[r["id"] for r in results]],
+                "documents": [[r["document"] for r in results]],
+                "metadatas": [[r["metadata"] for r in results]],
+                "distances": [[0.1 for _ in results]],
+            }
+        }
+
+
+def _serve(server: socketserver.BaseServer) -> threading.Thread:
+    """Serve on a daemon thread
+    :param server:
+    :type server: socketserver.BaseServer
+    :rtype: threading.Thread
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    """Request handler with helpers for reading and writing bodies"""
+
+    backend: MockBackend
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_):
+        pass
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        if not body:
+            return {}
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/msgpack"):
+            return msgpack.unpackb(body, object_hook=m_pack.decode)
+        if content_type.startswith("multipart/form-data"):
+            # binary audio upload, with remaining data as json
+            message = BytesParser().parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+            )
+            parts = {
+                part.get_param("name", header="content-disposition"): part.get_payload(
+                    decode=True
+                )
+                for part in message.get_payload()
+            }
+            return {
+                **json.loads(parts.get("data") or b"{}"),
+                "query": parts.get("query"),
+            }
+        return json.loads(body)
+
+    def _write(self, data: Any, binary: bool = False, status: int = 200) -> None:
+        if binary:
+            body = msgpack.packb(data, default=m_pack.encode)
+            content_type = "application/msgpack"
+        else:
+            body = json.dumps(data).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _RoboMLHTTPHandler(_QuietHandler):
+    """Handler for RoboML HTTP endpoints"""
+
+    def do_GET(self):
+        self._write({"output": "RoboML is running"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        binary = self.headers.get("Content-Type", "").startswith("application/msgpack")
+        data = self._read_body()
+        parts = url.path.strip("/").split("/")
+        if parts == ["add_node"]:
+            self._write(self.backend.add_node(params["node_name"], params["node_type"]))
+        elif parts == ["remove_node"] or parts[-1] == "initialize":
+            self._write({"output": "ok"})
+        elif parts[-1] == "inference":
+            self._write(self.backend.inference(parts[0], data, binary), binary)
+        elif parts[-1] in ["add", "conditional_add", "metadata_query", "query"]:
+            self._write(self.backend.db_call(parts[0], parts[-1], data))
+        else:
+            self._write({"detail": "Not found"}, status=404)
+
+
+class _OllamaHandler(_QuietHandler):
+    """Handler for Ollama endpoints used by the OllamaClient"""
+
+    def do_GET(self):
+        body = b"Ollama is running"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        data = self._read_body()
+        if self.path == "/api/pull":
+            self._write({"status": "success"})
+        elif self.path == "/api/generate":
+            self._write({
+                "model": data.get("model"),
+                "created_at": "2024-01-01T00:00:00Z",
+                "response": "",
+                "done": True,
+            })
+        elif self.path == "/api/chat":
+            start_time = time.perf_counter()
+            output = self.backend.inference("ollama", data)["output"]
+            if data.get("stream"):
+                self._write_stream(data.get("model"), output)
+                return
+            self._write({
+                "model": data.get("model"),
+                "created_at": "2024-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": output},
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.perf_counter() - start_time) * 1e9),
+            })
+        else:
+            self._write({"error": "Not found"}, status=404)
+
+    def _write_stream(self, model: Optional[str], output: str) -> None:
+        lines = [
+            {
+                "model": model,
+                "created_at": "2024-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": f"{token} "},
+                "done": False,
+            }
+            for token in output.split()
+        ]
+        lines.append({
+            "model": model,
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "stop",
+        })
+        body = b"".join(json.dumps(line).encode("utf-8") + b"\n" for line in lines)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _RESPHandler(socketserver.StreamRequestHandler):
+    """Handler for RoboML RESP commands, supporting RESP2 arrays of bulk strings"""
+
+    backend: MockBackend
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # inline command
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write_bulk(self, data: bytes) -> None:
+        self.wfile.write(b"$%d\r\n%s\r\n" % (len(data), data))
+
+    def handle(self):
+        while args := self._read_command():
+            command = args[0].decode("utf-8")
+            data = (
+                msgpack.unpackb(args[1], object_hook=m_pack.decode)
+                if len(args) > 1
+                else {}
+            )
+            node_name, _, method = command.rpartition(".")
+            if command.upper() == "PING":
+                self.wfile.write(b"+PONG\r\n")
+                continue
+            if command == "add_node":
+                result = self.backend.add_node(data["node_name"], data["node_type"])
+            elif method == "get_status":
+                result = "READY"
+            elif method == "inference":
+                result = self.backend.inference(node_name, data, binary=True)
+            elif method in ["add", "conditional_add", "metadata_query", "query"]:
+                result = self.backend.db_call(node_name, method, data)
+            elif command == "remove_node" or method == "initialize":
+                result = {"output": "ok"}
+            else:
+                # e.g. CLIENT SETINFO sent by redis clients on connection
+                self.wfile.write(b"+OK\r\n")
+                continue
+            self._write_bulk(msgpack.packb(result, default=m_pack.encode))
+
+
+class MockServers:
+    """Start RoboML HTTP, RoboML RESP and Ollama stand-ins on free local ports
+
+    :param latency: Artificial latency in seconds added to every inference or DB call
+    :type latency: float
+
+    Example usage:
+    ```python
+    with MockServers(latency=0.01) as servers:
+        client = HTTPModelClient(model, port=servers.http_port)
+    ```
+    """
+
+    host = "127.0.0.1"
+
+    def __init__(self, latency: float = 0.0):
+        self.backend = MockBackend(latency)
+        handlers = {
+            "http": _RoboMLHTTPHandler,
+            "ollama": _OllamaHandler,
+            "resp": _RESPHandler,
+        }
+        self._servers: Dict[str, socketserver.BaseServer] = {}
+        for name, handler in handlers.items():
+            # bind backend to a handler subclass
+            handler = type(handler.__name__, (handler,), {"backend": self.backend})
+            if name == "resp":
+                server = socketserver.ThreadingTCPServer((self.host, 0), handler)
+            else:
+                server = ThreadingHTTPServer((self.host, 0), handler)
+            server.daemon_threads = True
+            self._servers[name] = server
+
+    @property
+    def http_port(self) -> int:
+        return self._servers["http"].server_address[1]
+
+    @property
+    def ollama_port(self) -> int:
+        return self._servers["ollama"].server_address[1]
+
+    @property
+    def resp_port(self) -> int:
+        return self._servers["resp"].server_address[1]
+
+    def start(self) -> None:
+        for server in self._servers.values():
+            _serve(server)
+
+    def stop(self) -> None:
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self) -> "MockServers":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
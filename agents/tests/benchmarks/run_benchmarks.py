@@ -0,0 +1,473 @@
+"""Benchmark harness for components. Each component is run against in-process stand-ins for RoboML (HTTP and RESP) and Ollama servers, with a configurable artificial latency, and its execution step is called directly with pre-made input messages. Reports throughput, p50/p99 latency, CPU time and memory allocations per execution step, which can be used to catch regressions in hot paths like serialization, message conversion and prompt building.
+
+Usage:
+    python run_benchmarks.py --iterations 200 --latency 0.005
+    python run_benchmarks.py --components LLM Vision --servers http resp --json results.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import rclpy
+from nav_msgs.msg import OccupancyGrid as ROSOccupancyGrid
+from nav_msgs.msg import Odometry as ROSOdometry
+
+from agents.clients.ollama import OllamaClient
+from agents.clients.roboml import (
+    HTTPDBClient,
+    HTTPModelClient,
+    RESPDBClient,
+    RESPModelClient,
+)
+from agents.components import (
+    LLM,
+    MLLM,
+    MapEncoding,
+    SemanticRouter,
+    SpeechToText,
+    TextToSpeech,
+    VideoMessageMaker,
+    Vision,
+)
+from agents.config import (
+    LLMConfig,
+    MapConfig,
+    MLLMConfig,
+    SemanticRouterConfig,
+    SpeechToTextConfig,
+    TextToSpeechConfig,
+    VideoMessageMakerConfig,
+    VisionConfig,
+)
+from agents.models import (
+    Idefics2,
+    Llama3_1,
+    OllamaModel,
+    SpeechT5,
+    VisionModel,
+    Whisper,
+)
+from agents.ros import MapLayer, Route, Topic
+from agents.vectordbs import ChromaDB
+
+from mock_servers import MockBackend, MockServers
+
+COMPONENTS = [
+    "LLM",
+    "MLLM",
+    "Vision",
+    "SpeechToText",
+    "TextToSpeech",
+    "SemanticRouter",
+    "MapEncoding",
+    "VideoMessageMaker",
+]
+SERVERS = ["http", "resp", "ollama"]
+
+# servers that each component can be run against
+COMPONENT_SERVERS = {
+    "LLM": ["http", "resp", "ollama"],
+    "MLLM": ["http", "resp", "ollama"],
+    "Vision": ["http", "resp"],
+    "SpeechToText": ["http", "resp"],
+    "TextToSpeech": ["http", "resp"],
+    "SemanticRouter": ["http", "resp"],
+    "MapEncoding": ["http", "resp"],
+    "VideoMessageMaker": [None],
+}
+
+QUERY = "What do you see in front of you and is there a door anywhere nearby?"
+
+
+class Scenario:
+    """A component with pre-made input messages, ready to be stepped
+
+    :param component: Configured component
+    :param inputs: Input messages keyed by topic
+    :param trigger: Trigger topic, None for timed components
+    """
+
+    def __init__(
+        self,
+        component: Any,
+        inputs: List[Tuple[Topic, Any]],
+        trigger: Optional[Topic] = None,
+    ):
+        self.component = component
+        self.inputs = inputs
+        self.trigger = trigger
+        self._trigger_msg = next(
+            (msg for topic, msg in inputs if trigger and topic.name == trigger.name),
+            None,
+        )
+
+    def start(self) -> None:
+        self.component.trigger_configure()
+        self.component.trigger_activate()
+
+    def stop(self) -> None:
+        try:
+            self.component.trigger_deactivate()
+        finally:
+            self.component.destroy_node()
+
+    def step(self) -> None:
+        # set latest received message on component callbacks
+        for topic, msg in self.inputs:
+            for callbacks in ["trig_callbacks", "callbacks"]:
+                if callback := getattr(self.component, callbacks, {}).get(topic.name):
+                    callback.msg = msg
+        if self.trigger:
+            self.component._execution_step(topic=self.trigger, msg=self._trigger_msg)
+        else:
+            self.component._execution_step()
+
+
+def _image(seed: int = 0, size: Tuple[int, int] = (480, 640)) -> np.ndarray:
+    """Random RGB image"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, (*size, 3), dtype=np.uint8)
+
+
+def _model_client(server: str, model: Any, servers: MockServers, **kwargs) -> Any:
+    if server == "http":
+        return HTTPModelClient(model, port=servers.http_port, **kwargs)
+    if server == "resp":
+        return RESPModelClient(model, port=servers.resp_port, **kwargs)
+    return OllamaClient(model, port=servers.ollama_port, **kwargs)
+
+
+def _db_client(server: str, servers: MockServers) -> Any:
+    db = ChromaDB(name="chroma")
+    if server == "http":
+        return HTTPDBClient(db, port=servers.http_port)
+    return RESPDBClient(db, port=servers.resp_port)
+
+
+def _llm(server: str, servers: MockServers) -> Scenario:
+    text_in = Topic(name="text0", msg_type="String")
+    text_out = Topic(name="text1", msg_type="String")
+    model = (
+        OllamaModel(name="llama", checkpoint="llama3.2:3b")
+        if server == "ollama"
+        else Llama3_1(name="llama")
+    )
+    component = LLM(
+        inputs=[text_in],
+        outputs=[text_out],
+        model_client=_model_client(server, model, servers),
+        config=LLMConfig(chat_history=True),
+        trigger=text_in,
+        component_name="bench_llm",
+    )
+    component.set_component_prompt("Answer the following: {{ text0 }}")
+    return Scenario(component, [(text_in, text_in.msg_type.convert(QUERY))], text_in)
+
+
+def _mllm(server: str, servers: MockServers) -> Scenario:
+    text_in = Topic(name="text0", msg_type="String")
+    image_in = Topic(name="image0", msg_type="Image")
+    text_out = Topic(name="text1", msg_type="String")
+    model = (
+        OllamaModel(name="llava", checkpoint="llava")
+        if server == "ollama"
+        else Idefics2(name="idefics")
+    )
+    component = MLLM(
+        inputs=[text_in, image_in],
+        outputs=[text_out],
+        model_client=_model_client(server, model, servers),
+        config=MLLMConfig(),
+        trigger=text_in,
+        component_name="bench_mllm",
+    )
+    return Scenario(
+        component,
+        [
+            (text_in, text_in.msg_type.convert(QUERY)),
+            (image_in, image_in.msg_type.convert(_image())),
+        ],
+        text_in,
+    )
+
+
+def _vision(server: str, servers: MockServers) -> Scenario:
+    image_in = Topic(name="image0", msg_type="Image")
+    detections_out = Topic(name="detections", msg_type="Detections")
+    component = Vision(
+        inputs=[image_in],
+        outputs=[detections_out],
+        model_client=_model_client(server, VisionModel(name="detector"), servers),
+        config=VisionConfig(),
+        trigger=image_in,
+        component_name="bench_vision",
+    )
+    return Scenario(
+        component, [(image_in, image_in.msg_type.convert(_image()))], image_in
+    )
+
+
+def _speech_to_text(server: str, servers: MockServers) -> Scenario:
+    audio_in = Topic(name="audio0", msg_type="Audio")
+    text_out = Topic(name="text1", msg_type="String")
+    component = SpeechToText(
+        inputs=[audio_in],
+        outputs=[text_out],
+        model_client=_model_client(server, Whisper(name="whisper"), servers),
+        config=SpeechToTextConfig(),
+        trigger=audio_in,
+        component_name="bench_speech_to_text",
+    )
+    return Scenario(
+        component,
+        [(audio_in, audio_in.msg_type.convert(MockBackend.wav_output))],
+        audio_in,
+    )
+
+
+def _text_to_speech(server: str, servers: MockServers) -> Scenario:
+    text_in = Topic(name="text0", msg_type="String")
+    audio_out = Topic(name="audio1", msg_type="Audio")
+    component = TextToSpeech(
+        inputs=[text_in],
+        outputs=[audio_out],
+        model_client=_model_client(server, SpeechT5(name="speecht5"), servers),
+        config=TextToSpeechConfig(),
+        trigger=text_in,
+        component_name="bench_text_to_speech",
+    )
+    return Scenario(component, [(text_in, text_in.msg_type.convert(QUERY))], text_in)
+
+
+def _semantic_router(server: str, servers: MockServers) -> Scenario:
+    text_in = Topic(name="text0", msg_type="String")
+    goto = Topic(name="goto", msg_type="String")
+    question = Topic(name="question", msg_type="String")
+    routes = [
+        Route(routes_to=goto, samples=["Go to the door", "Go to the kitchen"]),
+        Route(routes_to=question, samples=["What do you see?", "Where are we"]),
+    ]
+    component = SemanticRouter(
+        inputs=[text_in],
+        routes=routes,
+        config=SemanticRouterConfig(router_name="bench_router"),
+        db_client=_db_client(server, servers),
+        component_name="bench_semantic_router",
+    )
+    return Scenario(component, [(text_in, text_in.msg_type.convert(QUERY))], text_in)
+
+
+def _map_encoding(server: str, servers: MockServers) -> Scenario:
+    text_in = Topic(name="text0", msg_type="String")
+    position = Topic(name="odom", msg_type="Odometry")
+    map_topic = Topic(name="map", msg_type="OccupancyGrid")
+    odom = ROSOdometry()
+    odom.pose.pose.position.x = 1.5
+    odom.pose.pose.position.y = 2.5
+    odom.pose.pose.orientation.w = 1.0
+    grid = ROSOccupancyGrid()
+    grid.info.resolution = 0.05
+    grid.info.width = 100
+    grid.info.height = 100
+    grid.data = [0] * (grid.info.width * grid.info.height)
+    component = MapEncoding(
+        layers=[MapLayer(subscribes_to=text_in, temporal_change=True)],
+        position=position,
+        map_topic=map_topic,
+        config=MapConfig(map_name="bench_map"),
+        db_client=_db_client(server, servers),
+        trigger=1.0,
+        component_name="bench_map_encoding",
+    )
+    return Scenario(
+        component,
+        [
+            (text_in, text_in.msg_type.convert(QUERY)),
+            (position, odom),
+            (map_topic, grid),
+        ],
+    )
+
+
+class _VideoScenario(Scenario):
+    """Alternates between two images so that motion is detected on every frame"""
+
+    def step(self) -> None:
+        self.inputs[0], self.inputs[1] = self.inputs[1], self.inputs[0]
+        self._trigger_msg = self.inputs[0][1]
+        super().step()
+
+
+def _video_message_maker(*_) -> Scenario:
+    image_in = Topic(name="image0", msg_type="Image")
+    video_out = Topic(name="video", msg_type="Video")
+    component = VideoMessageMaker(
+        inputs=[image_in],
+        outputs=[video_out],
+        config=VideoMessageMakerConfig(),
+        trigger=image_in,
+        component_name="bench_video_message_maker",
+    )
+    return _VideoScenario(
+        component,
+        [
+            (image_in, image_in.msg_type.convert(_image(0))),
+            (image_in, image_in.msg_type.convert(_image(1))),
+        ],
+        image_in,
+    )
+
+
+SCENARIOS: Dict[str, Callable[..., Scenario]] = {
+    "LLM": _llm,
+    "MLLM": _mllm,
+    "Vision": _vision,
+    "SpeechToText": _speech_to_text,
+    "TextToSpeech": _text_to_speech,
+    "SemanticRouter": _semantic_router,
+    "MapEncoding": _map_encoding,
+    "VideoMessageMaker": _video_message_maker,
+}
+
+
+def _percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(int(p * len(values)), len(values) - 1)]
+
+
+def benchmark(scenario: Scenario, iterations: int, warmup: int = 5) -> Dict:
+    """Step a scenario and measure latency, CPU time and allocations per step.
+    Allocations are measured in a separate pass, as tracing them slows down execution.
+    :param scenario:
+    :type scenario: Scenario
+    :param iterations: Number of measured steps in each pass
+    :type iterations: int
+    :param warmup: Number of steps run before measuring
+    :type warmup: int
+    :rtype: dict
+    """
+    for _ in range(warmup):
+        scenario.step()
+
+    latencies = []
+    cpu_times = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        step_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        scenario.step()
+        cpu_times.append(time.thread_time() - cpu_start)
+        latencies.append(time.perf_counter() - step_start)
+    total = time.perf_counter() - start
+
+    peak_allocations = []
+    allocated_blocks = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        current_before, _ = tracemalloc.get_traced_memory()
+        blocks_before = sys.getallocatedblocks()
+        scenario.step()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated_blocks.append(sys.getallocatedblocks() - blocks_before)
+        peak_allocations.append(peak - current_before)
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "throughput_per_s": iterations / total,
+        "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+        "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+        "cpu_time_mean_ms": statistics.mean(cpu_times) * 1000,
+        "peak_allocation_mean_kb": statistics.mean(peak_allocations) / 1024,
+        "net_allocated_blocks_mean": statistics.mean(allocated_blocks),
+    }
+
+
+def _print_results(results: List[Dict]) -> None:
+    columns = [
+        ("component", 18),
+        ("server", 7),
+        ("throughput_per_s", 12),
+        ("latency_p50_ms", 12),
+        ("latency_p99_ms", 12),
+        ("cpu_time_mean_ms", 12),
+        ("peak_allocation_mean_kb", 14),
+        ("net_allocated_blocks_mean", 12),
+    ]
+    headers = [
+        "component",
+        "server",
+        "steps/s",
+        "p50 ms",
+        "p99 ms",
+        "cpu ms",
+        "peak alloc KB",
+        "net blocks",
+    ]
+    print(" ".join(h.ljust(w) for h, (_, w) in zip(headers, columns)))
+    for result in results:
+        row = []
+        for key, width in columns:
+            value = result.get(key)
+            row.append(
+                (f"{value:.2f}" if isinstance(value, float) else str(value)).ljust(
+                    width
+                )
+            )
+        print(" ".join(row))
+
+
+def main(args: Optional[List[str]] = None) -> List[Dict]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Artificial server latency in seconds for every inference or DB call",
+    )
+    parser.add_argument(
+        "--components", nargs="+", choices=COMPONENTS, default=COMPONENTS
+    )
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=SERVERS)
+    parser.add_argument("--json", help="Path of a file to save results as json")
+    parsed = parser.parse_args(args)
+
+    results = []
+    rclpy.init()
+    try:
+        with MockServers(latency=parsed.latency) as servers:
+            for name in parsed.components:
+                for server in COMPONENT_SERVERS[name]:
+                    if server and server not in parsed.servers:
+                        continue
+                    scenario = SCENARIOS[name](server, servers)
+                    scenario.start()
+                    try:
+                        result = benchmark(scenario, parsed.iterations)
+                    finally:
+                        scenario.stop()
+                    results.append({
+                        "component": name,
+                        "server": server or "-",
+                        **result,
+                    })
+    finally:
+        rclpy.shutdown()
+
+    _print_results(results)
+    if parsed.json:
+        with open(parsed.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,666 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+from agents.utils import (
+    ClientMetrics,
+    InferenceSlots,
+    PDFReader,
+    TimedBatch,
+    chunk_text,
+    evict_history_turns,
+    get_cache_keys,
+    insert_history_summary,
+    match_similar_response,
+    remove_overlap,
+    select_frames,
+    stream_chunks,
+    validate_func_args,
+)
+
+
+@pytest.fixture
+def image():
+    """Fixture to create a random test image"""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8)
+
+
+def make_inference_input(prompt, images=None):
+    """Create an LLM inference input with a single message"""
+    inference_input = {
+        "query": [{"role": "user", "content": prompt}],
+        "temperature": 0.8,
+    }
+    if images is not None:
+        inference_input["images"] = images
+    return inference_input
+
+
+class TestStreamChunks:
+    """
+    Test grouping streamed model output in chunks
+    """
+
+    tokens = ["Hello", " there", ".", " How are", " you?", " Fine", ". Bye"]
+
+    def test_break_character(self):
+        """
+        Test chunks end at the last break character received
+        """
+        assert list(stream_chunks(self.tokens, ".")) == [
+            "Hello there.",
+            " How are you? Fine.",
+            " Bye",
+        ]
+
+    def test_no_break_character(self):
+        """
+        Test every token is a chunk without a break character
+        """
+        assert list(stream_chunks(self.tokens, "")) == self.tokens
+
+    def test_response_terminator(self):
+        """
+        Test response terminator follows the last chunk
+        """
+        chunks = list(stream_chunks(self.tokens, ".", "<<Response Ended>>"))
+        assert chunks[-1] == "<<Response Ended>>"
+        assert "".join(chunks[:-1]) == "".join(self.tokens)
+        assert list(stream_chunks([], ".", "<<Response Ended>>")) == [
+            "<<Response Ended>>"
+        ]
+
+    def test_stream_error(self):
+        """
+        Test errors in the stream are raised to the caller
+        """
+
+        def tokens():
+            yield "Hello."
+            raise ConnectionError("stream closed")
+
+        chunks = stream_chunks(tokens(), ".", "<<Response Ended>>")
+        assert next(chunks) == "Hello."
+        with pytest.raises(ConnectionError):
+            next(chunks)
+
+
+class TestInferenceSlots:
+    """
+    Test tracking of async inference calls and their drop policies
+    """
+
+    def test_dispatch_order(self):
+        """
+        Test waiting inputs are handed over together, in order, when a slot is released
+        """
+        slots = InferenceSlots(max_inflight=1, max_pending=2, drop_policy="drop_oldest")
+        assert slots.acquire("a")
+        assert not slots.acquire("b")
+        assert not slots.acquire("c")
+        assert slots.release_batch() == ["b", "c"]
+        assert slots.inflight == 1
+        assert slots.release_batch() == []
+        assert slots.inflight == 0
+
+    def test_drop_oldest(self):
+        """
+        Test oldest waiting input is replaced by the newest one
+        """
+        slots = InferenceSlots(max_inflight=1, max_pending=1, drop_policy="drop_oldest")
+        assert slots.acquire("a")
+        assert not slots.acquire("b")
+        assert not slots.acquire("c")
+        assert slots.dropped == 1
+        assert slots.release_batch() == ["c"]
+        assert slots.release_batch() == []
+
+    def test_drop_newest(self):
+        """
+        Test newest input is discarded when inputs are already waiting
+        """
+        slots = InferenceSlots(max_inflight=1, max_pending=1, drop_policy="drop_newest")
+        assert slots.acquire("a")
+        assert not slots.acquire("b")
+        assert not slots.acquire("c")
+        assert slots.dropped == 1
+        assert slots.release_batch() == ["b"]
+        assert slots.release_batch() == []
+
+    def test_clear(self):
+        """
+        Test cleared inputs are not dispatched and free slots can be taken again
+        """
+        slots = InferenceSlots(max_inflight=2, max_pending=1, drop_policy="drop_oldest")
+        assert slots.acquire("a")
+        assert slots.acquire("b")
+        assert not slots.acquire("c")
+        slots.clear()
+        assert slots.release_batch() == []
+        assert slots.acquire("d")
+
+
+class TestTimedBatch:
+    """
+    Test batching of images received on trigger topics
+    """
+
+    def test_full_batch(self):
+        """
+        Test full batch is returned ordered by index
+        """
+        batch = TimedBatch(batch_size=3, timeout=10.0, on_timeout=lambda _: None)
+        assert batch.add(2, "c") is None
+        assert batch.add(0, "a") is None
+        assert batch.add(1, "b") == ["a", "b", "c"]
+        assert batch.take() == []
+
+    def test_same_index_order(self):
+        """
+        Test items with the same index keep the order they were added in
+        """
+        batch = TimedBatch(batch_size=3, timeout=10.0, on_timeout=lambda _: None)
+        batch.add(1, "b1")
+        batch.add(0, "a")
+        assert batch.add(1, "b2") == ["a", "b1", "b2"]
+
+    def test_timeout(self):
+        """
+        Test partial batch is handed over when timeout expires
+        """
+        flushed = []
+        done = threading.Event()
+
+        def on_timeout(items):
+            flushed.append(items)
+            done.set()
+
+        batch = TimedBatch(batch_size=3, timeout=0.05, on_timeout=on_timeout)
+        batch.add(1, "b")
+        batch.add(0, "a")
+        assert done.wait(2.0)
+        assert flushed == [["a", "b"]]
+        assert batch.take() == []
+
+    def test_take_cancels_timeout(self):
+        """
+        Test taken batch is not handed over again on timeout
+        """
+        flushed = []
+        batch = TimedBatch(batch_size=3, timeout=0.05, on_timeout=flushed.append)
+        batch.add(0, "a")
+        assert batch.take() == ["a"]
+        threading.Event().wait(0.1)
+        assert flushed == []
+
+
+class TestCacheKeys:
+    """
+    Test response cache keys
+    """
+
+    def test_prompt(self):
+        """
+        Test prompts with the same context share a context key
+        """
+        key_a, context_a, prompt = get_cache_keys(make_inference_input("a"))
+        key_b, context_b, _ = get_cache_keys(make_inference_input("b"))
+        assert prompt == "a"
+        assert context_a == context_b
+        assert key_a != key_b
+        assert key_a == get_cache_keys(make_inference_input("a"))[0]
+
+    def test_context(self):
+        """
+        Test inference parameters and chat history are part of the context key
+        """
+        inference_input = make_inference_input("a")
+        _, context, _ = get_cache_keys(inference_input)
+        inference_input["temperature"] = 0.5
+        assert get_cache_keys(inference_input)[1] != context
+        inference_input = make_inference_input("a")
+        inference_input["query"].insert(0, {"role": "system", "content": "b"})
+        assert get_cache_keys(inference_input)[1] != context
+
+    def test_image_content(self, image):
+        """
+        Test images are keyed on their content
+        """
+        changed = image.copy()
+        changed[0, 0, 0] ^= 1
+        key = get_cache_keys(make_inference_input("a", [image]))[0]
+        assert key == get_cache_keys(make_inference_input("a", [image.copy()]))[0]
+        assert key != get_cache_keys(make_inference_input("a", [changed]))[0]
+
+    def test_fuzzy_images(self, image):
+        """
+        Test fuzzy image keys match mostly unchanged images
+        """
+        changed = image.copy()
+        changed[0, 0, 0] ^= 1
+        key = get_cache_keys(make_inference_input("a", [image]), fuzzy_images=True)[0]
+        assert (
+            key
+            == get_cache_keys(make_inference_input("a", [changed]), fuzzy_images=True)[
+                0
+            ]
+        )
+
+
+def make_query_result(*entries):
+    """Create a vector DB query result from (distance, context key, output, age) entries"""
+    now = time.time()
+    return {
+        "output": {
+            "distances": [[distance for distance, *_ in entries]],
+            "metadatas": [
+                [
+                    {"context_key": context, "output": output, "timestamp": now - age}
+                    for _, context, output, age in entries
+                ]
+            ],
+        }
+    }
+
+
+class TestMatchSimilarResponse:
+    """
+    Test similarity lookup of cached responses
+    """
+
+    def test_skip_other_context(self):
+        """
+        Test closer responses from other contexts are skipped
+        """
+        result = make_query_result(
+            (0.01, "other", "a", 0.0), (0.05, "context", "b", 0.0)
+        )
+        assert match_similar_response(result, "context", 0.1, 60.0) == "b"
+
+    def test_threshold(self):
+        """
+        Test responses at or beyond the distance threshold are not matched
+        """
+        result = make_query_result(
+            (0.05, "other", "a", 0.0), (0.1, "context", "b", 0.0)
+        )
+        assert match_similar_response(result, "context", 0.1, 60.0) is None
+
+    def test_expired(self):
+        """
+        Test expired responses are skipped
+        """
+        result = make_query_result(
+            (0.01, "context", "a", 120.0), (0.02, "context", "b", 0.0)
+        )
+        assert match_similar_response(result, "context", 0.1, 60.0) == "b"
+
+    def test_invalid_result(self):
+        """
+        Test failed or empty queries do not match
+        """
+        assert match_similar_response(None, "context", 0.1, 60.0) is None
+        assert match_similar_response(make_query_result(), "context", 0.1, 60.0) is None
+
+
+def make_history():
+    """Create chat history with a system prompt and three turns"""
+    return [
+        {"role": "system", "content": "s"},
+        {"role": "user", "content": "u1"},
+        {"role": "assistant", "content": "a1"},
+        {"role": "tool", "content": "t1"},
+        {"role": "user", "content": "u2"},
+        {"role": "assistant", "content": "a2"},
+        {"role": "user", "content": "u3"},
+    ]
+
+
+class TestHistoryTokenBudget:
+    """
+    Test evicting chat history to fit a token budget and placing its summary
+    """
+
+    def test_evict_turns(self):
+        """
+        Test whole turns are evicted, oldest first, keeping leading messages
+        """
+        messages = make_history()
+        evicted = evict_history_turns(messages, 4, lambda _: 1, keep=1)
+        assert [m["content"] for m in evicted] == ["u1", "a1", "t1"]
+        assert [m["content"] for m in messages] == ["s", "u2", "a2", "u3"]
+
+    def test_within_budget(self):
+        """
+        Test nothing is evicted when messages fit in the budget
+        """
+        messages = make_history()
+        assert evict_history_turns(messages, 7, lambda _: 1, keep=1) == []
+        assert messages == make_history()
+
+    def test_keep_latest_message(self):
+        """
+        Test latest message is kept even if it alone exceeds the budget
+        """
+        messages = make_history()
+        evicted = evict_history_turns(messages, 0, lambda _: 1, keep=1)
+        assert len(evicted) == 5
+        assert [m["content"] for m in messages] == ["s", "u3"]
+
+    def test_summary_placement(self):
+        """
+        Test summary is placed after the system prompt and replaces the previous one
+        """
+        messages = make_history()
+        first = {"role": "system", "content": "summary 1"}
+        insert_history_summary(messages, first, index=1)
+        assert messages[:2] == [make_history()[0], first]
+        second = {"role": "system", "content": "summary 2"}
+        insert_history_summary(messages, second, first, index=1)
+        assert messages[1] == second
+        assert first not in messages
+        assert len(messages) == len(make_history()) + 1
+
+
+class TestChunkText:
+    """
+    Test splitting documents into chunks
+    """
+
+    text = " ".join(f"word{i:02d}" for i in range(40))
+
+    def test_chunk_size(self):
+        """
+        Test chunks fit in chunk size and do not split words
+        """
+        chunks = chunk_text(self.text, chunk_size=30)
+        assert all(len(chunk) <= 30 for chunk in chunks)
+        assert " ".join(chunks) == self.text
+
+    def test_no_leading_whitespace(self):
+        """
+        Test chunks do not start or end with whitespace
+        """
+        for chunk_overlap in [0, 10]:
+            chunks = chunk_text(f"  {self.text} \n", 30, chunk_overlap)
+            assert all(chunk == chunk.strip() for chunk in chunks)
+
+    def test_equal_chunks_without_overlap(self):
+        """
+        Test chunks of equal length words are all filled to the same length
+        """
+        chunks = chunk_text(self.text, chunk_size=30, chunk_overlap=0)
+        assert {len(chunk) for chunk in chunks} == {27}
+
+    def test_overlap(self):
+        """
+        Test consecutive chunks share words up to chunk overlap
+        """
+        chunks = chunk_text(self.text, chunk_size=30, chunk_overlap=10)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.split()[0] == previous.split()[-1]
+
+    def test_long_word(self):
+        """
+        Test words longer than chunk size are split
+        """
+        assert chunk_text("a" * 25, chunk_size=10, chunk_overlap=2) == [
+            "a" * 10,
+            "a" * 10,
+            "a" * 9,
+        ]
+
+    def test_invalid_overlap(self):
+        """
+        Test overlap needs to be smaller than chunk size
+        """
+        with pytest.raises(ValueError):
+            chunk_text(self.text, chunk_size=10, chunk_overlap=10)
+
+
+class FakePage:
+    """Page of a fake PDF document"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def extract_text(self):
+        """Return page text"""
+        return self.text
+
+
+class FakePdf:
+    """Fake PDF document read by pypdf"""
+
+    metadata = None
+
+    def __init__(self, *texts):
+        self.pages = [FakePage(text) for text in texts]
+
+
+def make_pdf_reader(path, *texts):
+    """Create a PDFReader for a fake PDF document, without requiring pypdf"""
+    reader = PDFReader.__new__(PDFReader)
+    reader.pdf_file = path
+    reader.reader = FakePdf(*texts)
+    return reader
+
+
+class TestPDFPages:
+    """
+    Test IDs of PDF pages and their chunks
+    """
+
+    def test_identical_pages(self):
+        """
+        Test pages with identical text get different IDs
+        """
+        ids = [
+            page_id
+            for page_id, _, _ in make_pdf_reader("a.pdf", "", "text", "").iter_pages()
+        ]
+        assert len(set(ids)) == 3
+
+    def test_identical_documents(self):
+        """
+        Test pages of different files with identical text get different IDs
+        """
+        page_a = next(make_pdf_reader("a.pdf", "text").iter_pages())
+        page_b = next(make_pdf_reader("b.pdf", "text").iter_pages())
+        assert page_a[0] != page_b[0]
+        assert page_a[0] == next(make_pdf_reader("a.pdf", "text").iter_pages())[0]
+
+    def test_chunk_ids(self):
+        """
+        Test chunks of identical pages get unique IDs
+        """
+        pytest.importorskip("ros_sugar")
+        from agents.components.llm import LLM
+
+        pages = make_pdf_reader("a.pdf", "same text", "same text").iter_pages()
+        batches = LLM._document_batches(None, pages, 5, 0, 10)
+        ids = [chunk_id for batch in batches for chunk_id, _, _ in batch]
+        assert len(ids) == 4
+        assert len(set(ids)) == 4
+
+
+class TestClientMetrics:
+    """
+    Test recording metrics of client calls
+    """
+
+    def test_record(self):
+        """
+        Test calls measured by the caller are recorded with their stats
+        """
+        metrics = ClientMetrics()
+        metrics.record("inference_stream", 0.2, {"server_time": 0.15})
+        metrics.record("inference_stream", 0.4, {"error": True, "timeout": True})
+        snapshot = metrics.snapshot()["inference_stream"]
+        assert snapshot["count"] == 2
+        assert snapshot["errors"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["latency_ms"]["mean"] == pytest.approx(300.0)
+        assert snapshot["mean_server_time_ms"] == pytest.approx(150.0)
+
+
+class TestSelectFrames:
+    """
+    Test selecting video frames to decode
+    """
+
+    def test_all_frames(self):
+        """
+        Test all frames are selected by default
+        """
+        assert list(select_frames(5)) == [0, 1, 2, 3, 4]
+
+    def test_stride(self):
+        """
+        Test every Nth frame is selected
+        """
+        assert list(select_frames(10, frame_stride=3)) == [0, 3, 6, 9]
+        assert list(select_frames(3, frame_stride=0)) == [0, 1, 2]
+
+    def test_max_frames(self):
+        """
+        Test selecting first or last frames
+        """
+        assert list(select_frames(10, 2, max_frames=3)) == [0, 2, 4]
+        assert list(select_frames(10, 2, max_frames=3, from_end=True)) == [
+            4,
+            6,
+            8,
+        ]
+        assert list(select_frames(2, max_frames=5)) == [0, 1]
+
+
+class TestValidateFuncArgs:
+    """
+    Test function argument validation
+    """
+
+    def test_validate(self):
+        """
+        Test arguments are validated on every call
+        """
+
+        @validate_func_args
+        def add(a: int, b: int = 1) -> int:
+            return a + b
+
+        assert add(1, b=2) == 3
+        with pytest.raises(TypeError):
+            add("1")
+        with pytest.raises(TypeError):
+            add(1, b="2")
+
+    def test_validate_once(self):
+        """
+        Test arguments are only validated until the first successful call
+        """
+
+        @validate_func_args(validate_once=True)
+        def join(a: str, b: str) -> str:
+            return f"{a}{b}"
+
+        with pytest.raises(TypeError):
+            join("a", 1)
+        assert join("a", "b") == "ab"
+        # not validated anymore
+        assert join("a", 1) == "a1"
+
+
+class TestRingBuffers:
+    """
+    Test ring buffers used for audio processing
+    """
+
+    @pytest.fixture(autouse=True)
+    def voice(self):
+        """Fixture to import voice utilities, which require onnxruntime"""
+        pytest.importorskip("onnxruntime")
+        from agents.utils import voice
+
+        self.voice = voice
+
+    def test_ring_buffer(self):
+        """
+        Test ring buffer keeps the latest rows in order
+        """
+        buffer = self.voice._RingBuffer(np.zeros((4, 2), dtype=np.float32))
+        reference = np.zeros((4, 2), dtype=np.float32)
+        for n_rows in [1, 3, 2, 6, 4]:
+            rows = np.random.rand(n_rows, 2).astype(np.float32)
+            buffer.append(rows)
+            reference = np.concatenate([reference, rows])[-4:]
+            np.testing.assert_array_equal(buffer.latest(), reference)
+            np.testing.assert_array_equal(buffer.latest(3), reference[-3:])
+
+    def test_audio_ring_buffer_overflow(self):
+        """
+        Test audio ring buffer drops blocks when full
+        """
+        buffer = self.voice.AudioRingBuffer(block_size=4, capacity=2)
+        blocks = [np.full(4, i, dtype=np.int16) for i in range(3)]
+        assert buffer.put(blocks[0].tobytes())
+        assert buffer.put(blocks[1].tobytes())
+        assert not buffer.put(blocks[2].tobytes())
+        assert buffer.overflows == 1
+        np.testing.assert_array_equal(buffer.get(max_blocks=4), blocks[:2])
+        assert buffer.get(max_blocks=4, timeout=0.01) is None
+
+    def test_audio_ring_buffer_threads(self):
+        """
+        Test audio ring buffer passes blocks in order between threads
+        """
+        buffer = self.voice.AudioRingBuffer(block_size=4, capacity=8)
+        n_blocks = 200
+        received = []
+
+        def consume():
+            while len(received) < n_blocks:
+                if (blocks := buffer.get(max_blocks=3)) is not None:
+                    received.extend(int(block[0]) for block in blocks)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for i in range(n_blocks):
+            while not buffer.put(np.full(4, i, dtype=np.int16).tobytes()):
+                pass
+        consumer.join(timeout=10)
+        assert received == list(range(n_blocks))
+
+
+class TestRemoveOverlap:
+    """
+    Test removing repeated words from transcripts of overlapping audio chunks
+    """
+
+    def test_overlap(self):
+        """
+        Test words repeating the end of the previous transcript are removed
+        """
+        assert remove_overlap("I went to the", "to the store") == "store"
+        assert remove_overlap("Hello there.", "There, how are you") == "how are you"
+
+    def test_no_overlap(self):
+        """
+        Test text is kept when it does not repeat the previous transcript
+        """
+        assert remove_overlap("", "hello there") == "hello there"
+        assert remove_overlap("I went home", "to the store") == "to the store"
+
+    def test_longest_overlap(self):
+        """
+        Test the longest repeated sequence is removed
+        """
+        assert remove_overlap("a b a b", "a b a b c") == "c"
+
+    def test_max_words(self):
+        """
+        Test overlaps longer than max_words are not fully removed
+        """
+        assert remove_overlap("a b c d", "a b c d e", max_words=2) == "a b c d e"